@@ -0,0 +1,61 @@
+﻿"""Add team season stats summary table
+
+Revision ID: 5b7e2c9d4a31
+Revises: d46d8ccf0e6b
+Create Date: 2026-10-19 10:12:41.508213
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2c9d4a31"
+down_revision: Union[str, None] = "d46d8ccf0e6b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "team_season_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("season", sa.Integer(), nullable=False),
+        sa.Column("played", sa.Integer(), nullable=False),
+        sa.Column("won", sa.Integer(), nullable=False),
+        sa.Column("drawn", sa.Integer(), nullable=False),
+        sa.Column("lost", sa.Integer(), nullable=False),
+        sa.Column("goals_for", sa.Integer(), nullable=False),
+        sa.Column("goals_against", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.CheckConstraint("played >= 0", name="chk_team_season_stats_played"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "team_id", "season", name="uq_team_season_stats_team_season"
+        ),
+    )
+    op.create_index(
+        op.f("ix_team_season_stats_id"), "team_season_stats", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_team_season_stats_season_points",
+        "team_season_stats",
+        ["season", "points"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_team_season_stats_season_points", table_name="team_season_stats")
+    op.drop_index(op.f("ix_team_season_stats_id"), table_name="team_season_stats")
+    op.drop_table("team_season_stats")
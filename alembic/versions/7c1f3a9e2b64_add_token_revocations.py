@@ -0,0 +1,64 @@
+﻿"""Add user token version and token revocation log
+
+Revision ID: 7c1f3a9e2b64
+Revises: 5b7e2c9d4a31
+Create Date: 2026-10-19 14:02:17.334915
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1f3a9e2b64"
+down_revision: Union[str, None] = "5b7e2c9d4a31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "token_revocations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("min_token_version", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_token_revocations_id"), "token_revocations", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_token_revocations_user_id"),
+        "token_revocations",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_token_revocations_created_at"),
+        "token_revocations",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_token_revocations_created_at"), table_name="token_revocations"
+    )
+    op.drop_index(op.f("ix_token_revocations_user_id"), table_name="token_revocations")
+    op.drop_index(op.f("ix_token_revocations_id"), table_name="token_revocations")
+    op.drop_table("token_revocations")
+    op.drop_column("users", "token_version")
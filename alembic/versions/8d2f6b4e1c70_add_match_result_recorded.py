@@ -0,0 +1,35 @@
+﻿"""Add result_recorded to matches
+
+Revision ID: 8d2f6b4e1c70
+Revises: f3a8c2d6e915
+Create Date: 2026-10-19 21:37:52.604118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2f6b4e1c70"
+down_revision: Union[str, None] = "f3a8c2d6e915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "matches",
+        sa.Column("result_recorded", sa.Boolean(), server_default="0", nullable=False),
+    )
+    # Flag exactly the matches team_season_stats counted until now
+    op.execute(
+        "UPDATE matches SET result_recorded = 1 "
+        "WHERE updated_at IS NOT NULL AND match_date <= updated_at"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("matches", "result_recorded")
@@ -0,0 +1,41 @@
+﻿"""Add match clash indexes
+
+Revision ID: b7d3f9a2c615
+Revises: e2b95c7d1a48
+Create Date: 2026-10-19 18:02:47.391204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3f9a2c615"
+down_revision: Union[str, None] = "e2b95c7d1a48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_matches_venue_match_date", "matches", ["venue", "match_date"], unique=False
+    )
+    op.create_index(
+        "ix_matches_team_a_id_match_date",
+        "matches",
+        ["team_a_id", "match_date"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_matches_team_b_id_match_date",
+        "matches",
+        ["team_b_id", "match_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_matches_team_b_id_match_date", table_name="matches")
+    op.drop_index("ix_matches_team_a_id_match_date", table_name="matches")
+    op.drop_index("ix_matches_venue_match_date", table_name="matches")
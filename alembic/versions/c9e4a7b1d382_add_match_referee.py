@@ -0,0 +1,31 @@
+﻿"""Add referee to matches
+
+Revision ID: c9e4a7b1d382
+Revises: b7d3f9a2c615
+Create Date: 2026-10-19 19:26:13.804517
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e4a7b1d382"
+down_revision: Union[str, None] = "b7d3f9a2c615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("matches", sa.Column("referee_id", sa.Integer(), nullable=True))
+    op.create_index(
+        op.f("ix_matches_referee_id"), "matches", ["referee_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_matches_referee_id"), table_name="matches")
+    op.drop_column("matches", "referee_id")
@@ -0,0 +1,32 @@
+﻿"""Never reuse user ids
+
+Revision ID: f3a8c2d6e915
+Revises: c9e4a7b1d382
+Create Date: 2026-10-19 21:04:37.482915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a8c2d6e915"
+down_revision: Union[str, None] = "c9e4a7b1d382"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite only adds AUTOINCREMENT when the table is rebuilt
+    with op.batch_alter_table(
+        "users", recreate="always", table_kwargs={"sqlite_autoincrement": True}
+    ):
+        pass
+
+
+def downgrade() -> None:
+    with op.batch_alter_table(
+        "users", recreate="always", table_kwargs={"sqlite_autoincrement": False}
+    ):
+        pass
@@ -0,0 +1,105 @@
+﻿"""
+API keys for machine clients.
+
+Service accounts send an API key as their bearer token instead of
+exchanging a password for a JWT. Keys are random strings with a fixed
+``flm_`` prefix so they can be told apart from JWTs (and spotted by secret
+scanners). Only the SHA-256 digest is stored, under a unique index, so a
+key is checked with one indexed lookup and never with bcrypt. Lookups are
+cached in the shared application cache for ``API_KEY_CACHE_SECONDS``;
+revoking a key removes its entry, so workers sharing the cache stop
+accepting it at once and others within that TTL. Deleting a user revokes
+all of their keys the same way.
+"""
+
+import hashlib
+import secrets
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.database.models import ApiKey, User
+
+API_KEY_PREFIX = "flm_"
+
+# (user id, username, token version) of the key's owner
+KeyOwner = Tuple[int, str, int]
+
+
+def is_api_key(token: str) -> bool:
+    return token.startswith(API_KEY_PREFIX)
+
+
+def hash_api_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _cache_key(key_hash: str) -> str:
+    return f"api_keys:{key_hash}"
+
+
+def create_api_key(db: Session, user_id: int, name: str) -> Tuple[ApiKey, str]:
+    """Store a new key for the user; the plain key is only returned here."""
+    key = API_KEY_PREFIX + secrets.token_urlsafe(32)
+    api_key = ApiKey(
+        user_id=user_id,
+        name=name,
+        prefix=key[: len(API_KEY_PREFIX) + 6],
+        key_hash=hash_api_key(key),
+    )
+    db.add(api_key)
+    db.commit()
+    db.refresh(api_key)
+    return api_key, key
+
+
+def lookup_api_key(db: Session, key: str) -> Optional[KeyOwner]:
+    """Return the owner of an active key, or None if it is unknown or revoked."""
+    key_hash = hash_api_key(key)
+    cache = get_cache()
+    owner = cache.get(_cache_key(key_hash))
+    if owner is not None:
+        return tuple(owner)
+
+    row = (
+        db.query(User.id, User.username, User.token_version)
+        .join(ApiKey, ApiKey.user_id == User.id)
+        .filter(ApiKey.key_hash == key_hash, ApiKey.revoked_at.is_(None))
+        .first()
+    )
+    if row is None:
+        # Unknown keys are not cached so guessing cannot fill the cache
+        return None
+    owner = tuple(row)
+    cache.set(_cache_key(key_hash), owner, settings.API_KEY_CACHE_SECONDS)
+    return owner
+
+
+def revoke_api_key(db: Session, api_key: ApiKey) -> None:
+    api_key.revoked_at = datetime.utcnow()
+    db.commit()
+    get_cache().delete(_cache_key(api_key.key_hash))
+
+
+def revoke_user_api_keys(db: Session, user_id: int) -> List[str]:
+    """Revoke a user's active keys in the caller's transaction.
+
+    Returns their digests; pass them to ``forget_api_keys`` once committed.
+    """
+    active = (ApiKey.user_id == user_id, ApiKey.revoked_at.is_(None))
+    key_hashes = [key_hash for (key_hash,) in db.query(ApiKey.key_hash).filter(*active)]
+    if key_hashes:
+        db.query(ApiKey).filter(*active).update(
+            {ApiKey.revoked_at: datetime.utcnow()}, synchronize_session=False
+        )
+    return key_hashes
+
+
+def forget_api_keys(key_hashes: List[str]) -> None:
+    """Drop cached owners so revoked keys stop working at once."""
+    cache = get_cache()
+    for key_hash in key_hashes:
+        cache.delete(_cache_key(key_hash))
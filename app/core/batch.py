@@ -0,0 +1,81 @@
+﻿"""
+Batch lookups by id for Football League Manager.
+
+List endpoints accept ``?ids=3,1,2`` to fetch several resources in one round
+trip. The ids are loaded with a single ``WHERE id IN (...)`` query, returned
+in the order they were requested (duplicates collapsed) and any id that does
+not exist is reported in the ``X-Missing-Ids`` response header so the body
+keeps the endpoint's usual list shape.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Query
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Query as ORMQuery
+
+from app.core.config import settings
+from app.core.exceptions import bad_request_exception
+from app.core.responses import list_response
+
+MISSING_IDS_HEADER = "X-Missing-Ids"
+
+
+def id_list(
+    ids: Optional[str] = Query(
+        None, description="Comma-separated ids to fetch in one request"
+    )
+) -> Optional[List[int]]:
+    """Parse ``?ids=`` into unique integer ids, keeping the request order."""
+    if ids is None:
+        return None
+    parsed = []
+    for value in ids.split(","):
+        value = value.strip()
+        if not value:
+            continue
+        try:
+            parsed.append(int(value))
+        except ValueError:
+            raise bad_request_exception(f"Invalid id: {value}")
+    parsed = list(dict.fromkeys(parsed))
+    if not parsed:
+        raise bad_request_exception("No ids requested")
+    if len(parsed) > settings.BATCH_MAX_IDS:
+        raise bad_request_exception(
+            f"At most {settings.BATCH_MAX_IDS} ids can be requested at once"
+        )
+    return parsed
+
+
+def fetch_by_ids(
+    query: ORMQuery, model, ids: Sequence[int]
+) -> Tuple[List[Any], List[int]]:
+    """Load ``ids`` with one ``IN`` query.
+
+    Returns the rows in request order and the ids that were not found.
+    """
+    rows = {row.id: row for row in query.filter(model.id.in_(ids)).all()}
+    found = [rows[item_id] for item_id in ids if item_id in rows]
+    missing = [item_id for item_id in ids if item_id not in rows]
+    return found, missing
+
+
+def batch_response(
+    schema: Type[BaseModel],
+    query: ORMQuery,
+    model,
+    ids: Sequence[int],
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """Build the list response for a ``?ids=`` lookup."""
+    items, missing = fetch_by_ids(query, model, ids)
+    return with_missing_ids(list_response(schema, items, fields), missing)
+
+
+def with_missing_ids(response: Response, missing: Sequence[int]) -> Response:
+    """Report ids that were not found in the ``X-Missing-Ids`` header."""
+    if missing:
+        response.headers[MISSING_IDS_HEADER] = ",".join(map(str, missing))
+    return response
@@ -0,0 +1,373 @@
+﻿"""
+Cache backends for Football League Manager.
+
+Provides a small cache interface with three implementations so that
+service-layer caches keep working when the API runs several workers:
+
+* ``InMemoryCache`` - per-process dictionary, fastest but not shared.
+* ``SQLiteCache`` - a local SQLite file shared by every worker on the host.
+* ``RedisCache`` - any server speaking the Redis protocol (RESP).
+
+The active backend is selected through ``Settings.CACHE_BACKEND``.
+"""
+
+import functools
+import inspect
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.core.singleflight import service_flights
+
+
+class CacheBackend(ABC):
+    """Interface shared by every cache backend."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None when missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value, optionally expiring after ``ttl`` seconds."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter and return the new value."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every key."""
+
+
+class InMemoryCache(CacheBackend):
+    """Per-process cache backed by a dictionary."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value, expires_at = self._data.get(key, (0, None))
+            value = int(value) + 1
+            self._data[key] = (value, expires_at)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteFile:
+    """A local SQLite file opened in WAL mode, shared by worker processes.
+
+    One connection per process is shared by its threads under a lock.
+    Statements run in autocommit mode through ``locked``; read-modify-write
+    cycles go through ``transaction``.
+    """
+
+    def __init__(self, path: str, *schema: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in schema:
+            self._conn.execute(statement)
+
+    @contextmanager
+    def locked(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front so concurrent
+            # workers cannot interleave their read-modify-write cycles
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+class SQLiteCache(CacheBackend):
+    """Cache stored in a local SQLite file, shared by all worker processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = SQLiteFile(
+            path,
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)",
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._db.locked() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._db.locked() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._db.locked() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def incr(self, key: str) -> int:
+        with self._db.transaction() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            value = (pickle.loads(row[0]) if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                "VALUES (?, ?, NULL)",
+                (key, pickle.dumps(value)),
+            )
+        return value
+
+    def clear(self) -> None:
+        with self._db.locked() as conn:
+            conn.execute("DELETE FROM cache")
+
+
+class RedisProtocolError(Exception):
+    """Raised when a Redis-protocol server answers with an error."""
+
+    pass
+
+
+class RedisCache(CacheBackend):
+    """Cache backed by a server speaking the Redis protocol (RESP2).
+
+    Only the handful of commands the cache needs are implemented, which keeps
+    the backend free of extra dependencies.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._call("AUTH", self.password)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    def _call(self, *args: Any) -> Any:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(parts))  # type: ignore
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()  # type: ignore
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisProtocolError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)  # type: ignore
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisProtocolError(f"Unexpected reply type {kind!r}")
+
+    def _execute(self, *args: Any) -> Any:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._call(*args)
+            except (OSError, ConnectionError):
+                # Reconnect once: the server may have dropped an idle socket
+                self._close()
+                self._connect()
+                return self._call(*args)
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self._execute("GET", key)
+        if data is None:
+            return None
+        # Counters written by INCR are plain digits, everything else is pickled
+        return int(data) if data.isdigit() else pickle.loads(data)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        if ttl:
+            self._execute("SET", key, pickle.dumps(value), "EX", ttl)
+        else:
+            self._execute("SET", key, pickle.dumps(value))
+
+    def delete(self, key: str) -> None:
+        self._execute("DEL", key)
+
+    def incr(self, key: str) -> int:
+        # Counters are stored as plain integers so INCR works server side
+        return int(self._execute("INCR", key))
+
+    def clear(self) -> None:
+        self._execute("FLUSHDB")
+
+
+def create_cache(backend: str, url: str = "") -> CacheBackend:
+    """Build a cache backend by name."""
+    if backend == "memory":
+        return InMemoryCache()
+    if backend == "sqlite":
+        return SQLiteCache(url)
+    if backend == "redis":
+        return RedisCache(url)
+    raise ValueError(f"Unknown cache backend '{backend}'")
+
+
+_cache: Optional[CacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache selected by ``Settings.CACHE_BACKEND``."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_cache(settings.CACHE_BACKEND, settings.CACHE_URL)
+    return _cache
+
+
+def set_cache(cache: Optional[CacheBackend]) -> None:
+    """Replace the process-wide cache (None rebuilds it from settings)."""
+    global _cache
+    _cache = cache
+
+
+def _namespace_version(cache: CacheBackend, namespace: str) -> int:
+    version = cache.get(f"{namespace}:__version__")
+    return int(version) if version is not None else 0
+
+
+def invalidate(namespace: str) -> None:
+    """Invalidate every entry cached under ``namespace``.
+
+    Entries are keyed by a per-namespace version counter, so bumping the
+    counter orphans old entries on every backend without scanning keys.
+    """
+    get_cache().incr(f"{namespace}:__version__")
+
+
+def cached(namespace: str, ttl: Optional[int] = None) -> Callable:
+    """Cache the result of a service function taking ``db`` as first argument.
+
+    The database session is excluded from the cache key; the remaining
+    arguments must have a stable ``repr``. Arguments are bound to the
+    signature first, so ``f(db)`` and ``f(db, limit=100)`` share an entry.
+    Concurrent misses for the same key are computed once (single-flight).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(db, *args, **kwargs):
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            params = list(bound.arguments.items())[1:]
+            cache = get_cache()
+            version = _namespace_version(cache, namespace)
+            key = f"{namespace}:{version}:{params!r}"
+            value = cache.get(key)
+            if value is None:
+
+                def compute():
+                    result = func(db, *args, **kwargs)
+                    cache.set(key, result, ttl or settings.CACHE_DEFAULT_TTL)
+                    return result
+
+                if settings.SINGLE_FLIGHT_ENABLED:
+                    value = service_flights.do(namespace, key, compute)
+                else:
+                    value = compute()
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,190 @@
+﻿"""
+Response compression middleware for Football League Manager.
+
+Compresses response bodies with Brotli (when the optional ``brotli`` package
+is installed) or gzip, depending on the client's ``Accept-Encoding`` header.
+Small bodies, responses that already carry a ``Content-Encoding`` (e.g.
+pre-compressed cached bytes) and event streams are passed through untouched.
+Streaming responses are compressed chunk by chunk with a sync flush so
+clients still receive each chunk as soon as it is produced.
+"""
+
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+Headers = List[Tuple[bytes, bytes]]
+
+# Preferred first when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def parse_accept_encoding(header: str) -> Optional[str]:
+    """Pick the best supported encoding from an ``Accept-Encoding`` value."""
+    weights = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """Incremental compressor with a common interface for gzip and Brotli."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(
+                gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so it can be sent immediately."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the final chunk and close the stream."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with gzip or Brotli."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = parse_accept_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    """Wraps ``send`` for one request and compresses the body it carries."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    def _new_compressor(self) -> _Compressor:
+        return _Compressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+
+    def _compressed_headers(self, start, length: Optional[int]) -> Headers:
+        headers = [
+            (name, value)
+            for name, value in start["headers"]
+            if name not in (b"content-length", b"vary")
+        ]
+        vary = [value for name, value in start["headers"] if name == b"vary"]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        return headers
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = dict(message.get("headers", []))
+            content_type = headers.get(b"content-type", b"")
+            self.passthrough = b"content-encoding" in headers or (
+                content_type.startswith(b"text/event-stream")
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if self.passthrough or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.compressor = self._new_compressor()
+            if more_body:
+                # Streaming response: the final length is unknown
+                start["headers"] = self._compressed_headers(start, None)
+                payload = self.compressor.compress(body)
+            else:
+                payload = self.compressor.finish(body)
+                start["headers"] = self._compressed_headers(start, len(payload))
+            await self.send(start)
+            await self.send(
+                {"type": "http.response.body", "body": payload, "more_body": more_body}
+            )
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if more_body:
+            payload = self.compressor.compress(body)
+        else:
+            payload = self.compressor.finish(body)
+        await self.send(
+            {"type": "http.response.body", "body": payload, "more_body": more_body}
+        )
@@ -1,4 +1,6 @@
 ﻿# app/core/config.py
+from typing import List
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,121 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Verified access tokens cached (by digest, until they expire) so repeat
+    # requests skip signature checks; 0 disables the cache
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Stateless auth trusts the user id and token version carried in access
+    # tokens instead of loading the user on every request. Revocations
+    # (password changes, deleted users) are pulled from the database at most
+    # this often
+    AUTH_STATELESS: bool = False
+    REVOCATION_REFRESH_SECONDS: float = 5.0
+
+    # Refresh tokens renew access tokens without a password check. Expired
+    # refresh tokens and stale revocations are deleted in batches every
+    # TOKEN_SWEEP_INTERVAL_SECONDS
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    TOKEN_SWEEP_INTERVAL_SECONDS: float = 3600.0
+    TOKEN_SWEEP_BATCH_SIZE: int = 500
+
+    # Login throttling: token buckets per username and per client address,
+    # checked before any password hashing. The SQLite store is shared by
+    # every worker on the host; "memory" keeps buckets per process
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_BACKEND: str = "sqlite"
+    LOGIN_THROTTLE_URL: str = "./football_throttle.db"
+    LOGIN_USERNAME_BURST: int = 5
+    LOGIN_USERNAME_PER_MINUTE: float = 5.0
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 60.0
+
+    # Seconds an API key lookup is served from the cache; revoking a key
+    # clears its entry
+    API_KEY_CACHE_SECONDS: int = 60
+
+    # Cache backend: "memory" (per process), "sqlite" (shared by local workers)
+    # or "redis" (any server speaking the Redis protocol)
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = "./football_cache.db"
+    CACHE_DEFAULT_TTL: int = 60
+
+    # Datasets preloaded into the cache at startup; /health reports
+    # not-ready until they are warm
+    CACHE_WARMUP_ENABLED: bool = True
+    CACHE_WARMUP_DATASETS: List[str] = [
+        "teams",
+        "venues",
+        "referees",
+        "standings",
+        "upcoming_fixtures",
+    ]
+
+    # Month (1-12) in which a new season starts; seasons are named by the
+    # calendar year they start in
+    SEASON_START_MONTH: int = 8
+
+    # Response compression: bodies smaller than the minimum size are sent
+    # as-is; Brotli is used when the brotli package is installed and the
+    # client accepts it, gzip otherwise
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
+    # Double-booking checks: kick-offs at one venue, or for one team, closer
+    # together than these windows are rejected as clashes
+    VENUE_CLASH_WINDOW_MINUTES: int = 180
+    TEAM_CLASH_WINDOW_MINUTES: int = 1440
+
+    # Referee assignment: qualification levels from lowest to highest
+    # (compared case-insensitively), full days off a referee needs between
+    # two matches, and matches a referee may take per calendar week
+    REFEREE_QUALIFICATION_LEVELS: List[str] = ["regional", "national", "international"]
+    REFEREE_MIN_REST_DAYS: int = 2
+    REFEREE_MAX_MATCHES_PER_WEEK: int = 2
+
+    # Upper bound on ?ids= batch lookups served by one IN query
+    BATCH_MAX_IDS: int = 100
+
+    # Upper bound on sub-requests in one POST /batch call
+    BATCH_MAX_REQUESTS: int = 20
+
+    # Live score streams (Server-Sent Events): events kept for Last-Event-ID
+    # replay, frames buffered per subscriber before it is dropped as too
+    # slow, and seconds between keep-alive comments
+    EVENT_HISTORY_SIZE: int = 1000
+    EVENT_QUEUE_SIZE: int = 100
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+
+    # WebSocket match rooms: messages buffered per member before the oldest
+    # is dropped (score updates are coalesced to the newest regardless)
+    ROOM_QUEUE_SIZE: int = 32
+    ROOM_MAX_COMMENT_LENGTH: int = 500
+
+    # Single-flight: concurrent cache misses in cached service functions and
+    # identical GET requests under these path prefixes share one computation
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_PATHS: List[str] = [
+        "/api/v1/matches/team/",
+        "/api/v1/players/",
+        "/api/v1/standings/",
+        "/api/v1/teams/",
+    ]
+
+    # bcrypt runs in a dedicated process pool of this many workers (0 hashes
+    # in the request thread); operations beyond the queue limit get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Password hashing policy: "bcrypt" or "argon2" (needs argon2-cffi).
+    # Stored hashes using another scheme or cost are re-hashed on next login.
+    # ARGON2_MEMORY_COST is in KiB
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_MEMORY_COST: int = 19456
+    ARGON2_TIME_COST: int = 2
+    ARGON2_PARALLELISM: int = 1
+
     class Config:
         env_file = ".env"
 
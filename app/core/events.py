@@ -0,0 +1,193 @@
+﻿"""
+In-process event broker for live updates in Football League Manager.
+
+Writers call ``publish`` (from any thread) with the topics an event belongs
+to, e.g. ``match:7`` and ``league`` for a score change. The event is
+formatted as a Server-Sent Events frame once and the same bytes are handed
+to every subscriber of those topics, so fan-out costs no database queries
+and no per-subscriber serialization.
+
+Events carry a broker-wide increasing id and the last ``history_size``
+events are kept, so a reconnecting client that sends ``Last-Event-ID``
+replays what it missed. A subscriber whose queue fills up (a slow consumer)
+is disconnected rather than allowed to hold memory; it resumes on reconnect
+from its last event id.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+class Event(NamedTuple):
+    id: int
+    topics: Tuple[str, ...]
+    frame: bytes
+
+
+def format_event(event_id: int, event: str, data: str) -> bytes:
+    """Format one Server-Sent Events frame."""
+    lines = [f"id: {event_id}", f"event: {event}"]
+    lines += [f"data: {line}" for line in data.splitlines() or [""]]
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class Subscription:
+    """One subscriber's bounded queue of frames."""
+
+    def __init__(self, topic: str, replay: List[bytes], queue_size: int):
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.pending: Deque[bytes] = deque(replay)
+        self.closed = False
+
+    def deliver(self, frame: Optional[bytes]) -> None:
+        """Queue a frame (``None`` closes the stream); safe from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, frame)
+        except RuntimeError:
+            # The subscriber's event loop has already shut down
+            self.closed = True
+
+    def _put(self, frame: Optional[bytes]) -> None:
+        if self.closed:
+            return
+        if frame is None:
+            self.closed = True
+        elif self.queue.full():
+            # Slow consumer: drop it, it resumes with Last-Event-ID
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            frame = None
+        self.queue.put_nowait(frame)
+
+    async def get(self) -> Optional[bytes]:
+        """Return the next frame, or ``None`` once the stream is closed."""
+        if self.pending:
+            return self.pending.popleft()
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+
+class EventBroker:
+    """Topic-based fan-out with a bounded replay history."""
+
+    def __init__(self, history_size: int = 1000, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._history: Deque[Event] = deque(maxlen=history_size)
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._closed = False
+
+    def publish(self, topics: Tuple[str, ...], event: str, data: str) -> int:
+        """Publish ``data`` to ``topics`` and return the event id."""
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            frame = format_event(event_id, event, data)
+            self._history.append(Event(event_id, topics, frame))
+            subscribers = [
+                subscription
+                for topic in topics
+                for subscription in self._subscribers.get(topic, ())
+            ]
+        for subscription in subscribers:
+            subscription.deliver(frame)
+        return event_id
+
+    def subscribe(
+        self, topic: str, last_event_id: Optional[int] = None
+    ) -> Subscription:
+        """Subscribe to ``topic``, replaying events after ``last_event_id``."""
+        with self._lock:
+            replay = []
+            if last_event_id is not None:
+                replay = [
+                    event.frame
+                    for event in self._history
+                    if event.id > last_event_id and topic in event.topics
+                ]
+            subscription = Subscription(topic, replay, self.queue_size)
+            if self._closed:
+                subscription.closed = True
+            else:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(topic, ()))
+
+    def close(self) -> None:
+        """End every open stream (used on shutdown)."""
+        with self._lock:
+            self._closed = True
+            subscribers = [
+                subscription
+                for topic_subscribers in self._subscribers.values()
+                for subscription in topic_subscribers
+            ]
+            self._subscribers.clear()
+        for subscription in subscribers:
+            subscription.deliver(None)
+
+
+async def event_stream(
+    broker: EventBroker,
+    topic: str,
+    last_event_id: Optional[int] = None,
+    keepalive: float = 15.0,
+) -> AsyncIterator[bytes]:
+    """Yield SSE frames for ``topic`` until the broker closes the stream."""
+    subscription = broker.subscribe(topic, last_event_id)
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield KEEPALIVE_FRAME
+                continue
+            if frame is None:
+                return
+            yield frame
+    finally:
+        broker.unsubscribe(subscription)
+
+
+_broker: Optional[EventBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> EventBroker:
+    """Return the process-wide event broker."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = EventBroker(
+                    settings.EVENT_HISTORY_SIZE, settings.EVENT_QUEUE_SIZE
+                )
+    return _broker
+
+
+def set_broker(broker: Optional[EventBroker]) -> None:
+    """Replace the process-wide broker (None rebuilds it from settings)."""
+    global _broker
+    _broker = broker
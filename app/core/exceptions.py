@@ -38,6 +38,12 @@ class UserNotFoundException(FootballManagerException):
     pass
 
 
+class InvalidRefreshTokenException(FootballManagerException):
+    """Raised when a refresh token is unknown, expired, revoked or reused."""
+
+    pass
+
+
 class VenueNotFoundException(FootballManagerException):
     """Raised when a venue is not found."""
 
@@ -56,6 +62,14 @@ class RefereeNotFoundException(FootballManagerException):
     pass
 
 
+class ScheduleClashException(FootballManagerException):
+    """Raised when fixtures double-book a venue or a team."""
+
+    def __init__(self, clashes: list):
+        super().__init__(f"{len(clashes)} schedule clash(es)")
+        self.clashes = clashes
+
+
 class ValidationException(HTTPException):
     """Raised when business rule validation fails."""
 
@@ -0,0 +1,83 @@
+﻿"""
+Relation expansion for Football League Manager.
+
+Endpoints accept ``?expand=teams,venue`` to embed related rows in the
+response instead of bare ids. Each relation type is resolved with one
+``IN`` query for the whole page (see e.g. ``match_service.expand_matches``),
+the rows are attached to an ``Expanded`` view of each item and the payload is
+serialized with the response schema extended by the embedded fields.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Query
+from pydantic import BaseModel, create_model
+
+from app.core.exceptions import bad_request_exception
+from app.core.responses import partial_schema
+
+
+def expand_options(allowed: Sequence[str]) -> Callable[..., Optional[List[str]]]:
+    """Build a dependency that parses ``?expand=`` against a whitelist.
+
+    The dependency returns ``None`` when nothing should be expanded, otherwise
+    the requested relations in whitelist order.
+    """
+
+    def dependency(
+        expand: Optional[str] = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}"
+        )
+    ) -> Optional[List[str]]:
+        if expand is None:
+            return None
+        requested = {name.strip() for name in expand.split(",") if name.strip()}
+        if not requested:
+            raise bad_request_exception("No relations requested")
+        unknown = sorted(requested.difference(allowed))
+        if unknown:
+            raise bad_request_exception(
+                f"Unknown relations: {', '.join(unknown)}. "
+                f"Allowed relations: {', '.join(allowed)}"
+            )
+        return [name for name in allowed if name in requested]
+
+    return dependency
+
+
+class Expanded:
+    """Attribute view over an ORM row or cached dict with embedded relations."""
+
+    def __init__(self, item: Any):
+        self._item = item
+
+    def __getattr__(self, name: str) -> Any:
+        item = self.__dict__["_item"]
+        if isinstance(item, dict):
+            try:
+                return item[name]
+            except KeyError:
+                raise AttributeError(name) from None
+        return getattr(item, name)
+
+
+@lru_cache(maxsize=None)
+def _extend_schema(
+    schema: Type[BaseModel], embedded: Tuple[Tuple[str, Type[BaseModel]], ...]
+) -> Type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}Expanded",
+        __base__=schema,
+        **{name: (Optional[related], None) for name, related in embedded},
+    )
+
+
+def expanded_schema(
+    schema: Type[BaseModel],
+    embedded: Sequence[Tuple[str, Type[BaseModel]]],
+    fields: Optional[Sequence[str]] = None,
+) -> Type[BaseModel]:
+    """Return ``schema`` (narrowed to ``fields``) extended with ``embedded``."""
+    base = partial_schema(schema, tuple(fields)) if fields else schema
+    return _extend_schema(base, tuple(embedded))
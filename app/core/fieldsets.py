@@ -0,0 +1,52 @@
+﻿"""
+Sparse fieldsets for Football League Manager.
+
+List and detail endpoints accept ``?fields=id,name``. The requested names are
+checked against a per-schema whitelist (declared next to the response schema
+in ``app/schemas/``), the SQL query loads only those columns through
+``load_only`` and the response is serialized with a matching partial schema
+(see ``app.core.responses``).
+"""
+
+from typing import Callable, List, Optional, Sequence
+
+from fastapi import Query
+from sqlalchemy.orm import Query as ORMQuery
+from sqlalchemy.orm import load_only
+
+from app.core.exceptions import bad_request_exception
+
+
+def sparse_fields(allowed: Sequence[str]) -> Callable[..., Optional[List[str]]]:
+    """Build a dependency that parses ``?fields=`` against a whitelist.
+
+    The dependency returns ``None`` when no fields were requested, otherwise
+    the requested names in whitelist order.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}"
+        )
+    ) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise bad_request_exception("No fields requested")
+        unknown = sorted(requested.difference(allowed))
+        if unknown:
+            raise bad_request_exception(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Allowed fields: {', '.join(allowed)}"
+            )
+        return [name for name in allowed if name in requested]
+
+    return dependency
+
+
+def load_fields(query: ORMQuery, model, fields: Optional[List[str]]) -> ORMQuery:
+    """Restrict a query to the requested columns (the primary key is kept)."""
+    if not fields:
+        return query
+    return query.options(load_only(*(getattr(model, name) for name in fields)))
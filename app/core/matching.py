@@ -0,0 +1,115 @@
+﻿"""
+Minimum-cost bipartite matching for Football League Manager.
+
+``min_cost_matching`` pairs left nodes (e.g. fixtures) with right nodes
+(e.g. referees) along the allowed edges. It finds as many pairs as possible
+and, among those matchings, the one with the lowest total cost. The problem
+is solved as a unit-capacity min-cost flow with successive shortest paths:
+every augmentation runs Dijkstra over reduced costs (Johnson potentials),
+so edge costs must not be negative. With k pairs, E edges and V nodes this
+is O(k * E log V).
+"""
+
+import heapq
+from typing import Dict, Hashable, List, Mapping, Sequence, Tuple, TypeVar
+
+Left = TypeVar("Left", bound=Hashable)
+Right = TypeVar("Right", bound=Hashable)
+
+SOURCE, SINK = 0, 1
+
+
+class _FlowGraph:
+    """Residual graph with unit capacities, stored as parallel edge lists."""
+
+    def __init__(self, size: int):
+        self.adjacent: List[List[int]] = [[] for _ in range(size)]
+        self.target: List[int] = []
+        self.capacity: List[int] = []
+        self.cost: List[float] = []
+
+    def add_edge(self, source: int, target: int, cost: float) -> None:
+        # Edge e and its reverse e ^ 1 are stored next to each other
+        for node, other, capacity, edge_cost in (
+            (source, target, 1, cost),
+            (target, source, 0, -cost),
+        ):
+            self.adjacent[node].append(len(self.target))
+            self.target.append(other)
+            self.capacity.append(capacity)
+            self.cost.append(edge_cost)
+
+    def shortest_path(self, potential: List[float]) -> List[int]:
+        """Edges of the cheapest source-sink path, updating the potentials."""
+        inf = float("inf")
+        distance = [inf] * len(self.adjacent)
+        via = [-1] * len(self.adjacent)
+        distance[SOURCE] = 0.0
+        heap = [(0.0, SOURCE)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if dist > distance[node]:
+                continue
+            for edge in self.adjacent[node]:
+                if not self.capacity[edge]:
+                    continue
+                target = self.target[edge]
+                reduced = dist + self.cost[edge] + potential[node] - potential[target]
+                if reduced < distance[target]:
+                    distance[target] = reduced
+                    via[target] = edge
+                    heapq.heappush(heap, (reduced, target))
+        if distance[SINK] == inf:
+            return []
+        for node, dist in enumerate(distance):
+            if dist < inf:
+                potential[node] += dist
+        path, node = [], SINK
+        while node != SOURCE:
+            edge = via[node]
+            path.append(edge)
+            node = self.target[edge ^ 1]
+        return path
+
+
+def min_cost_matching(
+    edges: Mapping[Left, Sequence[Tuple[Right, float]]]
+) -> Dict[Left, Right]:
+    """Match each left node to at most one right node and vice versa.
+
+    ``edges`` maps every left node to the (right node, cost) pairs it may
+    take. Returns the chosen right node per matched left node.
+    """
+    lefts = list(edges)
+    rights = list(
+        dict.fromkeys(right for pairs in edges.values() for right, _ in pairs)
+    )
+    left_node = {left: 2 + i for i, left in enumerate(lefts)}
+    right_node = {right: 2 + len(lefts) + i for i, right in enumerate(rights)}
+
+    graph = _FlowGraph(2 + len(lefts) + len(rights))
+    for left, pairs in edges.items():
+        graph.add_edge(SOURCE, left_node[left], 0)
+        for right, cost in pairs:
+            graph.add_edge(left_node[left], right_node[right], cost)
+    for right in rights:
+        graph.add_edge(right_node[right], SINK, 0)
+
+    potential = [0.0] * len(graph.adjacent)
+    for _ in lefts:
+        path = graph.shortest_path(potential)
+        if not path:
+            break
+        for edge in path:
+            graph.capacity[edge] -= 1
+            graph.capacity[edge ^ 1] += 1
+
+    # A saturated left-to-right edge is a chosen pair
+    owner = {node: right for right, node in right_node.items()}
+    matching = {}
+    for left in lefts:
+        for edge in graph.adjacent[left_node[left]]:
+            target = graph.target[edge]
+            if target in owner and edge % 2 == 0 and not graph.capacity[edge]:
+                matching[left] = owner[target]
+    return matching
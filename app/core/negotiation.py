@@ -0,0 +1,140 @@
+﻿"""
+MessagePack content negotiation for Football League Manager.
+
+Clients that send ``Accept: application/msgpack`` get MessagePack bodies
+from every endpoint; everyone else (and every client when the optional
+``msgpack`` package is not installed) keeps getting JSON.
+``NegotiationMiddleware`` records the negotiated format in a context
+variable that the response helpers in ``app.core.responses`` consult, so
+the body is encoded once in the requested format rather than transcoded.
+
+Routes built with ``MsgPackRoute`` also accept ``Content-Type:
+application/msgpack`` request bodies, decoded straight into the same
+pydantic validation path as JSON.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+_use_msgpack: ContextVar[bool] = ContextVar("use_msgpack", default=False)
+
+
+def accepts_msgpack(header: str) -> bool:
+    """Return whether an ``Accept`` value prefers MessagePack over JSON."""
+    if msgpack is None:
+        return False
+    weights = {}
+    for item in header.split(","):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[media_type.strip().lower()] = quality
+    packed = max(weights.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    return packed > 0 and packed >= weights.get("application/json", 0.0)
+
+
+def wants_msgpack() -> bool:
+    """Return whether the current response should be MessagePack."""
+    return _use_msgpack.get()
+
+
+def packb(content: Any) -> bytes:
+    """Encode JSON-compatible content as MessagePack."""
+    return msgpack.packb(content, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode a MessagePack body."""
+    return msgpack.unpackb(data, raw=False)
+
+
+class NegotiationMiddleware:
+    """ASGI middleware selecting JSON or MessagePack from ``Accept``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept":
+                accept = value.decode("latin-1")
+                break
+        # Always set the flag so in-process sub-requests never inherit it
+        token = _use_msgpack.set(accepts_msgpack(accept) if accept else False)
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name != b"vary"
+                ]
+                vary = [
+                    value
+                    for name, value in message.get("headers", [])
+                    if name == b"vary"
+                ]
+                headers.append((b"vary", b", ".join(vary + [b"Accept"])))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_vary)
+        finally:
+            _use_msgpack.reset(token)
+
+
+class MsgPackRequest(Request):
+    """Request whose ``json()`` decodes a MessagePack body."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = unpackb(await self.body())
+        return self._json
+
+
+def _is_msgpack(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES
+
+
+class MsgPackRoute(APIRoute):
+    """Route that also accepts MessagePack request bodies."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            if msgpack is not None and _is_msgpack(request.headers.get("content-type")):
+                # FastAPI only parses bodies it recognises as JSON
+                headers = [
+                    (name, b"application/json" if name == b"content-type" else value)
+                    for name, value in request.scope["headers"]
+                ]
+                scope = {**request.scope, "headers": headers}
+                request = MsgPackRequest(scope, request.receive)
+            return await handler(request)
+
+        return route_handler
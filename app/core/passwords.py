@@ -0,0 +1,232 @@
+﻿"""
+Password hashing for Football League Manager.
+
+bcrypt is deliberately slow, so hashing and verification run in a small,
+dedicated process pool (``Settings.PASSWORD_HASH_WORKERS``) instead of the
+request threadpool. A burst of logins then queues behind the pool rather
+than occupying every worker thread and stalling unrelated requests. When
+more than ``PASSWORD_HASH_MAX_QUEUE`` operations are already waiting, new
+ones are refused with 503 so the backlog cannot grow without bound.
+
+Setting ``PASSWORD_HASH_WORKERS`` to 0 hashes in the calling thread
+instead. Queue depth and latency are exposed by ``password_hash_stats``.
+
+The hashing policy (scheme and cost) comes from ``Settings``. Stored hashes
+made with another scheme or cost still verify, and ``check_and_rehash``
+returns a replacement hash for them so logins upgrade them transparently.
+The policy is passed to pool workers with every call, so they always hash
+with the settings of the process that submitted the work.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# Schemes stored hashes may use; the configured one hashes, the rest verify
+SCHEMES = ("bcrypt", "argon2")
+
+# (scheme, bcrypt rounds, argon2 memory KiB, argon2 time cost, argon2 lanes)
+Policy = Tuple[str, int, int, int, int]
+
+
+def current_policy() -> Policy:
+    """Return the hashing policy configured in ``Settings``."""
+    return (
+        settings.PASSWORD_HASH_SCHEME,
+        settings.BCRYPT_ROUNDS,
+        settings.ARGON2_MEMORY_COST,
+        settings.ARGON2_TIME_COST,
+        settings.ARGON2_PARALLELISM,
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_context(
+    scheme: str, rounds: int, memory_cost: int, time_cost: int, parallelism: int
+) -> CryptContext:
+    if scheme not in SCHEMES:
+        raise ValueError(
+            f"Unknown password hash scheme {scheme!r}, expected one of {SCHEMES}"
+        )
+    # Pinning min/max to the configured cost makes hashes with any other
+    # cost (weaker or stronger) report needs_update
+    return CryptContext(
+        schemes=[scheme] + [other for other in SCHEMES if other != scheme],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+        argon2__memory_cost=memory_cost,
+        argon2__rounds=time_cost,
+        argon2__min_rounds=time_cost,
+        argon2__max_rounds=time_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+def get_pwd_context(policy: Optional[Policy] = None) -> CryptContext:
+    """Return the CryptContext for ``policy`` (the configured one by default)."""
+    return _build_context(*(policy or current_policy()))
+
+
+def hash_password(password: str, policy: Optional[Policy] = None) -> str:
+    """Hash a password in the calling thread."""
+    return get_pwd_context(policy).hash(password)
+
+
+def check_password(
+    plain_password: str, hashed_password: str, policy: Optional[Policy] = None
+) -> bool:
+    """Verify a password in the calling thread."""
+    return get_pwd_context(policy).verify(plain_password, hashed_password)
+
+
+def check_and_rehash(
+    plain_password: str, hashed_password: str, policy: Optional[Policy] = None
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and, if its hash is outdated, return a new one.
+
+    Returns ``(verified, new_hash)`` where ``new_hash`` is None unless the
+    password matched and the stored hash does not follow the policy.
+    """
+    return get_pwd_context(policy).verify_and_update(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Return whether a stored hash does not follow the configured policy."""
+    return get_pwd_context().needs_update(hashed_password)
+
+
+class PasswordHashStats:
+    """Queue depth and latency counters for pooled hashing."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def try_start(self, limit: int) -> bool:
+        """Count a new operation unless ``limit`` are already pending."""
+        with self._lock:
+            if self.pending >= limit:
+                self.rejected += 1
+                return False
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+            return True
+
+    def finished(self, seconds: float) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self._latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+        summary: Dict[str, Any] = {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "queue_depth": self.pending,
+            "max_queue_depth": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+        if latencies:
+            summary["latency_ms"] = {
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1),
+            }
+        return summary
+
+
+_stats = PasswordHashStats()
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+def _start_method() -> str:
+    # Forking a process that runs threads (the event loop, the threadpool)
+    # can copy a held lock into the child, so workers start from a clean
+    # interpreter instead
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def get_pool() -> Optional[Executor]:
+    """Return the hashing pool, or None when hashing runs inline."""
+    global _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context(_start_method()),
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes (they are restarted on next use)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run(func: Callable, *args) -> Any:
+    if not _stats.try_start(settings.PASSWORD_HASH_MAX_QUEUE):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    start = time.perf_counter()
+    try:
+        pool = get_pool()
+        if pool is None:
+            return await run_in_threadpool(func, *args)
+        return await asyncio.wrap_future(pool.submit(func, *args))
+    finally:
+        _stats.finished(time.perf_counter() - start)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing pool."""
+    return await _run(hash_password, password, current_policy())
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool."""
+    return await _run(check_password, plain_password, hashed_password, current_policy())
+
+
+async def check_and_rehash_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Run ``check_and_rehash`` on the hashing pool."""
+    return await _run(
+        check_and_rehash, plain_password, hashed_password, current_policy()
+    )
+
+
+def password_hash_stats() -> Dict[str, Any]:
+    return _stats.snapshot()
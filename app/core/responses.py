@@ -0,0 +1,113 @@
+﻿"""
+Response helpers for Football League Manager.
+
+``FastJSONResponse`` is the application's default response class and
+encodes bodies with orjson when it is installed, falling back to the
+standard library encoder otherwise.
+
+List endpoints return ``list_response(Schema, items)`` instead of relying on
+``response_model`` serialization. The ``TypeAdapter`` for ``List[Schema]``
+is built once per schema and validates ORM rows (or cached dicts) and dumps
+them to JSON in a single pass of pydantic-core, skipping FastAPI's
+validate / ``jsonable_encoder`` / ``json.dumps`` round trip. Routes keep
+their ``response_model`` so the OpenAPI schema is unchanged.
+
+When a sparse fieldset is requested (``?fields=``) both helpers serialize
+through a partial schema holding only those fields, so columns deferred by
+``load_only`` are never touched.
+
+All of them encode MessagePack instead of JSON when the client negotiated it
+(see ``app.core.negotiation``).
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from app.core.negotiation import MSGPACK_MEDIA_TYPE, packb, wants_msgpack
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when available.
+
+    Renders MessagePack instead when the client negotiated it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if wants_msgpack():
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return packb(content)
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """Return the cached ``TypeAdapter`` for a list of ``schema``."""
+    return TypeAdapter(List[schema])
+
+
+def serialize_list(schema: Type[BaseModel], items: Iterable[Any]) -> bytes:
+    """Validate ORM objects or dicts against ``schema`` and dump them as JSON."""
+    adapter = list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+
+@lru_cache(maxsize=None)
+def partial_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Return a copy of ``schema`` restricted to ``fields``."""
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in fields
+    }
+    return create_model(
+        f"{schema.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def _select_schema(
+    schema: Type[BaseModel], fields: Optional[Sequence[str]]
+) -> Type[BaseModel]:
+    return partial_schema(schema, tuple(fields)) if fields else schema
+
+
+def list_response(
+    schema: Type[BaseModel],
+    items: Iterable[Any],
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """Build a JSON response for a list endpoint."""
+    schema = _select_schema(schema, fields)
+    if wants_msgpack():
+        adapter = list_adapter(schema)
+        validated = adapter.validate_python(items, from_attributes=True)
+        return Response(
+            content=packb(adapter.dump_python(validated, mode="json")),
+            media_type=MSGPACK_MEDIA_TYPE,
+        )
+    return Response(
+        content=serialize_list(schema, items), media_type="application/json"
+    )
+
+
+def item_response(
+    schema: Type[BaseModel], item: Any, fields: Optional[Sequence[str]] = None
+) -> Response:
+    """Build a JSON response for a detail endpoint."""
+    model = _select_schema(schema, fields).model_validate(item)
+    if wants_msgpack():
+        return Response(
+            content=packb(model.model_dump(mode="json")),
+            media_type=MSGPACK_MEDIA_TYPE,
+        )
+    return Response(content=model.model_dump_json(), media_type="application/json")
@@ -0,0 +1,115 @@
+﻿"""
+In-memory access token revocation list.
+
+In stateless mode (``Settings.AUTH_STATELESS``) a verified access token is
+trusted without loading the user, so revocations have to reach every
+process another way. Password changes and user deletions append a row to
+``token_revocations``. Each process keeps the newest minimum token version
+per user in memory and pulls only the rows it has not seen yet
+(``id > last seen``), at most every ``REVOCATION_REFRESH_SECONDS``.
+Entries are forgotten once the access token lifetime has passed, because
+every token they could reject has expired by then.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import TokenRevocation
+
+
+class RevocationList:
+    """Minimum valid token version per user, refreshed from the database."""
+
+    def __init__(self, refresh_seconds: float, retain_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.retain_seconds = retain_seconds
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._refreshed_at: Optional[float] = None
+        # user id -> (minimum version or None for all tokens, time seen)
+        self._entries: Dict[int, Tuple[Optional[int], float]] = {}
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False
+        min_version = entry[0]
+        return min_version is None or token_version < min_version
+
+    def is_deleted(self, user_id: int) -> bool:
+        entry = self._entries.get(user_id)
+        return entry is not None and entry[0] is None
+
+    def refresh_if_stale(self, db: Session) -> None:
+        refreshed_at = self._refreshed_at
+        if (
+            refreshed_at is None
+            or time.monotonic() - refreshed_at >= self.refresh_seconds
+        ):
+            self.refresh(db)
+
+    def refresh(self, db: Session) -> None:
+        """Apply revocations recorded since the last refresh."""
+        rows = (
+            db.query(
+                TokenRevocation.id,
+                TokenRevocation.user_id,
+                TokenRevocation.min_token_version,
+            )
+            .filter(TokenRevocation.id > self._last_id)
+            .order_by(TokenRevocation.id)
+            .all()
+        )
+        now = time.monotonic()
+        with self._lock:
+            for row_id, user_id, min_version in rows:
+                current = self._entries.get(user_id)
+                if current is not None and (
+                    current[0] is None
+                    or (min_version is not None and min_version < current[0])
+                ):
+                    min_version = current[0]
+                self._entries[user_id] = (min_version, now)
+                self._last_id = max(self._last_id, row_id)
+
+            cutoff = now - self.retain_seconds
+            for user_id in [
+                user_id for user_id, (_, seen) in self._entries.items() if seen < cutoff
+            ]:
+                del self._entries[user_id]
+            self._refreshed_at = now
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def record_revocation(db: Session, user_id: int, min_version: Optional[int]) -> None:
+    """Revoke tokens below ``min_version`` (all if None) when ``db`` commits."""
+    db.add(TokenRevocation(user_id=user_id, min_token_version=min_version))
+
+
+_revocations: Optional[RevocationList] = None
+_revocations_lock = threading.Lock()
+
+
+def get_revocations() -> RevocationList:
+    """Return the process-wide revocation list."""
+    global _revocations
+    if _revocations is None:
+        with _revocations_lock:
+            if _revocations is None:
+                _revocations = RevocationList(
+                    settings.REVOCATION_REFRESH_SECONDS,
+                    settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+                )
+    return _revocations
+
+
+def set_revocations(revocations: Optional[RevocationList]) -> None:
+    """Replace the process-wide list (None rebuilds it from settings)."""
+    global _revocations
+    _revocations = revocations
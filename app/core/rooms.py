@@ -0,0 +1,146 @@
+﻿"""
+WebSocket match rooms for Football League Manager.
+
+Every connection to ``/matches/{id}/room`` joins that match's room. Score
+changes published by ``update_match`` and commentary sent by members are
+broadcast to the whole room.
+
+Broadcasting never waits on a socket: each message is encoded once and put
+into every member's bounded outbox, and a per-member writer task drains the
+outbox onto its socket. Score updates are coalesced (a member only ever has
+the newest score pending) and other messages drop the oldest entry once the
+outbox is full, so a slow client loses stale updates instead of stalling
+the room or growing memory.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from app.core.config import settings
+
+
+def encode_message(kind: str, data: Any) -> str:
+    """Encode a room message once for all members."""
+    return json.dumps({"type": kind, "data": data}, default=str)
+
+
+class RoomMember:
+    """One connection's outbox and writer."""
+
+    def __init__(self, websocket, queue_size: int = 32):
+        self.websocket = websocket
+        self.messages: Deque[str] = deque(maxlen=queue_size)
+        self.latest: Dict[str, str] = {}
+        self.dropped = 0
+        self.wakeup = asyncio.Event()
+
+    def push(self, message: str, coalesce_key: Optional[str] = None) -> None:
+        """Queue a message without blocking; must run on the event loop."""
+        if coalesce_key is not None:
+            if coalesce_key in self.latest:
+                self.dropped += 1
+            self.latest[coalesce_key] = message
+        else:
+            if len(self.messages) == self.messages.maxlen:
+                self.dropped += 1
+            self.messages.append(message)
+        self.wakeup.set()
+
+    def pending(self) -> int:
+        return len(self.messages) + len(self.latest)
+
+    async def writer(self) -> None:
+        """Send queued messages until the socket fails or the task is cancelled."""
+        try:
+            while True:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                while self.messages or self.latest:
+                    if self.messages:
+                        message = self.messages.popleft()
+                    else:
+                        message = self.latest.pop(next(iter(self.latest)))
+                    await self.websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The client went away; the receive loop cleans up the membership
+            return
+
+
+class RoomManager:
+    """Rooms of connected members, keyed by match id."""
+
+    def __init__(self, queue_size: int = 32):
+        self.queue_size = queue_size
+        self._rooms: Dict[int, Set[RoomMember]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def join(self, match_id: int, websocket) -> RoomMember:
+        self._loop = asyncio.get_running_loop()
+        member = RoomMember(websocket, self.queue_size)
+        with self._lock:
+            self._rooms.setdefault(match_id, set()).add(member)
+        return member
+
+    def leave(self, match_id: int, member: RoomMember) -> None:
+        with self._lock:
+            members = self._rooms.get(match_id)
+            if members is not None:
+                members.discard(member)
+                if not members:
+                    del self._rooms[match_id]
+
+    def member_count(self, match_id: int) -> int:
+        with self._lock:
+            return len(self._rooms.get(match_id, ()))
+
+    def broadcast(
+        self, match_id: int, message: str, coalesce_key: Optional[str] = None
+    ) -> None:
+        """Queue ``message`` for every member of the room; safe from any thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._push(match_id, message, coalesce_key)
+            return
+        try:
+            loop.call_soon_threadsafe(self._push, match_id, message, coalesce_key)
+        except RuntimeError:
+            # The event loop serving the rooms has shut down
+            self._loop = None
+
+    def _push(self, match_id: int, message: str, coalesce_key: Optional[str]) -> None:
+        with self._lock:
+            members = list(self._rooms.get(match_id, ()))
+        for member in members:
+            member.push(message, coalesce_key)
+
+
+_rooms: Optional[RoomManager] = None
+_rooms_lock = threading.Lock()
+
+
+def get_rooms() -> RoomManager:
+    """Return the process-wide room manager."""
+    global _rooms
+    if _rooms is None:
+        with _rooms_lock:
+            if _rooms is None:
+                _rooms = RoomManager(settings.ROOM_QUEUE_SIZE)
+    return _rooms
+
+
+def set_rooms(rooms: Optional[RoomManager]) -> None:
+    """Replace the process-wide room manager (None rebuilds it from settings)."""
+    global _rooms
+    _rooms = rooms
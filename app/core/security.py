@@ -1,30 +1,32 @@
 ﻿# app/core/security.py
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, NamedTuple, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 from sqlalchemy.orm import Session
 
+from app.core.api_keys import is_api_key, lookup_api_key
 from app.core.config import settings
+from app.core.passwords import check_password, hash_password
+from app.core.revocation import get_revocations
+from app.core.tokens import decode_token, encode_token
 from app.database.models import User
 from app.database.session import get_db
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 
 
+# Synchronous helpers; request handlers use the pooled *_async variants in
+# app.core.passwords so bcrypt never runs on the request threadpool
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -36,31 +38,96 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return encode_token(to_encode)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+class Principal(NamedTuple):
+    """The authenticated user as carried by the access token or API key."""
+
+    id: int
+    username: str
+    token_version: int
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def verified_claims(token: str) -> Dict[str, Any]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        username: str = payload.get("sub")  # type: ignore
-        if username is None:
-            raise credentials_exception
+        payload = decode_token(token)
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    if payload.get("sub") is None:
+        raise credentials_exception()
+    return payload
+
+
+def stateless_principal(payload: Dict[str, Any], db: Session) -> Optional[Principal]:
+    """Trust the token's claims, checked against the in-memory revocation list.
 
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
+    Returns None when stateless mode is off or the token predates the ``uid``
+    claim, in which case the caller falls back to loading the user.
+    """
+    if not settings.AUTH_STATELESS or payload.get("uid") is None:
+        return None
+    principal = Principal(payload["uid"], payload["sub"], payload.get("ver", 0))
+    revocations = get_revocations()
+    revocations.refresh_if_stale(db)
+    if revocations.is_revoked(principal.id, principal.token_version):
+        raise credentials_exception()
+    return principal
+
+
+def api_key_principal(token: str, db: Session) -> Principal:
+    owner = lookup_api_key(db, token)
+    if owner is None:
+        raise credentials_exception()
+    principal = Principal(*owner)
+    # A cached owner may since have been deleted; keys outlive password changes
+    revocations = get_revocations()
+    revocations.refresh_if_stale(db)
+    if revocations.is_deleted(principal.id):
+        raise credentials_exception()
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+):
+    # Service accounts send an API key in place of the access token
+    if is_api_key(token):
+        user = db.get(User, api_key_principal(token, db).id)
+        if user is None:
+            raise credentials_exception()
+        return user
+
+    payload = verified_claims(token)
+    principal = stateless_principal(payload, db)
+    if principal is not None:
+        user = db.get(User, principal.id)
+    else:
+        user = db.query(User).filter(User.username == payload["sub"]).first()
+    # Tokens issued before the last password change carry an older version
+    if user is None or payload.get("ver", 0) < user.token_version:
+        raise credentials_exception()
     return user
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> Principal:
+    """Identify the caller; in stateless mode this makes no user query."""
+    if is_api_key(token):
+        return api_key_principal(token, db)
+
+    payload = verified_claims(token)
+    principal = stateless_principal(payload, db)
+    if principal is None:
+        user = get_current_user(token, db)
+        principal = Principal(user.id, user.username, user.token_version)
+    return principal
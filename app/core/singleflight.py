@@ -0,0 +1,160 @@
+﻿"""
+Single-flight request coalescing for Football League Manager.
+
+When many identical reads arrive at once (e.g. every client refreshing a
+team's fixtures the moment a match ends) only the first one - the leader -
+does the work; the others wait for it and share its result.
+
+* ``SingleFlight`` coalesces calls from worker threads. ``cached`` service
+  functions use it on a cache miss, so a cold key is computed once rather
+  than once per concurrent request.
+* ``SingleFlightMiddleware`` coalesces identical GET requests to the paths
+  listed in ``Settings.SINGLE_FLIGHT_PATHS``, replaying the leader's
+  response bytes to every follower.
+
+Both record per-name counters of executed and coalesced calls, exposed by
+``single_flight_stats`` and the ``/metrics`` endpoint.
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name: str, coalesced: bool) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(name, {"executed": 0, "coalesced": 0})
+        counters["coalesced" if coalesced else "executed"] += 1
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Return a snapshot of executed/coalesced counts per name."""
+    with _stats_lock:
+        return {name: dict(counters) for name, counters in _stats.items()}
+
+
+def reset_single_flight_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, name: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Run ``func`` unless a call for ``key`` is in flight; then share it.
+
+        Followers receive the leader's result object or re-raise its error.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        _record(name, coalesced=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+# Group shared by every cached service function
+service_flights = SingleFlight()
+
+
+# Request headers that change the response and so belong to the key
+_KEY_HEADERS = (b"accept", b"authorization")
+
+
+def _copy_message(message: dict) -> dict:
+    if "headers" in message:
+        return {**message, "headers": list(message["headers"])}
+    return dict(message)
+
+
+class SingleFlightMiddleware:
+    """ASGI middleware coalescing identical GET requests to configured paths.
+
+    ``paths`` are prefixes of ``scope["path"]``; the matching prefix is the
+    name the counters are recorded under.
+    """
+
+    def __init__(self, app, paths: Sequence[str] = ()):
+        self.app = app
+        self.paths = tuple(paths)
+        self._inflight: Dict[Tuple, "asyncio.Future[Optional[List[dict]]]"] = {}
+
+    def _name(self, scope) -> Optional[str]:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        for prefix in self.paths:
+            if scope["path"].startswith(prefix):
+                return prefix
+        return None
+
+    async def __call__(self, scope, receive, send):
+        name = self._name(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = tuple(
+            (key, value) for key, value in scope["headers"] if key in _KEY_HEADERS
+        )
+        key = (scope["path"], scope["query_string"], headers)
+        flight = self._inflight.get(key)
+        if flight is not None:
+            _record(name, coalesced=True)
+            messages = await asyncio.shield(flight)
+            if messages is None:
+                # The leader failed; do the work ourselves
+                await self.app(scope, receive, send)
+                return
+            for message in messages:
+                await send(_copy_message(message))
+            return
+
+        _record(name, coalesced=False)
+        flight = self._inflight[key] = asyncio.get_running_loop().create_future()
+        messages: List[dict] = []
+
+        async def capture(message):
+            messages.append(_copy_message(message))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        except BaseException:
+            flight.set_result(None)
+            raise
+        else:
+            flight.set_result(messages)
+        finally:
+            del self._inflight[key]
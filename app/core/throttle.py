@@ -0,0 +1,205 @@
+﻿"""
+Token-bucket throttling for Football League Manager.
+
+Each key (a username, a client address) owns a bucket that holds up to
+``capacity`` tokens and refills at ``per_second``. A request names every
+bucket that applies to it and is let through only if each of them holds a
+token, in which case one is taken from all of them; otherwise nothing is
+taken and the caller learns how long to wait. Two stores are available,
+mirroring the cache backends:
+
+* ``InMemoryBuckets`` - per process, for single-worker deployments and tests.
+* ``SQLiteBuckets`` - a local SQLite file shared by every worker on the
+  host, updated in a ``SQLiteFile`` write transaction so workers never race.
+
+Buckets that have refilled completely carry no information and are pruned.
+The store is selected through ``Settings.LOGIN_THROTTLE_BACKEND``.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.cache import SQLiteFile
+from app.core.config import settings
+
+# Seconds between sweeps of buckets that have refilled completely
+PRUNE_INTERVAL = 60.0
+
+
+class Limit(NamedTuple):
+    key: str
+    capacity: float
+    per_second: float
+
+
+def _refill(state: Optional[Tuple[float, float]], limit: Limit, now: float) -> float:
+    if state is None:
+        return limit.capacity
+    tokens, updated_at = state
+    return min(limit.capacity, tokens + (now - updated_at) * limit.per_second)
+
+
+def _decide(levels: List[float], limits: List[Limit]) -> float:
+    """Return 0 if every bucket has a token, else seconds until they all do."""
+    return max(
+        (
+            (1 - tokens) / limit.per_second
+            for tokens, limit in zip(levels, limits)
+            if tokens < 1
+        ),
+        default=0.0,
+    )
+
+
+class BucketStore(ABC):
+    """Interface shared by every bucket store."""
+
+    @abstractmethod
+    def take(self, limits: Iterable[Limit], now: Optional[float] = None) -> float:
+        """Take a token from every bucket, or none of them.
+
+        Returns 0 when the request may proceed, otherwise the number of
+        seconds until it would be allowed.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget every bucket."""
+
+
+class InMemoryBuckets(BucketStore):
+    """Per-process buckets held in a dictionary."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+
+    def take(self, limits: Iterable[Limit], now: Optional[float] = None) -> float:
+        limits = list(limits)
+        now = time.time() if now is None else now
+        with self._lock:
+            levels = []
+            for limit in limits:
+                bucket = self._buckets.get(limit.key)
+                levels.append(_refill(bucket and bucket[:2], limit, now))
+            retry_after = _decide(levels, limits)
+            if retry_after == 0:
+                for tokens, limit in zip(levels, limits):
+                    full_at = now + (limit.capacity - tokens + 1) / limit.per_second
+                    self._buckets[limit.key] = (tokens - 1, now, full_at)
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                for key in [k for k, v in self._buckets.items() if v[2] <= now]:
+                    del self._buckets[key]
+                self._pruned_at = now
+        return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBuckets(BucketStore):
+    """Buckets stored in a local SQLite file, shared by all worker processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pruned_at = 0.0
+        self._db = SQLiteFile(
+            path,
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, full_at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS ix_buckets_full_at ON buckets (full_at)",
+        )
+
+    def take(self, limits: Iterable[Limit], now: Optional[float] = None) -> float:
+        limits = list(limits)
+        now = time.time() if now is None else now
+        with self._db.transaction() as conn:
+            levels = []
+            for limit in limits:
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE key = ?",
+                    (limit.key,),
+                ).fetchone()
+                levels.append(_refill(row, limit, now))
+            retry_after = _decide(levels, limits)
+            if retry_after == 0:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO buckets "
+                    "(key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            limit.key,
+                            tokens - 1,
+                            now,
+                            now + (limit.capacity - tokens + 1) / limit.per_second,
+                        )
+                        for tokens, limit in zip(levels, limits)
+                    ],
+                )
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+                self._pruned_at = now
+        return retry_after
+
+    def clear(self) -> None:
+        with self._db.locked() as conn:
+            conn.execute("DELETE FROM buckets")
+
+    def __len__(self) -> int:
+        with self._db.locked() as conn:
+            return conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+
+def create_bucket_store(backend: str, url: str = "") -> BucketStore:
+    """Build a bucket store by name."""
+    if backend == "memory":
+        return InMemoryBuckets()
+    if backend == "sqlite":
+        return SQLiteBuckets(url)
+    raise ValueError(f"Unknown throttle backend '{backend}'")
+
+
+_store: Optional[BucketStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store() -> BucketStore:
+    """Return the store selected by ``Settings.LOGIN_THROTTLE_BACKEND``."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_bucket_store(
+                    settings.LOGIN_THROTTLE_BACKEND, settings.LOGIN_THROTTLE_URL
+                )
+    return _store
+
+
+def set_bucket_store(store: Optional[BucketStore]) -> None:
+    """Replace the process-wide store (None rebuilds it from settings)."""
+    global _store
+    _store = store
+
+
+def login_limits(username: str, client_ip: str) -> List[Limit]:
+    """The buckets a login attempt draws from."""
+    return [
+        Limit(
+            f"login:user:{username.lower()}",
+            settings.LOGIN_USERNAME_BURST,
+            settings.LOGIN_USERNAME_PER_MINUTE / 60,
+        ),
+        Limit(
+            f"login:ip:{client_ip}",
+            settings.LOGIN_IP_BURST,
+            settings.LOGIN_IP_PER_MINUTE / 60,
+        ),
+    ]
@@ -0,0 +1,132 @@
+﻿"""
+JWT encoding and verification for Football League Manager.
+
+Checking a bearer token means base64 and JSON decoding, an HMAC comparison
+and claim validation, and clients send the same token with every request.
+Verified tokens are therefore cached: entries are keyed by the SHA-256
+digest of the token (raw tokens are never kept) and hold the decoded claims
+until the token's ``exp``. The cache is an LRU bounded by
+``Settings.TOKEN_CACHE_SIZE`` (0 disables it). Only tokens that verified are
+stored, so a flood of forged tokens cannot evict real ones.
+
+The signing key object is built once per secret and algorithm instead of on
+every encode and decode.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwk, jwt
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+Claims = Dict[str, Any]
+
+
+@lru_cache(maxsize=4)
+def _build_key(secret: str, algorithm: str) -> Key:
+    return jwk.construct(secret, algorithm)
+
+
+def signing_key() -> Key:
+    """Return the parsed key for ``SECRET_KEY`` and ``ALGORITHM``."""
+    return _build_key(settings.SECRET_KEY, settings.ALGORITHM)
+
+
+class TokenCache:
+    """Bounded LRU of token digests to verified claims, honouring ``exp``."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[float, Claims]]" = OrderedDict()
+
+    def get(self, digest: bytes, now: float) -> Optional[Claims]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, digest: bytes, expires_at: float, claims: Claims) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (expires_at, claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache: Optional[TokenCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> TokenCache:
+    """Return the process-wide verified-token cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+    return _cache
+
+
+def set_token_cache(cache: Optional[TokenCache]) -> None:
+    """Replace the process-wide cache (None rebuilds it from settings)."""
+    global _cache
+    _cache = cache
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def encode_token(claims: Claims) -> str:
+    """Sign ``claims`` with the configured key and algorithm."""
+    return jwt.encode(claims, signing_key(), algorithm=settings.ALGORITHM)
+
+
+def decode_token(token: str) -> Claims:
+    """Return the verified claims of ``token``, raising ``JWTError`` if invalid.
+
+    The returned dict is shared with the cache and must not be modified.
+    """
+    cache = get_token_cache()
+    digest = token_digest(token)
+    now = time.time()
+    claims = cache.get(digest, now)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, signing_key(), algorithms=[settings.ALGORITHM])
+    # Tokens without an expiry are verified every time
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        cache.put(digest, float(exp), claims)
+    return claims
+
+
+def token_cache_stats() -> Dict[str, int]:
+    return get_token_cache().stats()
@@ -1,5 +1,15 @@
-﻿from sqlalchemy import CheckConstraint, Column, DateTime, Integer, String, func
-from sqlalchemy.orm import declarative_base
+﻿from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
@@ -17,19 +27,98 @@ class Team(Base):
 
     __table_args__ = (CheckConstraint("founded_year > 1800", name="chk_founded_year"),)
 
+    # Read-only relationships used for eager loading; writes still go
+    # through the team_id columns so existing delete behaviour is unchanged
+    players = relationship(
+        "Player",
+        primaryjoin="Team.id == foreign(Player.team_id)",
+        order_by="Player.id",
+        viewonly=True,
+    )
+    coaches = relationship(
+        "Coach",
+        primaryjoin="Team.id == foreign(Coach.team_id)",
+        order_by="Coach.id",
+        viewonly=True,
+    )
+    managers = relationship(
+        "Manager",
+        primaryjoin="Team.id == foreign(Manager.team_id)",
+        order_by="Manager.id",
+        viewonly=True,
+    )
+    matches = relationship(
+        "Match",
+        primaryjoin="or_(Team.id == foreign(Match.team_a_id), "
+        "Team.id == foreign(Match.team_b_id))",
+        order_by="Match.match_date",
+        viewonly=True,
+    )
+
 
 class User(Base):
     __tablename__ = "users"
+    # Ids are never handed out again, so nothing keyed by a deleted user's id
+    # (tokens, API keys, revocations) can ever match a new account
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), nullable=False, unique=True)
     email = Column(String(100), nullable=False, unique=True)
     full_name = Column(String(100))
     hashed_password = Column(String(255), nullable=False)
+    # Bumped when the password changes; access tokens carry the version they
+    # were issued under, so older tokens stop working
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
+class TokenRevocation(Base):
+    """Append-only log read by the in-memory revocation list."""
+
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    # Tokens issued under a lower version are revoked; NULL revokes them all
+    # (the user was deleted)
+    min_token_version = Column(Integer)
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+
+
+class RefreshToken(Base):
+    """Opaque refresh tokens, stored as SHA-256 digests."""
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    # Each rotation stays in the family of the login that started it;
+    # presenting an already rotated token revokes the whole family
+    family_id = Column(String(32), nullable=False, index=True)
+    token_version = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class ApiKey(Base):
+    """API keys for service accounts, stored as SHA-256 digests."""
+
+    __tablename__ = "api_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    # First characters of the key, kept so owners can tell their keys apart
+    prefix = Column(String(16), nullable=False)
+    key_hash = Column(String(64), nullable=False, unique=True)
+    revoked_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+
+
 class Match(Base):
     __tablename__ = "matches"
 
@@ -40,12 +129,27 @@ class Match(Base):
     venue = Column(String(150), nullable=False)
     score_team_a = Column(Integer, default=0)
     score_team_b = Column(Integer, default=0)
+    referee_id = Column(Integer, index=True)
+    # Set together with the team_season_stats update (standings_service), so
+    # other writes to the row never change what the standings count
+    result_recorded = Column(Boolean, nullable=False, default=False, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
         CheckConstraint("score_team_a >= 0", name="chk_score_team_a"),
         CheckConstraint("score_team_b >= 0", name="chk_score_team_b"),
+        # Range scans for double-booking checks (app/services/schedule_service)
+        Index("ix_matches_venue_match_date", "venue", "match_date"),
+        Index("ix_matches_team_a_id_match_date", "team_a_id", "match_date"),
+        Index("ix_matches_team_b_id_match_date", "team_b_id", "match_date"),
+    )
+
+    team_a = relationship(
+        "Team", primaryjoin="foreign(Match.team_a_id) == Team.id", viewonly=True
+    )
+    team_b = relationship(
+        "Team", primaryjoin="foreign(Match.team_b_id) == Team.id", viewonly=True
     )
 
 
@@ -64,6 +168,10 @@ class Player(Base):
         CheckConstraint("age >= 16 AND age <= 50", name="chk_player_age"),
     )
 
+    team = relationship(
+        "Team", primaryjoin="foreign(Player.team_id) == Team.id", viewonly=True
+    )
+
 
 class Coach(Base):
     __tablename__ = "coaches"
@@ -81,6 +189,10 @@ class Coach(Base):
         CheckConstraint("experience_years >= 0", name="chk_coach_experience_years"),
     )
 
+    team = relationship(
+        "Team", primaryjoin="foreign(Coach.team_id) == Team.id", viewonly=True
+    )
+
 
 class Manager(Base):
     __tablename__ = "managers"
@@ -96,6 +208,10 @@ class Manager(Base):
         CheckConstraint("strategy IS NOT NULL", name="chk_manager_strategy"),
     )
 
+    team = relationship(
+        "Team", primaryjoin="foreign(Manager.team_id) == Team.id", viewonly=True
+    )
+
 
 class Venue(Base):
     __tablename__ = "venues"
@@ -146,3 +262,31 @@ class Sponsor(Base):
             "sponsorship_amount > 0", name="chk_sponsor_sponsorship_amount"
         ),
     )
+
+
+class TeamSeasonStats(Base):
+    """Per-team, per-season record maintained by the match write paths."""
+
+    __tablename__ = "team_season_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, nullable=False)
+    season = Column(Integer, nullable=False)
+    played = Column(Integer, nullable=False, default=0)
+    won = Column(Integer, nullable=False, default=0)
+    drawn = Column(Integer, nullable=False, default=0)
+    lost = Column(Integer, nullable=False, default=0)
+    goals_for = Column(Integer, nullable=False, default=0)
+    goals_against = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("team_id", "season", name="uq_team_season_stats_team_season"),
+        Index("ix_team_season_stats_season_points", "season", "points"),
+        CheckConstraint("played >= 0", name="chk_team_season_stats_played"),
+    )
+
+    @property
+    def goal_difference(self) -> int:
+        return (self.goals_for or 0) - (self.goals_against or 0)
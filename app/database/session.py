@@ -1,6 +1,9 @@
 ﻿# app/database/session.py
+from contextvars import ContextVar
+from typing import Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
@@ -14,10 +17,32 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# Session reused by every sub-request of a POST /batch call; the batch
+# endpoint owns it, so get_db hands it out without closing it
+shared_session: ContextVar[Optional[Session]] = ContextVar(
+    "shared_session", default=None
+)
+
+
 # Dependency to get DB session
 def get_db():
+    shared = shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def release_connection(db: Session) -> None:
+    """Hand the session's connection back to the pool before slow work.
+
+    Does nothing while a batch call shares the session, since later
+    sub-requests still need its transaction and loaded objects.
+    """
+    if db is not shared_session.get():
+        db.close()
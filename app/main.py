@@ -1,18 +1,101 @@
-﻿from fastapi import FastAPI
+﻿import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
 
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.events import get_broker, set_broker
+from app.core.negotiation import NegotiationMiddleware
+from app.core.passwords import password_hash_stats, shutdown_pool
+from app.core.responses import FastJSONResponse
+from app.core.singleflight import SingleFlightMiddleware, single_flight_stats
+from app.core.tokens import token_cache_stats
+from app.database.session import get_db
 from app.routers import (
     auth_router,
+    batch_router,
     coach_router,
     match_router,
     player_router,
     referee_router,
+    standings_router,
     team_router,
     user_router,
     venue_router,
 )
+from app.services import token_service, warmup_service
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI):
+    """Fill the hot caches, then mark the app as ready.
+
+    A failed warm-up is logged and recorded on ``app.state.warmup_error`` so
+    /health reports it instead of warming up forever.
+    """
+    try:
+        if settings.CACHE_WARMUP_ENABLED:
+            # Resolve get_db through the overrides so tests warm their own database
+            db_dependency = app.dependency_overrides.get(get_db, get_db)
+            db_session = db_dependency()
+            try:
+                db = next(db_session)
+                app.state.warmup = await run_in_threadpool(
+                    warmup_service.warm_caches, db, settings.CACHE_WARMUP_DATASETS
+                )
+            finally:
+                db_session.close()
+    except Exception as exc:
+        logger.exception("Cache warm-up failed")
+        app.state.warmup_error = type(exc).__name__
+        return
+    app.state.ready = True
+
+
+async def sweep_tokens(app: FastAPI):
+    """Delete expired refresh tokens and revocations, in batches, forever."""
+    while True:
+        await asyncio.sleep(settings.TOKEN_SWEEP_INTERVAL_SECONDS)
+        db_dependency = app.dependency_overrides.get(get_db, get_db)
+        db_session = db_dependency()
+        db = next(db_session)
+        try:
+            app.state.token_sweep = await run_in_threadpool(
+                token_service.sweep_expired_tokens,
+                db,
+                settings.TOKEN_SWEEP_BATCH_SIZE,
+            )
+        except Exception:  # try again next interval
+            logger.exception("Token sweep failed")
+        finally:
+            db_session.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warmup = None
+    app.state.warmup_error = None
+    app.state.token_sweep = None
+    warmup_task = asyncio.create_task(warm_up(app))
+    sweep_task = asyncio.create_task(sweep_tokens(app))
+    yield
+    warmup_task.cancel()
+    sweep_task.cancel()
+    # End open score streams so the server can shut down
+    get_broker().close()
+    set_broker(None)
+    shutdown_pool()
+
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="Football League Manager API",
     description="""
     🏈 **Community Football League Manager**
@@ -40,6 +123,16 @@ app = FastAPI(
     },
 )
 
+if settings.SINGLE_FLIGHT_ENABLED:
+    app.add_middleware(SingleFlightMiddleware, paths=settings.SINGLE_FLIGHT_PATHS)
+app.add_middleware(NegotiationMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
 # Include routers
 app.include_router(auth_router.router, prefix="/api/v1", tags=["auth"])
 app.include_router(user_router.router, prefix="/api/v1", tags=["users"])
@@ -49,6 +142,8 @@ app.include_router(match_router.router, prefix="/api/v1", tags=["matches"])
 app.include_router(coach_router.router, prefix="/api/v1", tags=["coaches"])
 app.include_router(venue_router.router, prefix="/api/v1", tags=["venues"])
 app.include_router(referee_router.router, prefix="/api/v1", tags=["referees"])
+app.include_router(standings_router.router, prefix="/api/v1", tags=["standings"])
+app.include_router(batch_router.router, prefix="/api/v1", tags=["batch"])
 
 
 @app.get("/")
@@ -121,7 +216,7 @@ def demo_interface():
                 <li><code>GET /api/v1/teams/</code> - List all teams</li>
                 <li><code>GET /api/v1/players/</code> - List all players</li>
                 <li><code>GET /api/v1/matches/</code> - List all matches</li>
-                <li><code>GET /api/v1/standings/</code> - League table (if implemented)</li>
+                <li><code>GET /api/v1/standings/</code> - League table</li>
             </ul>
         </div>
         
@@ -135,4 +230,20 @@ def demo_interface():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    error = getattr(app.state, "warmup_error", None)
+    if error is not None:
+        return FastJSONResponse(
+            status_code=503, content={"status": "warmup_failed", "error": error}
+        )
+    if not getattr(app.state, "ready", False):
+        return FastJSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "healthy", "warmup": app.state.warmup}
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "single_flight": single_flight_stats(),
+        "password_hashing": password_hash_stats(),
+        "token_cache": token_cache_stats(),
+    }
@@ -1,38 +1,176 @@
 ﻿# app/routers/auth_router.py
+import math
 from datetime import timedelta
+from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
+from app.core.api_keys import create_api_key, revoke_api_key
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
-from app.database.models import User
-from app.database.session import get_db
-from app.schemas.user import Token
+from app.core.exceptions import InvalidRefreshTokenException
+from app.core.passwords import check_and_rehash_async
+from app.core.security import Principal, create_access_token, get_current_principal
+from app.core.throttle import get_bucket_store, login_limits
+from app.database.models import ApiKey, User
+from app.database.session import get_db, release_connection
+from app.schemas.user import (
+    ApiKeyCreate,
+    ApiKeyCreated,
+    ApiKeyResponse,
+    RefreshRequest,
+    Token,
+)
+from app.services import token_service
 
 # Change this line - use the full path for tokenUrl
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")  # ← Add full path
 
 
-@router.post("/token", response_model=Token)
-def login_for_access_token(
+def find_user(db: Session, username: str):
+    # Detach the user and hand the connection back to the pool before bcrypt
+    # runs, so queued logins do not exhaust the connection pool
+    user = db.query(User).filter(User.username == username).first()
+    release_connection(db)
+    return user
+
+
+def save_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    db.query(User).filter(User.id == user_id).update(
+        {User.hashed_password: hashed_password}
+    )
+    db.commit()
+
+
+def throttle_login(
+    request: Request, form_data: OAuth2PasswordRequestForm = Depends()
+) -> None:
+    # Runs before the endpoint body, so throttled attempts never reach bcrypt
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = get_bucket_store().take(login_limits(form_data.username, client_ip))
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def token_response(principal: Principal, refresh_token: str) -> dict:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={
+            "sub": principal.username,
+            "uid": principal.id,
+            "ver": principal.token_version,
+        },
+        expires_delta=access_token_expires,
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/token", response_model=Token, dependencies=[Depends(throttle_login)])
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
-    # Check if user exists and password is correct
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Check if user exists and password is correct; bcrypt runs on the
+    # hashing pool so a burst of logins cannot tie up the threadpool
+    user = await run_in_threadpool(find_user, db, form_data.username)
+    verified, new_hash = (
+        await check_and_rehash_async(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+    # Upgrade hashes made under an older scheme or cost
+    if new_hash:
+        await run_in_threadpool(save_password_hash, db, user.id, new_hash)
+
+    refresh_token = await run_in_threadpool(
+        token_service.issue_refresh_token, db, user.id, user.token_version
     )
+    principal = Principal(user.id, user.username, user.token_version)
+    return token_response(principal, refresh_token)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+
+# Renewal is one indexed lookup; the password is not checked again
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(body: RefreshRequest, db: Session = Depends(get_db)):
+    try:
+        principal, refresh_token = token_service.rotate_refresh_token(
+            db, body.refresh_token
+        )
+    except InvalidRefreshTokenException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exc),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_response(principal, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(body: RefreshRequest, db: Session = Depends(get_db)):
+    token_service.revoke_refresh_token(db, body.refresh_token)
+    return None
+
+
+# API keys let service accounts authenticate without a password; the plain
+# key is returned once, at creation
+@router.post(
+    "/api-keys", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED
+)
+def create_key(
+    body: ApiKeyCreate,
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    api_key, key = create_api_key(db, principal.id, body.name)
+    return {**ApiKeyResponse.model_validate(api_key).model_dump(), "key": key}
+
+
+@router.get("/api-keys", response_model=List[ApiKeyResponse])
+def list_keys(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    return (
+        db.query(ApiKey)
+        .filter(ApiKey.user_id == principal.id)
+        .order_by(ApiKey.id)
+        .all()
+    )
+
+
+@router.delete("/api-keys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_key(
+    key_id: int,
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    api_key = (
+        db.query(ApiKey)
+        .filter(ApiKey.id == key_id, ApiKey.user_id == principal.id)
+        .first()
+    )
+    if api_key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="API key not found"
+        )
+    revoke_api_key(db, api_key)
+    return None
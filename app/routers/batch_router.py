@@ -0,0 +1,156 @@
+﻿# app/routers/batch_router.py
+"""
+Multiplexed batch endpoint.
+
+``POST /api/v1/batch`` runs a list of sub-requests in-process against the
+application's own routes and returns every result in one response. Sub-
+requests run in order on the batch call's database session, which is rolled
+back whenever one fails with a server error; with ``parallel`` set,
+consecutive GET sub-requests are dispatched concurrently instead, each on its
+own session since a SQLAlchemy session must not be used from several threads
+at once.
+"""
+
+import asyncio
+import json
+from typing import List
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import bad_request_exception
+from app.core.negotiation import MSGPACK_MEDIA_TYPE, MsgPackRoute, unpackb
+from app.database.session import get_db, shared_session
+from app.schemas.batch import BatchRequest, BatchResponse, SubRequest, SubResponse
+
+# Bulk writes may be sent as MessagePack as well as JSON
+router = APIRouter(prefix="/batch", tags=["batch"], route_class=MsgPackRoute)
+
+# Parent request headers passed on to every sub-request
+FORWARDED_HEADERS = (b"authorization", b"cookie", b"user-agent")
+
+
+def _sub_scope(request: Request, sub: SubRequest, body: bytes) -> dict:
+    url = urlsplit(sub.path)
+    headers = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name in FORWARDED_HEADERS
+    ]
+    headers += [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in sub.headers.items()
+    ]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+    return {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": sub.method,
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+    }
+
+
+async def _dispatch(request: Request, sub: SubRequest) -> SubResponse:
+    """Run one sub-request through the ASGI app and capture its response."""
+    body = b"" if sub.body is None else json.dumps(sub.body).encode()
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    start = {}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(_sub_scope(request, sub, body), receive, send)
+    except Exception:
+        # ServerErrorMiddleware has already sent a 500 before re-raising
+        if not start:
+            return SubResponse(status=500, headers={}, body="Internal Server Error")
+    return _sub_response(start, b"".join(chunks))
+
+
+def _decode_payload(content_type: str, content: bytes):
+    """Decode a sub-response body according to its content type."""
+    if content_type.startswith("application/json") and content:
+        return json.loads(content)
+    if content_type.startswith(MSGPACK_MEDIA_TYPE) and content:
+        return unpackb(content)
+    return content.decode("utf-8", errors="replace") or None
+
+
+def _sub_response(start: dict, content: bytes) -> SubResponse:
+    """Build the SubResponse from the captured start message and body."""
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in start.get("headers", [])
+    }
+    payload = _decode_payload(headers.get("content-type", ""), content)
+    return SubResponse(status=start.get("status", 500), headers=headers, body=payload)
+
+
+async def _dispatch_parallel(request: Request, subs: List[SubRequest]):
+    token = shared_session.set(None)
+    try:
+        return await asyncio.gather(*(_dispatch(request, sub) for sub in subs))
+    finally:
+        shared_session.reset(token)
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest, request: Request, db: Session = Depends(get_db)
+):
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise bad_request_exception(
+            f"At most {settings.BATCH_MAX_REQUESTS} sub-requests are allowed"
+        )
+    batch_path = request.url.path.rstrip("/")
+    for sub in batch.requests:
+        if urlsplit(sub.path).path.rstrip("/") == batch_path:
+            raise bad_request_exception("Batch requests cannot be nested")
+
+    responses: List[SubResponse] = []
+    token = shared_session.set(db)
+    try:
+        pending_reads: List[SubRequest] = []
+        for sub in batch.requests:
+            if batch.parallel and sub.method == "GET":
+                pending_reads.append(sub)
+                continue
+            if pending_reads:
+                responses += await _dispatch_parallel(request, pending_reads)
+                pending_reads = []
+            response = await _dispatch(request, sub)
+            if response.status >= 500:
+                # The failed sub-request may have left the transaction broken
+                db.rollback()
+            responses.append(response)
+        if pending_reads:
+            responses += await _dispatch_parallel(request, pending_reads)
+    finally:
+        shared_session.reset(token)
+
+    return {"responses": responses}
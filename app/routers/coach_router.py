@@ -1,14 +1,18 @@
 ﻿# app/routers/coach_router.py
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.batch import batch_response, id_list
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.responses import item_response, list_response
 from app.database.models import Coach, Team
 from app.database.session import get_db
-from app.schemas.coach import CoachCreate, CoachResponse, CoachUpdate
+from app.schemas.coach import COACH_FIELDS, CoachCreate, CoachResponse, CoachUpdate
 
 router = APIRouter(prefix="/coaches", tags=["coaches"])
+select_fields = sparse_fields(COACH_FIELDS)
 
 
 @router.post("/", response_model=CoachResponse, status_code=status.HTTP_201_CREATED)
@@ -28,23 +32,42 @@ def create_coach(coach: CoachCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[CoachResponse])
-def get_coaches(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    coaches = db.query(Coach).offset(skip).limit(limit).all()
-    return coaches
+def get_coaches(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(id_list),
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    query = load_fields(db.query(Coach), Coach, fields)
+    if ids is not None:
+        return batch_response(CoachResponse, query, Coach, ids, fields)
+    coaches = query.offset(skip).limit(limit).all()
+    return list_response(CoachResponse, coaches, fields)
 
 
 @router.get("/{coach_id}", response_model=CoachResponse)
-def get_coach(coach_id: int, db: Session = Depends(get_db)):
-    coach = db.query(Coach).filter(Coach.id == coach_id).first()
+def get_coach(
+    coach_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    coach = (
+        load_fields(db.query(Coach), Coach, fields).filter(Coach.id == coach_id).first()
+    )
     if not coach:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Coach not found"
         )
-    return coach
+    return item_response(CoachResponse, coach, fields)
 
 
 @router.get("/team/{team_id}", response_model=List[CoachResponse])
-def get_team_coaches(team_id: int, db: Session = Depends(get_db)):
+def get_team_coaches(
+    team_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
     # Check if team exists
     team = db.query(Team).filter(Team.id == team_id).first()
     if not team:
@@ -52,8 +75,12 @@ def get_team_coaches(team_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
         )
 
-    coaches = db.query(Coach).filter(Coach.team_id == team_id).all()
-    return coaches
+    coaches = (
+        load_fields(db.query(Coach), Coach, fields)
+        .filter(Coach.team_id == team_id)
+        .all()
+    )
+    return list_response(CoachResponse, coaches, fields)
 
 
 @router.put("/{coach_id}", response_model=CoachResponse)
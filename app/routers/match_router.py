@@ -1,14 +1,85 @@
 ﻿# app/routers/match_router.py
-from typing import List
+import asyncio
+import json
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.batch import fetch_by_ids, id_list, with_missing_ids
+from app.core.cache import invalidate
+from app.core.config import settings
+from app.core.events import event_stream, get_broker
+from app.core.exceptions import ScheduleClashException, TeamNotFoundException
+from app.core.expand import expand_options, expanded_schema
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.responses import item_response, list_response
+from app.core.rooms import encode_message, get_rooms
 from app.database.models import Match, Team
 from app.database.session import get_db
-from app.schemas.match import MatchCreate, MatchResponse, MatchUpdate
+from app.schemas.match import (
+    MATCH_EXPANSIONS,
+    MATCH_FIELDS,
+    FixtureGenerate,
+    FixtureGenerateResponse,
+    MatchCreate,
+    MatchNestedResponse,
+    MatchResponse,
+    MatchUpdate,
+    ScheduleValidate,
+    ScheduleValidateResponse,
+)
+from app.services import match_service, schedule_service, standings_service
 
 router = APIRouter(prefix="/matches", tags=["matches"])
+select_fields = sparse_fields(MATCH_FIELDS)
+select_expand = expand_options(tuple(MATCH_EXPANSIONS))
+
+
+def _expanded_schema(fields, expand):
+    embedded = [field for relation in expand for field in MATCH_EXPANSIONS[relation]]
+    return expanded_schema(MatchResponse, embedded, fields)
+
+
+def match_list_response(db: Session, matches, fields, expand):
+    if not expand:
+        return list_response(MatchResponse, matches, fields)
+    return list_response(
+        _expanded_schema(fields, expand),
+        match_service.expand_matches(db, matches, expand),
+    )
+
+
+def load_match_fields(db: Session, fields, expand):
+    columns = match_service.expand_columns(fields, expand)
+    return load_fields(db.query(Match), Match, columns)
+
+
+def invalidate_match_caches():
+    """Drop cached views derived from the matches table."""
+    invalidate("standings")
+    invalidate("upcoming_fixtures")
+    invalidate("venue_statistics")
+
+
+def clash_conflict(clashes) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": "The match clashes with another booking",
+            "clashes": [clash._asdict() for clash in clashes],
+        },
+    )
 
 
 @router.post("/", response_model=MatchResponse, status_code=status.HTTP_201_CREATED)
@@ -29,27 +100,174 @@ def create_match(match: MatchCreate, db: Session = Depends(get_db)):
             detail="A team cannot play against itself",
         )
 
+    # Neither the venue nor either team may already be booked around kick-off
+    fixture = schedule_service.Fixture(
+        match.team_a_id, match.team_b_id, match.match_date, match.venue
+    )
+    clashes = schedule_service.find_clashes(db, [fixture])
+    if clashes:
+        raise clash_conflict(clashes)
+
     db_match = Match(**match.dict())
     db.add(db_match)
+    standings_service.record_result(db, db_match)
     db.commit()
     db.refresh(db_match)
+    invalidate_match_caches()
     return db_match
 
 
+# A whole season in one request: one multi-row INSERT and one commit instead
+# of a POST per fixture
+@router.post(
+    "/fixtures",
+    response_model=FixtureGenerateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def generate_fixtures(fixtures: FixtureGenerate, db: Session = Depends(get_db)):
+    # Generated fixtures are unplayed, so they must not count towards standings
+    if fixtures.start_date <= datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Fixtures must start in the future",
+        )
+    try:
+        summary = match_service.generate_fixtures(
+            db,
+            fixtures.team_ids,
+            fixtures.start_date,
+            fixtures.days_between_rounds,
+            fixtures.double_round_robin,
+        )
+    except TeamNotFoundException as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except ScheduleClashException as exc:
+        raise clash_conflict(exc.clashes)
+    invalidate_match_caches()
+    return summary
+
+
+# Checks a whole schedule at once (against itself and existing bookings)
+# without writing anything
+@router.post("/validate", response_model=ScheduleValidateResponse)
+def validate_schedule(schedule: ScheduleValidate, db: Session = Depends(get_db)):
+    fixtures = [
+        schedule_service.Fixture(
+            match.team_a_id, match.team_b_id, match.match_date, match.venue
+        )
+        for match in schedule.matches
+    ]
+    clashes = schedule_service.find_clashes(db, fixtures)
+    return {"valid": not clashes, "clashes": [clash._asdict() for clash in clashes]}
+
+
 @router.get("/", response_model=List[MatchResponse])
-def get_matches(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    matches = db.query(Match).offset(skip).limit(limit).all()
-    return matches
+def get_matches(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(id_list),
+    fields: Optional[List[str]] = Depends(select_fields),
+    expand: Optional[List[str]] = Depends(select_expand),
+    db: Session = Depends(get_db),
+):
+    query = load_match_fields(db, fields, expand)
+    if ids is not None:
+        matches, missing = fetch_by_ids(query, Match, ids)
+        response = match_list_response(db, matches, fields, expand)
+        return with_missing_ids(response, missing)
+    matches = query.offset(skip).limit(limit).all()
+    return match_list_response(db, matches, fields, expand)
+
+
+@router.get("/upcoming", response_model=List[MatchResponse])
+def get_upcoming_matches(
+    limit: int = 20,
+    fields: Optional[List[str]] = Depends(select_fields),
+    expand: Optional[List[str]] = Depends(select_expand),
+    db: Session = Depends(get_db),
+):
+    matches = match_service.get_upcoming_matches(db, limit)
+    return match_list_response(db, matches, fields, expand)
+
+
+@router.get("/nested", response_model=List[MatchNestedResponse])
+def get_matches_nested(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    matches = match_service.get_matches_nested(db, skip, limit)
+    return list_response(MatchNestedResponse, matches)
+
+
+def score_stream(topic: str, last_event_id: Optional[int]) -> StreamingResponse:
+    stream = event_stream(
+        get_broker(), topic, last_event_id, settings.SSE_KEEPALIVE_SECONDS
+    )
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_league_scores(last_event_id: Optional[int] = Header(None)):
+    """Server-Sent Events stream of score changes across the league."""
+    return score_stream(match_service.LEAGUE_TOPIC, last_event_id)
+
+
+@router.get("/{match_id}/stream", response_class=StreamingResponse)
+async def stream_match_scores(
+    match_id: int, last_event_id: Optional[int] = Header(None)
+):
+    """Server-Sent Events stream of score changes for one match."""
+    return score_stream(match_service.match_topic(match_id), last_event_id)
+
+
+@router.websocket("/{match_id}/room")
+async def match_room(websocket: WebSocket, match_id: int):
+    """Live room for one match: score pushes plus member commentary.
+
+    Members send ``{"type": "comment", "text": "..."}``; everyone in the room
+    receives ``{"type": "comment" | "score", "data": {...}}`` messages.
+    """
+    await websocket.accept()
+    rooms = get_rooms()
+    member = rooms.join(match_id, websocket)
+    writer = asyncio.create_task(member.writer())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                continue
+            if not isinstance(message, dict) or message.get("type") != "comment":
+                continue
+            text = str(message.get("text", ""))[: settings.ROOM_MAX_COMMENT_LENGTH]
+            if text:
+                rooms.broadcast(match_id, encode_message("comment", {"text": text}))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        rooms.leave(match_id, member)
+        writer.cancel()
 
 
 @router.get("/{match_id}", response_model=MatchResponse)
-def get_match(match_id: int, db: Session = Depends(get_db)):
-    match = db.query(Match).filter(Match.id == match_id).first()
+def get_match(
+    match_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    expand: Optional[List[str]] = Depends(select_expand),
+    db: Session = Depends(get_db),
+):
+    match = load_match_fields(db, fields, expand).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Match not found"
         )
-    return match
+    if expand:
+        (match,) = match_service.expand_matches(db, [match], expand)
+        return item_response(_expanded_schema(fields, expand), match)
+    return item_response(MatchResponse, match, fields)
 
 
 @router.put("/{match_id}", response_model=MatchResponse)
@@ -62,11 +280,30 @@ def update_match(
             status_code=status.HTTP_404_NOT_FOUND, detail="Match not found"
         )
 
-    for field, value in match_update.dict(exclude_unset=True).items():
+    changes = match_update.dict(exclude_unset=True)
+
+    # Moving the match to another kick-off or ground must not double-book it
+    if "match_date" in changes or "venue" in changes:
+        fixture = schedule_service.Fixture(
+            match.team_a_id,
+            match.team_b_id,
+            changes.get("match_date", match.match_date),
+            changes.get("venue", match.venue),
+        )
+        clashes = schedule_service.find_clashes(db, [fixture], exclude_ids=[match.id])
+        if clashes:
+            raise clash_conflict(clashes)
+
+    # Swap the match's old result for the new one in the same transaction
+    standings_service.retract_result(db, match)
+    for field, value in changes.items():
         setattr(match, field, value)
+    standings_service.record_result(db, match)
 
     db.commit()
     db.refresh(match)
+    invalidate_match_caches()
+    match_service.publish_score(match)
     return match
 
 
@@ -78,13 +315,20 @@ def delete_match(match_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail="Match not found"
         )
 
+    standings_service.retract_result(db, match)
     db.delete(match)
     db.commit()
+    invalidate_match_caches()
     return None
 
 
 @router.get("/team/{team_id}", response_model=List[MatchResponse])
-def get_team_matches(team_id: int, db: Session = Depends(get_db)):
+def get_team_matches(
+    team_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    expand: Optional[List[str]] = Depends(select_expand),
+    db: Session = Depends(get_db),
+):
     # Check if team exists
     team = db.query(Team).filter(Team.id == team_id).first()
     if not team:
@@ -93,8 +337,8 @@ def get_team_matches(team_id: int, db: Session = Depends(get_db)):
         )
 
     matches = (
-        db.query(Match)
+        load_match_fields(db, fields, expand)
         .filter((Match.team_a_id == team_id) | (Match.team_b_id == team_id))
         .all()
     )
-    return matches
+    return match_list_response(db, matches, fields, expand)
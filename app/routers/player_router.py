@@ -1,14 +1,18 @@
 ﻿# app/routers/player_router.py
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.batch import batch_response, id_list
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.responses import item_response, list_response
 from app.database.models import Player, Team
 from app.database.session import get_db
-from app.schemas.player import PlayerCreate, PlayerResponse, PlayerUpdate
+from app.schemas.player import PLAYER_FIELDS, PlayerCreate, PlayerResponse, PlayerUpdate
 
 router = APIRouter(prefix="/players", tags=["players"])
+select_fields = sparse_fields(PLAYER_FIELDS)
 
 
 @router.post("/", response_model=PlayerResponse, status_code=status.HTTP_201_CREATED)
@@ -28,23 +32,44 @@ def create_player(player: PlayerCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[PlayerResponse])
-def get_players(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    players = db.query(Player).offset(skip).limit(limit).all()
-    return players
+def get_players(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(id_list),
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    query = load_fields(db.query(Player), Player, fields)
+    if ids is not None:
+        return batch_response(PlayerResponse, query, Player, ids, fields)
+    players = query.offset(skip).limit(limit).all()
+    return list_response(PlayerResponse, players, fields)
 
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-def get_player(player_id: int, db: Session = Depends(get_db)):
-    player = db.query(Player).filter(Player.id == player_id).first()
+def get_player(
+    player_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    player = (
+        load_fields(db.query(Player), Player, fields)
+        .filter(Player.id == player_id)
+        .first()
+    )
     if not player:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Player not found"
         )
-    return player
+    return item_response(PlayerResponse, player, fields)
 
 
 @router.get("/team/{team_id}", response_model=List[PlayerResponse])
-def get_players_by_team(team_id: int, db: Session = Depends(get_db)):
+def get_players_by_team(
+    team_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
     # Check if team exists
     team = db.query(Team).filter(Team.id == team_id).first()
     if not team:
@@ -52,8 +77,12 @@ def get_players_by_team(team_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
         )
 
-    players = db.query(Player).filter(Player.team_id == team_id).all()
-    return players
+    players = (
+        load_fields(db.query(Player), Player, fields)
+        .filter(Player.team_id == team_id)
+        .all()
+    )
+    return list_response(PlayerResponse, players, fields)
 
 
 @router.put("/{player_id}", response_model=PlayerResponse)
@@ -1,14 +1,28 @@
 ﻿# app/routers/referee_router.py
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.batch import batch_response, id_list
+from app.core.cache import invalidate
+from app.core.exceptions import InvalidDataException, RefereeNotFoundException
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.responses import item_response, list_response
 from app.database.models import Referee
 from app.database.session import get_db
-from app.schemas.referee import RefereeCreate, RefereeResponse, RefereeUpdate
+from app.schemas.referee import (
+    REFEREE_FIELDS,
+    RefereeAssignmentRequest,
+    RefereeAssignmentResponse,
+    RefereeCreate,
+    RefereeResponse,
+    RefereeUpdate,
+)
+from app.services import referee_service
 
 router = APIRouter(prefix="/referees", tags=["referees"])
+select_fields = sparse_fields(REFEREE_FIELDS)
 
 
 @router.post("/", response_model=RefereeResponse, status_code=status.HTTP_201_CREATED)
@@ -17,31 +31,65 @@ def create_referee(referee: RefereeCreate, db: Session = Depends(get_db)):
     db.add(db_referee)
     db.commit()
     db.refresh(db_referee)
+    invalidate("referees")
     return db_referee
 
 
+# Staffs every unassigned upcoming fixture in one call; see
+# referee_service.assign_referees for the constraints
+@router.post("/assignments", response_model=RefereeAssignmentResponse)
+def assign_referees(request: RefereeAssignmentRequest, db: Session = Depends(get_db)):
+    try:
+        return referee_service.assign_referees(db, request)
+    except InvalidDataException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
 @router.get("/", response_model=List[RefereeResponse])
-def get_referees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    referees = db.query(Referee).offset(skip).limit(limit).all()
-    return referees
+def get_referees(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(id_list),
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        query = load_fields(db.query(Referee), Referee, fields)
+        return batch_response(RefereeResponse, query, Referee, ids, fields)
+    referees = referee_service.list_referees(db, skip, limit)
+    return list_response(RefereeResponse, referees, fields)
 
 
 @router.get("/{referee_id}", response_model=RefereeResponse)
-def get_referee(referee_id: int, db: Session = Depends(get_db)):
-    referee = db.query(Referee).filter(Referee.id == referee_id).first()
+def get_referee(
+    referee_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    referee = (
+        load_fields(db.query(Referee), Referee, fields)
+        .filter(Referee.id == referee_id)
+        .first()
+    )
     if not referee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Referee not found"
         )
-    return referee
+    return item_response(RefereeResponse, referee, fields)
 
 
 @router.get("/experience/{min_experience}", response_model=List[RefereeResponse])
-def get_referees_by_experience(min_experience: int, db: Session = Depends(get_db)):
+def get_referees_by_experience(
+    min_experience: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
     referees = (
-        db.query(Referee).filter(Referee.experience_years >= min_experience).all()
+        load_fields(db.query(Referee), Referee, fields)
+        .filter(Referee.experience_years >= min_experience)
+        .all()
     )
-    return referees
+    return list_response(RefereeResponse, referees, fields)
 
 
 @router.put("/{referee_id}", response_model=RefereeResponse)
@@ -59,17 +107,16 @@ def update_referee(
 
     db.commit()
     db.refresh(referee)
+    invalidate("referees")
     return referee
 
 
 @router.delete("/{referee_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_referee(referee_id: int, db: Session = Depends(get_db)):
-    referee = db.query(Referee).filter(Referee.id == referee_id).first()
-    if not referee:
+    try:
+        referee_service.delete_referee(db, referee_id)
+    except RefereeNotFoundException:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Referee not found"
         )
-
-    db.delete(referee)
-    db.commit()
     return None
@@ -0,0 +1,28 @@
+﻿# app/routers/standings_router.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database.session import get_db
+from app.schemas.standings import StandingsResponse, TeamSeasonStatsResponse
+from app.services import standings_service
+
+router = APIRouter(prefix="/standings", tags=["standings"])
+
+
+@router.get("/", response_model=StandingsResponse)
+def get_standings(season: Optional[int] = None, db: Session = Depends(get_db)):
+    season = season or standings_service.current_season()
+    return {
+        "season": season,
+        "table": standings_service.get_standings_table(db, season),
+    }
+
+
+@router.get("/team/{team_id}", response_model=TeamSeasonStatsResponse)
+def get_team_standing(
+    team_id: int, season: Optional[int] = None, db: Session = Depends(get_db)
+):
+    season = season or standings_service.current_season()
+    return standings_service.get_team_stats(db, team_id, season)
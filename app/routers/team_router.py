@@ -1,13 +1,27 @@
-﻿from typing import List
+﻿from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.core.batch import batch_response, id_list
+from app.core.cache import invalidate
+from app.core.exceptions import TeamNotFoundException
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.responses import item_response, list_response
 from app.database.models import Team
 from app.database.session import get_db
-from app.schemas.team import TeamCreate, TeamResponse, TeamUpdate
+from app.schemas.team import (
+    TEAM_FIELDS,
+    TeamCreate,
+    TeamDashboardResponse,
+    TeamNestedResponse,
+    TeamResponse,
+    TeamUpdate,
+)
+from app.services import team_service
 
 router = APIRouter(prefix="/teams", tags=["teams"])
+select_fields = sparse_fields(TEAM_FIELDS)
 
 
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
@@ -24,23 +38,58 @@ def create_team(team: TeamCreate, db: Session = Depends(get_db)):
     db.add(db_team)
     db.commit()
     db.refresh(db_team)
+    invalidate("teams")
     return db_team
 
 
 @router.get("/", response_model=List[TeamResponse])
-def get_teams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    teams = db.query(Team).offset(skip).limit(limit).all()
-    return teams
+def get_teams(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(id_list),
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        query = load_fields(db.query(Team), Team, fields)
+        return batch_response(TeamResponse, query, Team, ids, fields)
+    return list_response(TeamResponse, team_service.list_teams(db, skip, limit), fields)
+
+
+@router.get("/nested", response_model=List[TeamNestedResponse])
+def get_teams_nested(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    teams = team_service.get_teams_nested(db, skip, limit)
+    return list_response(TeamNestedResponse, teams)
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
-def get_team(team_id: int, db: Session = Depends(get_db)):
-    team = db.query(Team).filter(Team.id == team_id).first()
+def get_team(
+    team_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    team = load_fields(db.query(Team), Team, fields).filter(Team.id == team_id).first()
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
         )
-    return team
+    return item_response(TeamResponse, team, fields)
+
+
+@router.get("/{team_id}/dashboard", response_model=TeamDashboardResponse)
+def get_team_dashboard(
+    team_id: int,
+    recent: int = Query(5, ge=0, le=50),
+    upcoming: int = Query(5, ge=0, le=50),
+    season: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        return team_service.get_team_dashboard(db, team_id, recent, upcoming, season)
+    except TeamNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
+        )
 
 
 @router.put("/{team_id}", response_model=TeamResponse)
@@ -56,6 +105,7 @@ def update_team(team_id: int, team_update: TeamUpdate, db: Session = Depends(get
 
     db.commit()
     db.refresh(team)
+    invalidate("teams")
     return team
 
 
@@ -69,4 +119,5 @@ def delete_team(team_id: int, db: Session = Depends(get_db)):
 
     db.delete(team)
     db.commit()
+    invalidate("teams")
     return None
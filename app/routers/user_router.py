@@ -1,19 +1,26 @@
 ﻿# app/routers/user_router.py
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import get_current_user, get_password_hash
+from app.core.api_keys import forget_api_keys, revoke_user_api_keys
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.passwords import hash_password_async
+from app.core.responses import item_response, list_response
+from app.core.revocation import get_revocations, record_revocation
+from app.core.security import get_current_user
 from app.database.models import User
-from app.database.session import get_db
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.database.session import get_db, release_connection
+from app.schemas.user import USER_FIELDS, UserCreate, UserResponse, UserUpdate
+from app.services import token_service
 
 router = APIRouter(prefix="/users", tags=["users"])
+select_fields = sparse_fields(USER_FIELDS)
 
 
-@router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+def check_unique_user(db: Session, user: UserCreate) -> None:
     # Check if username already exists
     existing_user = db.query(User).filter(User.username == user.username).first()
     if existing_user:
@@ -28,24 +35,42 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
+    # Release the connection while the password is hashed
+    release_connection(db)
+
+
+def save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+# Database work runs on the threadpool and bcrypt on the hashing pool, so no
+# thread is held while a password is hashed
+@router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+    await run_in_threadpool(check_unique_user, db, user)
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password_async(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
         full_name=user.full_name,
         hashed_password=hashed_password,
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(save_user, db, db_user)
 
 
 @router.get("/", response_model=List[UserResponse])
-def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+def get_users(
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    users = load_fields(db.query(User), User, fields).offset(skip).limit(limit).all()
+    return list_response(UserResponse, users, fields)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -54,31 +79,45 @@ def read_users_me(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+def get_user(
+    user_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    user = load_fields(db.query(User), User, fields).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    return user
+    return item_response(UserResponse, user, fields)
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user(
+    user_id: int, user_update: UserUpdate, db: Session = Depends(get_db)
+):
+    user = await run_in_threadpool(db.query(User).filter(User.id == user_id).first)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    password_changed = False
     for field, value in user_update.dict(exclude_unset=True).items():
         if field == "password" and value:
-            setattr(user, "hashed_password", get_password_hash(value))
+            setattr(user, "hashed_password", await hash_password_async(value))
+            password_changed = True
         else:
             setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    if not password_changed:
+        return await run_in_threadpool(save_user, db, user)
+
+    # Tokens issued before the change stop working
+    user.token_version += 1
+    record_revocation(db, user.id, user.token_version)
+    user = await run_in_threadpool(save_user, db, user)
+    await run_in_threadpool(get_revocations().refresh, db)
     return user
 
 
@@ -91,5 +130,10 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
         )
 
     db.delete(user)
+    record_revocation(db, user_id, None)
+    token_service.delete_user_tokens(db, user_id)
+    key_hashes = revoke_user_api_keys(db, user_id)
     db.commit()
+    forget_api_keys(key_hashes)
+    get_revocations().refresh(db)
     return None
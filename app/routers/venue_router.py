@@ -1,14 +1,20 @@
 ﻿# app/routers/venue_router.py
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.batch import batch_response, id_list
+from app.core.cache import invalidate
+from app.core.fieldsets import load_fields, sparse_fields
+from app.core.responses import item_response, list_response
 from app.database.models import Venue
 from app.database.session import get_db
-from app.schemas.venue import VenueCreate, VenueResponse, VenueUpdate
+from app.schemas.venue import VENUE_FIELDS, VenueCreate, VenueResponse, VenueUpdate
+from app.services import venue_service
 
 router = APIRouter(prefix="/venues", tags=["venues"])
+select_fields = sparse_fields(VENUE_FIELDS)
 
 
 @router.post("/", response_model=VenueResponse, status_code=status.HTTP_201_CREATED)
@@ -25,29 +31,54 @@ def create_venue(venue: VenueCreate, db: Session = Depends(get_db)):
     db.add(db_venue)
     db.commit()
     db.refresh(db_venue)
+    invalidate("venues")
     return db_venue
 
 
 @router.get("/", response_model=List[VenueResponse])
-def get_venues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    venues = db.query(Venue).offset(skip).limit(limit).all()
-    return venues
+def get_venues(
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(id_list),
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        query = load_fields(db.query(Venue), Venue, fields)
+        return batch_response(VenueResponse, query, Venue, ids, fields)
+    return list_response(
+        VenueResponse, venue_service.list_venues(db, skip, limit), fields
+    )
 
 
 @router.get("/{venue_id}", response_model=VenueResponse)
-def get_venue(venue_id: int, db: Session = Depends(get_db)):
-    venue = db.query(Venue).filter(Venue.id == venue_id).first()
+def get_venue(
+    venue_id: int,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    venue = (
+        load_fields(db.query(Venue), Venue, fields).filter(Venue.id == venue_id).first()
+    )
     if not venue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Venue not found"
         )
-    return venue
+    return item_response(VenueResponse, venue, fields)
 
 
 @router.get("/city/{city_name}", response_model=List[VenueResponse])
-def get_venues_by_city(city_name: str, db: Session = Depends(get_db)):
-    venues = db.query(Venue).filter(Venue.city.ilike(f"%{city_name}%")).all()
-    return venues
+def get_venues_by_city(
+    city_name: str,
+    fields: Optional[List[str]] = Depends(select_fields),
+    db: Session = Depends(get_db),
+):
+    venues = (
+        load_fields(db.query(Venue), Venue, fields)
+        .filter(Venue.city.ilike(f"%{city_name}%"))
+        .all()
+    )
+    return list_response(VenueResponse, venues, fields)
 
 
 @router.put("/{venue_id}", response_model=VenueResponse)
@@ -65,6 +96,8 @@ def update_venue(
 
     db.commit()
     db.refresh(venue)
+    invalidate("venues")
+    invalidate("venue_statistics")
     return venue
 
 
@@ -78,4 +111,6 @@ def delete_venue(venue_id: int, db: Session = Depends(get_db)):
 
     db.delete(venue)
     db.commit()
+    invalidate("venues")
+    invalidate("venue_statistics")
     return None
@@ -0,0 +1,27 @@
+﻿# app/schemas/batch.py
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SubRequest(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., pattern=r"^/", examples=["/api/v1/teams/1?fields=id,name"])
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[SubRequest] = Field(..., min_length=1)
+    # Run consecutive GET sub-requests concurrently, each on its own session
+    parallel: bool = False
+
+
+class SubResponse(BaseModel):
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[SubResponse]
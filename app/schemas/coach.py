@@ -31,3 +31,16 @@ class CoachResponse(CoachBase):
 
     class Config:
         from_attributes = True
+
+
+# Fields clients may select with ?fields=; each maps to a table column
+COACH_FIELDS = (
+    "id",
+    "team_id",
+    "name",
+    "experience_years",
+    "specialization",
+    "nationality",
+    "created_at",
+    "updated_at",
+)
@@ -0,0 +1,20 @@
+﻿# app/schemas/manager.py
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ManagerBase(BaseModel):
+    team_id: int
+    name: str = Field(..., max_length=100)
+    strategy: Optional[str] = Field(None, max_length=100)
+
+
+class ManagerResponse(ManagerBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,14 +1,28 @@
 ﻿# app/schemas/match.py
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field, field_validator
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Convert offset-aware datetimes to naive UTC, the form stored in the tables.
+
+    Naive values are kept as they are; comparing them with aware ones (e.g.
+    a "Z"-suffixed kick-off against ``datetime.utcnow()``) would raise.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+NaiveDatetime = Annotated[datetime, AfterValidator(naive_utc)]
 
 
 class MatchBase(BaseModel):
     team_a_id: int
     team_b_id: int
-    match_date: datetime
+    match_date: NaiveDatetime
     venue: str = Field(..., max_length=150)
     score_team_a: Optional[int] = Field(0, ge=0)
     score_team_b: Optional[int] = Field(0, ge=0)
@@ -19,6 +33,7 @@ class MatchCreate(MatchBase):
 
 
 class MatchUpdate(BaseModel):
+    match_date: Optional[NaiveDatetime] = None
     score_team_a: Optional[int] = Field(None, ge=0)
     score_team_b: Optional[int] = Field(None, ge=0)
     venue: Optional[str] = Field(None, max_length=150)
@@ -26,8 +41,98 @@ class MatchUpdate(BaseModel):
 
 class MatchResponse(MatchBase):
     id: int
+    referee_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class FixtureGenerate(BaseModel):
+    # None schedules every team in the league
+    team_ids: Optional[List[int]] = Field(None, min_length=2)
+    start_date: NaiveDatetime
+    days_between_rounds: int = Field(7, ge=1)
+    double_round_robin: bool = True
+
+    @field_validator("team_ids")
+    @classmethod
+    def unique_teams(cls, team_ids):
+        if team_ids is not None and len(set(team_ids)) != len(team_ids):
+            raise ValueError("Team ids must be unique")
+        return team_ids
+
+
+class FixtureGenerateResponse(BaseModel):
+    teams: int
+    rounds: int
+    matches: int
+    first_match_date: datetime
+    last_match_date: datetime
+
+
+class ScheduleValidate(BaseModel):
+    matches: List[MatchCreate]
+
+
+class ScheduleClash(BaseModel):
+    kind: str
+    venue: Optional[str] = None
+    team_id: Optional[int] = None
+    # Position of the clashing fixture in the request, and of the fixture or
+    # existing match it clashes with
+    fixture: int
+    other_fixture: Optional[int] = None
+    match_id: Optional[int] = None
+
+
+class ScheduleValidateResponse(BaseModel):
+    valid: bool
+    clashes: List[ScheduleClash]
+
+
+# Fields clients may select with ?fields=; each maps to a table column
+MATCH_FIELDS = (
+    "id",
+    "team_a_id",
+    "team_b_id",
+    "match_date",
+    "venue",
+    "score_team_a",
+    "score_team_b",
+    "referee_id",
+    "created_at",
+    "updated_at",
+)
+
+
+class MatchTeamResponse(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class MatchNestedResponse(MatchResponse):
+    # Teams can be deleted while matches still point at them
+    team_a: Optional[MatchTeamResponse] = None
+    team_b: Optional[MatchTeamResponse] = None
+
+
+class MatchVenueResponse(BaseModel):
+    id: int
+    name: str
+    city: str
+    capacity: int
+
+    class Config:
+        from_attributes = True
+
+
+# Relations clients may embed with ?expand=, mapped to the fields they add
+MATCH_EXPANSIONS = {
+    "teams": (("team_a", MatchTeamResponse), ("team_b", MatchTeamResponse)),
+    "venue": (("venue_details", MatchVenueResponse),),
+}
@@ -29,3 +29,15 @@ class PlayerResponse(PlayerBase):
 
     class Config:
         from_attributes = True
+
+
+# Fields clients may select with ?fields=; each maps to a table column
+PLAYER_FIELDS = (
+    "id",
+    "team_id",
+    "name",
+    "position",
+    "age",
+    "created_at",
+    "updated_at",
+)
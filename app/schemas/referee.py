@@ -1,6 +1,6 @@
 ﻿# app/schemas/referee.py
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -30,3 +30,38 @@ class RefereeResponse(RefereeBase):
 
     class Config:
         from_attributes = True
+
+
+class RefereeAssignmentRequest(BaseModel):
+    # Unassigned matches kicking off in this range; past fixtures are skipped
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    min_experience_years: int = Field(0, ge=0)
+    min_qualification_level: Optional[str] = Field(None, max_length=50)
+    # None uses the REFEREE_MIN_REST_DAYS / REFEREE_MAX_MATCHES_PER_WEEK settings
+    min_rest_days: Optional[int] = Field(None, ge=0)
+    max_matches_per_week: Optional[int] = Field(None, ge=1)
+    dry_run: bool = False
+
+
+class RefereeAssignment(BaseModel):
+    match_id: int
+    referee_id: int
+
+
+class RefereeAssignmentResponse(BaseModel):
+    assigned: int
+    assignments: List[RefereeAssignment]
+    unassigned_match_ids: List[int]
+
+
+# Fields clients may select with ?fields=; each maps to a table column
+REFEREE_FIELDS = (
+    "id",
+    "name",
+    "experience_years",
+    "nationality",
+    "qualification_level",
+    "created_at",
+    "updated_at",
+)
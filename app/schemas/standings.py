@@ -0,0 +1,25 @@
+﻿# app/schemas/standings.py
+from typing import List
+
+from pydantic import BaseModel
+
+
+class TeamSeasonStatsResponse(BaseModel):
+    team_id: int
+    season: int
+    played: int
+    won: int
+    drawn: int
+    lost: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+
+    class Config:
+        from_attributes = True
+
+
+class StandingsResponse(BaseModel):
+    season: int
+    table: List[TeamSeasonStatsResponse]
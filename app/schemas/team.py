@@ -1,9 +1,14 @@
 ﻿# app/schemas/team.py
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.schemas.coach import CoachResponse
+from app.schemas.manager import ManagerResponse
+from app.schemas.match import MatchResponse
+from app.schemas.player import PlayerResponse
+
 
 class TeamBase(BaseModel):
     name: str = Field(..., max_length=100)
@@ -29,3 +34,41 @@ class TeamResponse(TeamBase):
 
     class Config:
         from_attributes = True
+
+
+# Fields clients may select with ?fields=; each maps to a table column
+TEAM_FIELDS = (
+    "id",
+    "name",
+    "coach_name",
+    "founded_year",
+    "home_ground",
+    "created_at",
+    "updated_at",
+)
+
+
+class TeamNestedResponse(TeamResponse):
+    players: List[PlayerResponse] = []
+    coaches: List[CoachResponse] = []
+    managers: List[ManagerResponse] = []
+
+
+class TeamSummary(BaseModel):
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    goal_difference: int = 0
+    points: int = 0
+
+
+class TeamDashboardResponse(BaseModel):
+    team: TeamResponse
+    squad: List[PlayerResponse]
+    staff: List[CoachResponse]
+    recent_matches: List[MatchResponse]
+    upcoming_matches: List[MatchResponse]
+    summary: TeamSummary
@@ -31,9 +31,45 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+# Fields clients may select with ?fields=; each maps to a table column
+USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "full_name",
+    "created_at",
+    "updated_at",
+)
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class ApiKeyCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+
+
+class ApiKeyResponse(BaseModel):
+    id: int
+    name: str
+    prefix: str
+    created_at: datetime
+    revoked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ApiKeyCreated(ApiKeyResponse):
+    # The plain key; it is shown once and cannot be recovered later
+    key: str
 
 
 class TokenData(BaseModel):
@@ -32,3 +32,16 @@ class VenueResponse(VenueBase):
 
     class Config:
         from_attributes = True
+
+
+# Fields clients may select with ?fields=; each maps to a table column
+VENUE_FIELDS = (
+    "id",
+    "name",
+    "city",
+    "country",
+    "capacity",
+    "built_year",
+    "created_at",
+    "updated_at",
+)
@@ -8,25 +8,24 @@ authorization logic.
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.exceptions import UserNotFoundException
+from app.core.passwords import check_and_rehash, check_password, hash_password
+from app.core.tokens import decode_token, encode_token
 from app.database.models import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
@@ -34,8 +33,13 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     user = db.query(User).filter(User.username == username).first()
     if not user:
         return None
-    if not verify_password(password, str(user.hashed_password)):
+    verified, new_hash = check_and_rehash(password, str(user.hashed_password))
+    if not verified:
         return None
+    if new_hash:
+        # Upgrade hashes made under an older scheme or cost
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 
@@ -50,18 +54,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         )
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return encode_token(to_encode)
 
 
 def verify_token(token: str) -> Optional[str]:
     """Verify a JWT token and return the username."""
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         username = payload.get("sub")
         if username is None:
             return None
@@ -0,0 +1,217 @@
+﻿"""
+Match service for Football League Manager.
+
+Contains business logic for match management, including
+fixture queries, season fixture generation and match-related business rules.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from app.core.cache import cached
+from app.core.events import get_broker
+from app.core.exceptions import ScheduleClashException, TeamNotFoundException
+from app.core.expand import Expanded
+from app.core.rooms import encode_message, get_rooms
+from app.database.models import Match, Team, Venue
+from app.schemas.match import MatchResponse, naive_utc
+from app.services.schedule_service import PLACEHOLDER_VENUE, Fixture, find_clashes
+
+# Live score stream topics: one per match plus one for the whole league
+LEAGUE_TOPIC = "league"
+
+
+def match_topic(match_id: int) -> str:
+    return f"match:{match_id}"
+
+
+# Match columns each ?expand= relation needs to resolve its rows
+EXPAND_COLUMNS = {
+    "teams": ("team_a_id", "team_b_id"),
+    "venue": ("venue",),
+}
+
+
+def get_matches_nested(db: Session, skip: int = 0, limit: int = 100) -> List[Match]:
+    """Get matches with both teams eagerly loaded."""
+    return (
+        db.query(Match)
+        .options(selectinload(Match.team_a), selectinload(Match.team_b))
+        .order_by(Match.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+@cached("upcoming_fixtures")
+def get_upcoming_matches(db: Session, limit: int = 20) -> List[dict]:
+    """Get the next fixtures by kick-off time, cached for hot reads."""
+    matches = (
+        db.query(Match)
+        .filter(Match.match_date > datetime.utcnow())
+        .order_by(Match.match_date)
+        .limit(limit)
+        .all()
+    )
+    return [MatchResponse.model_validate(match).model_dump() for match in matches]
+
+
+def expand_columns(
+    fields: Optional[List[str]], expand: Optional[List[str]]
+) -> Optional[List[str]]:
+    """Widen a sparse fieldset with the columns the expansions read."""
+    if not fields or not expand:
+        return fields
+    needed = [column for relation in expand for column in EXPAND_COLUMNS[relation]]
+    return list(dict.fromkeys([*fields, *needed]))
+
+
+def expand_matches(
+    db: Session, matches: Sequence[Any], expand: Sequence[str]
+) -> List[Expanded]:
+    """Embed related rows into matches (ORM rows or cached dicts).
+
+    Each relation type is resolved with a single ``IN`` query for the whole
+    list; unknown venues (the column is free text) embed as ``None``.
+    """
+    items = [Expanded(match) for match in matches]
+    if not items:
+        return items
+
+    if "teams" in expand:
+        team_ids = {item.team_a_id for item in items} | {
+            item.team_b_id for item in items
+        }
+        teams = {
+            team.id: team
+            for team in db.query(Team)
+            .options(load_only(Team.id, Team.name))
+            .filter(Team.id.in_(team_ids))
+        }
+        for item in items:
+            item.team_a = teams.get(item.team_a_id)
+            item.team_b = teams.get(item.team_b_id)
+
+    if "venue" in expand:
+        names = {item.venue for item in items}
+        venues = {
+            venue.name: venue
+            for venue in db.query(Venue)
+            .options(load_only(Venue.id, Venue.name, Venue.city, Venue.capacity))
+            .filter(Venue.name.in_(names))
+        }
+        for item in items:
+            item.venue_details = venues.get(item.venue)
+
+    return items
+
+
+def publish_score(match: Match) -> int:
+    """Push a match's current score to its live streams and room."""
+    score = MatchResponse.model_validate(match).model_dump(mode="json")
+    get_rooms().broadcast(match.id, encode_message("score", score), "score")
+    return get_broker().publish(
+        (match_topic(match.id), LEAGUE_TOPIC), "score", json.dumps(score)
+    )
+
+
+def round_robin(
+    team_ids: Sequence[int], double: bool = False
+) -> List[List[Tuple[int, int]]]:
+    """Pair teams into rounds of (home, away) matches with the circle method.
+
+    The first team stays in place while the others rotate one seat per
+    round. Home and away alternate so every team's home and away counts
+    differ by at most one, with the fewest possible repeated venues in a
+    row. With an odd number of teams one team sits out each round. A
+    double round-robin repeats the rounds with home and away swapped.
+    """
+    seats: List[Optional[int]] = list(team_ids)
+    if len(seats) % 2:
+        seats.insert(0, None)  # the bye, fixed in the first seat
+    n = len(seats)
+    rounds = []
+    for number in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = seats[i], seats[n - 1 - i]
+            # The fixed seat alternates by round, the others by table row
+            if (i % 2 == 1) if i else (number % 2 == 1):
+                home, away = away, home
+            if home is not None and away is not None:
+                pairs.append((home, away))
+        rounds.append(pairs)
+        seats = [seats[0], seats[-1], *seats[1:-1]]
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def generate_fixtures(
+    db: Session,
+    team_ids: Optional[Sequence[int]],
+    start_date: datetime,
+    days_between_rounds: int = 7,
+    double: bool = True,
+) -> Dict[str, Any]:
+    """Schedule a full round-robin season and insert it in one transaction.
+
+    ``team_ids`` defaults to every team. Round ``k`` kicks off at
+    ``start_date + k * days_between_rounds`` at the home team's ground. The
+    season is checked for clashes, with itself and with matches already
+    booked, before all rows go in as a single multi-row ``INSERT`` and one
+    commit.
+    """
+    query = db.query(Team.id, Team.home_ground)
+    if team_ids is not None:
+        query = query.filter(Team.id.in_(team_ids))
+    grounds = dict(query.all())
+    if team_ids is None:
+        team_ids = sorted(grounds)
+    elif len(grounds) != len(team_ids):
+        missing = sorted(set(team_ids) - set(grounds))
+        raise TeamNotFoundException(f"Teams not found: {missing}")
+    if len(team_ids) < 2:
+        raise ValueError("A round-robin needs at least two teams")
+
+    rounds = round_robin(team_ids, double)
+    start_date = naive_utc(start_date)
+    fixtures = [
+        Fixture(
+            home,
+            away,
+            start_date + timedelta(days=number * days_between_rounds),
+            grounds[home] or PLACEHOLDER_VENUE,
+        )
+        for number, pairs in enumerate(rounds)
+        for home, away in pairs
+    ]
+    clashes = find_clashes(db, fixtures)
+    if clashes:
+        raise ScheduleClashException(clashes)
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            **fixture._asdict(),
+            "score_team_a": 0,
+            "score_team_b": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for fixture in fixtures
+    ]
+    db.execute(insert(Match), rows)
+    db.commit()
+    return {
+        "teams": len(team_ids),
+        "rounds": len(rounds),
+        "matches": len(rows),
+        "first_match_date": rows[0]["match_date"],
+        "last_match_date": rows[-1]["match_date"],
+    }
@@ -3,15 +3,40 @@ Referee service for Football League Manager.
 
 Contains business logic for referee management, including
 CRUD operations and referee scheduling.
+
+``assign_referees`` fills unassigned fixtures one match day at a time. A
+referee officiates at most one match per day, so each day is a bipartite
+matching between its fixtures and the referees still free for it (rest
+days, weekly cap, no nationality conflict). It is solved as a min-cost flow
+that staffs as many fixtures as possible and, among those, prefers the
+referees with the fewest matches so far.
 """
 
-from typing import List, Optional
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from app.core.exceptions import DuplicateResourceException, RefereeNotFoundException
-from app.database.models import Match, Referee
-from app.schemas.referee import RefereeCreate, RefereeUpdate
+from app.core.cache import cached, invalidate
+from app.core.config import settings
+from app.core.exceptions import (
+    DuplicateResourceException,
+    InvalidDataException,
+    RefereeNotFoundException,
+)
+from app.core.matching import min_cost_matching
+from app.database.models import Match, Referee, Team, Venue
+from app.schemas.match import naive_utc
+from app.schemas.referee import (
+    RefereeAssignmentRequest,
+    RefereeCreate,
+    RefereeResponse,
+    RefereeUpdate,
+)
 
 
 def get_referee(db: Session, referee_id: int) -> Referee:
@@ -32,6 +57,15 @@ def get_referees(db: Session, skip: int = 0, limit: int = 100) -> List[Referee]:
     return db.query(Referee).offset(skip).limit(limit).all()
 
 
+@cached("referees")
+def list_referees(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
+    """Get a page of referees as response dicts, served from the cache when warm."""
+    return [
+        RefereeResponse.model_validate(referee).model_dump()
+        for referee in get_referees(db, skip, limit)
+    ]
+
+
 def create_referee(db: Session, referee: RefereeCreate) -> Referee:
     """Create a new referee."""
     # Check if referee with same name already exists
@@ -45,6 +79,7 @@ def create_referee(db: Session, referee: RefereeCreate) -> Referee:
     db.add(db_referee)
     db.commit()
     db.refresh(db_referee)
+    invalidate("referees")
     return db_referee
 
 
@@ -61,14 +96,29 @@ def update_referee(
 
     db.commit()
     db.refresh(db_referee)
+    invalidate("referees")
     return db_referee
 
 
 def delete_referee(db: Session, referee_id: int) -> bool:
-    """Delete a referee."""
+    """Delete a referee and release their fixtures.
+
+    The fixtures go back into the pool for the next assignment run. Bumping
+    their ``updated_at`` does not touch the standings, which only count
+    matches flagged ``result_recorded``.
+    """
     db_referee = get_referee(db, referee_id)
     db.delete(db_referee)
+    released = (
+        db.query(Match)
+        .filter(Match.referee_id == referee_id)
+        .update({Match.referee_id: None}, synchronize_session=False)
+    )
     db.commit()
+    invalidate("referees")
+    if released:
+        # Cached fixtures carry referee_id
+        invalidate("upcoming_fixtures")
     return True
 
 
@@ -92,3 +142,153 @@ def get_referee_statistics(db: Session, referee_id: int) -> dict:
         "red_cards_issued": 0,  # Placeholder
         "penalties_awarded": 0,  # Placeholder
     }
+
+
+def qualification_rank(level: Optional[str]) -> int:
+    """Position of a level in REFEREE_QUALIFICATION_LEVELS, -1 if unknown."""
+    levels = [known.lower() for known in settings.REFEREE_QUALIFICATION_LEVELS]
+    normalized = (level or "").strip().lower()
+    return levels.index(normalized) if normalized in levels else -1
+
+
+def _team_countries(db: Session, team_ids) -> Dict[int, str]:
+    """A team's country is the country of the venue named as its home ground."""
+    rows = (
+        db.query(Team.id, Venue.country)
+        .join(Venue, Venue.name == Team.home_ground)
+        .filter(Team.id.in_(team_ids))
+    )
+    return {team_id: country.strip().lower() for team_id, country in rows}
+
+
+def _assignment_limits(request: RefereeAssignmentRequest) -> Tuple[int, int, int]:
+    """Minimum qualification rank, rest days and weekly cap for a request."""
+    min_rank = -1
+    if request.min_qualification_level:
+        min_rank = qualification_rank(request.min_qualification_level)
+        if min_rank < 0:
+            raise InvalidDataException(
+                f"Unknown qualification level '{request.min_qualification_level}'"
+            )
+    rest_days = (
+        settings.REFEREE_MIN_REST_DAYS
+        if request.min_rest_days is None
+        else request.min_rest_days
+    )
+    weekly_cap = request.max_matches_per_week or settings.REFEREE_MAX_MATCHES_PER_WEEK
+    return min_rank, rest_days, weekly_cap
+
+
+def _day_edges(fixtures, free, load: Counter, countries: Dict[int, str]) -> dict:
+    """Referees each fixture of a day may take, costed by their load so far."""
+    return {
+        match.id: [
+            (referee_id, load[referee_id])
+            for referee_id, nationality in free
+            if not nationality
+            or nationality
+            not in (countries.get(match.team_a_id), countries.get(match.team_b_id))
+        ]
+        for match in fixtures
+    }
+
+
+def assign_referees(db: Session, request: RefereeAssignmentRequest) -> dict:
+    """Assign referees to unassigned matches, optimally per match day.
+
+    Referees must meet the experience and qualification thresholds, must
+    not share a nationality with either team's country, must have
+    ``min_rest_days`` full days off around every match (existing
+    assignments included) and may take at most ``max_matches_per_week``
+    matches per ISO week. Assignments are written in one transaction
+    unless ``dry_run`` is set.
+    """
+    min_rank, rest_days, weekly_cap = _assignment_limits(request)
+
+    # Only fixtures still to be played
+    now = datetime.utcnow()
+    date_from = naive_utc(request.date_from) if request.date_from else now
+    query = db.query(Match.id, Match.team_a_id, Match.team_b_id, Match.match_date)
+    query = query.filter(
+        Match.referee_id.is_(None), Match.match_date > max(date_from, now)
+    )
+    if request.date_to is not None:
+        query = query.filter(Match.match_date <= naive_utc(request.date_to))
+    matches = query.order_by(Match.match_date, Match.id).all()
+
+    referees = [
+        (referee_id, (nationality or "").strip().lower())
+        for referee_id, nationality, level in db.query(
+            Referee.id, Referee.nationality, Referee.qualification_level
+        )
+        .filter(Referee.experience_years >= request.min_experience_years)
+        .order_by(Referee.id)
+        if qualification_rank(level) >= min_rank
+    ]
+    if not matches or not referees:
+        return {
+            "assigned": 0,
+            "assignments": [],
+            "unassigned_match_ids": [match.id for match in matches],
+        }
+
+    countries = _team_countries(db, {team for match in matches for team in match[1:3]})
+
+    # Days each referee is already booked, plus per-week and total counts
+    margin = timedelta(days=rest_days + 7)
+    booked_days: Dict[int, List[int]] = defaultdict(list)
+    weekly: Counter = Counter()
+    load: Counter = Counter()
+    for referee_id, match_date in db.query(Match.referee_id, Match.match_date).filter(
+        Match.referee_id.isnot(None),
+        Match.match_date > matches[0].match_date - margin,
+        Match.match_date < matches[-1].match_date + margin,
+    ):
+        day = match_date.date()
+        insort(booked_days[referee_id], day.toordinal())
+        weekly[referee_id, day.isocalendar()[:2]] += 1
+        load[referee_id] += 1
+
+    def is_free(referee_id: int, day: int, week) -> bool:
+        if weekly[referee_id, week] >= weekly_cap:
+            return False
+        days = booked_days[referee_id]
+        nearest = bisect_left(days, day - rest_days)
+        return nearest == len(days) or days[nearest] > day + rest_days
+
+    assignments = {}
+    for day, fixtures in groupby(matches, key=lambda match: match.match_date.date()):
+        ordinal, week = day.toordinal(), day.isocalendar()[:2]
+        free = [
+            (referee_id, nationality)
+            for referee_id, nationality in referees
+            if is_free(referee_id, ordinal, week)
+        ]
+        edges = _day_edges(fixtures, free, load, countries)
+        for match_id, referee_id in min_cost_matching(edges).items():
+            assignments[match_id] = referee_id
+            insort(booked_days[referee_id], ordinal)
+            weekly[referee_id, week] += 1
+            load[referee_id] += 1
+
+    if assignments and not request.dry_run:
+        db.execute(
+            update(Match),
+            [
+                {"id": match_id, "referee_id": referee_id}
+                for match_id, referee_id in assignments.items()
+            ],
+        )
+        db.commit()
+        invalidate("upcoming_fixtures")
+
+    return {
+        "assigned": len(assignments),
+        "assignments": [
+            {"match_id": match_id, "referee_id": referee_id}
+            for match_id, referee_id in assignments.items()
+        ],
+        "unassigned_match_ids": [
+            match.id for match in matches if match.id not in assignments
+        ],
+    }
@@ -0,0 +1,175 @@
+﻿"""
+Schedule clash detection for Football League Manager.
+
+A venue cannot host two matches whose kick-offs are less than
+``VENUE_CLASH_WINDOW_MINUTES`` apart, and a team cannot play two matches
+less than ``TEAM_CLASH_WINDOW_MINUTES`` apart. Existing bookings near the
+fixtures being checked are read through the ``(venue, match_date)`` and
+``(team, match_date)`` indexes.
+
+Whole schedules are checked with a sweep instead of comparing every pair:
+bookings are grouped per venue and per team and sorted by kick-off, and
+each one is compared only with the bookings after it that still fall inside
+the window. n fixtures cost O(n log n) plus one step per clash found.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models import Match
+from app.schemas.match import naive_utc
+
+# Venue recorded for fixtures whose ground is not known yet; it never clashes
+PLACEHOLDER_VENUE = "TBD"
+
+CLASH_KINDS = ("venue", "team")
+
+
+class Fixture(NamedTuple):
+    team_a_id: int
+    team_b_id: int
+    match_date: datetime
+    venue: str
+
+
+class Clash(NamedTuple):
+    kind: str  # "venue" or "team"
+    venue: Optional[str]
+    team_id: Optional[int]
+    fixture: int  # position of the fixture in the checked schedule
+    other_fixture: Optional[int]  # another fixture in the same schedule...
+    match_id: Optional[int]  # ...or a match that is already booked
+
+
+# (kick-off, position in the schedule or None, booked match id or None)
+Booking = Tuple[datetime, Optional[int], Optional[int]]
+
+
+def _windows() -> Dict[str, timedelta]:
+    return {
+        "venue": timedelta(minutes=settings.VENUE_CLASH_WINDOW_MINUTES),
+        "team": timedelta(minutes=settings.TEAM_CLASH_WINDOW_MINUTES),
+    }
+
+
+def _subjects(fixture, kinds: Collection[str]):
+    """The (kind, venue or team) keys a fixture books."""
+    if "venue" in kinds and fixture.venue != PLACEHOLDER_VENUE:
+        yield "venue", fixture.venue
+    if "team" in kinds:
+        yield "team", fixture.team_a_id
+        yield "team", fixture.team_b_id
+
+
+def _booked_near(
+    db: Session,
+    fixtures: Sequence[Fixture],
+    keys: Collection[Tuple[str, object]],
+    windows: Dict[str, timedelta],
+    exclude_ids: Collection[int],
+) -> List[Match]:
+    """Load the existing matches that could clash with the fixtures."""
+    first = min(fixture.match_date for fixture in fixtures)
+    last = max(fixture.match_date for fixture in fixtures)
+    venues = {subject for kind, subject in keys if kind == "venue"}
+    teams = {subject for kind, subject in keys if kind == "team"}
+    # One branch per index, each bounded by its own window
+    branches = [(Match.venue, venues, windows["venue"])] if venues else []
+    if teams:
+        branches += [
+            (Match.team_a_id, teams, windows["team"]),
+            (Match.team_b_id, teams, windows["team"]),
+        ]
+    if not branches:
+        return []
+    query = db.query(
+        Match.id, Match.team_a_id, Match.team_b_id, Match.match_date, Match.venue
+    ).filter(
+        or_(
+            *(
+                and_(
+                    column.in_(values),
+                    Match.match_date > first - window,
+                    Match.match_date < last + window,
+                )
+                for column, values, window in branches
+            )
+        )
+    )
+    if exclude_ids:
+        query = query.filter(Match.id.notin_(exclude_ids))
+    return query.all()
+
+
+def _clash(kind, subject, position, other_position, match_id) -> Clash:
+    return Clash(
+        kind,
+        subject if kind == "venue" else None,
+        subject if kind == "team" else None,
+        position,
+        other_position,
+        match_id,
+    )
+
+
+def find_clashes(
+    db: Session,
+    fixtures: Sequence[Fixture],
+    exclude_ids: Collection[int] = (),
+    kinds: Collection[str] = CLASH_KINDS,
+) -> List[Clash]:
+    """Report every clash of the fixtures with each other or with bookings.
+
+    ``exclude_ids`` leaves matches out of the existing bookings, e.g. the
+    match being updated. Clashes between two existing matches are not
+    reported.
+    """
+    # Bookings are stored naive; sorting them with aware kick-offs would raise
+    fixtures = [
+        fixture._replace(match_date=naive_utc(fixture.match_date))
+        for fixture in fixtures
+    ]
+    bookings: Dict[Tuple[str, object], List[Booking]] = defaultdict(list)
+    for position, fixture in enumerate(fixtures):
+        for key in _subjects(fixture, kinds):
+            bookings[key].append((fixture.match_date, position, None))
+    if not bookings:
+        return []
+
+    windows = _windows()
+    for match in _booked_near(db, fixtures, bookings.keys(), windows, exclude_ids):
+        for key in _subjects(match, kinds):
+            # A match found through its venue may also share a team
+            if key in bookings:
+                bookings[key].append((match.match_date, None, match.id))
+    return _sweep(bookings, windows)
+
+
+def _sweep(
+    bookings: Dict[Tuple[str, object], List[Booking]],
+    windows: Dict[str, timedelta],
+) -> List[Clash]:
+    """Compare each booking with the later ones still inside its window."""
+    clashes = []
+    for (kind, subject), booked in bookings.items():
+        window = windows[kind]
+        booked.sort(key=lambda booking: booking[0])
+        for i, (kick_off, position, match_id) in enumerate(booked):
+            for j in range(i + 1, len(booked)):
+                later, other_position, other_match_id = booked[j]
+                if later - kick_off >= window:
+                    break
+                if position is not None:
+                    clashes.append(
+                        _clash(kind, subject, position, other_position, other_match_id)
+                    )
+                elif other_position is not None:
+                    clashes.append(
+                        _clash(kind, subject, other_position, None, match_id)
+                    )
+    return clashes
@@ -0,0 +1,249 @@
+﻿"""
+Standings service for Football League Manager.
+
+Maintains the materialized ``team_season_stats`` table. Match write paths
+call ``record_match`` inside their own transaction, so aggregate reads are
+single indexed lookups instead of scans over ``matches``.
+
+A match counts towards the table once its result is recorded: a match
+written through the API at or after kick-off is added to the table and
+flagged ``result_recorded``, and only that flag decides whether it is taken
+out again. Fixtures created ahead of time start counting when their score
+is entered. Kick-offs are stored as naive UTC and compared with
+``datetime.utcnow()``.
+
+Run ``python -m app.services.standings_service`` to check the table for
+drift, or add ``--rebuild`` to recompute it from the matches table.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import cached, invalidate
+from app.core.config import settings
+from app.database.models import Match, TeamSeasonStats
+from app.schemas.standings import TeamSeasonStatsResponse
+
+STAT_FIELDS = ("played", "won", "drawn", "lost", "goals_for", "goals_against", "points")
+
+
+def season_for(match_date: datetime) -> int:
+    """Return the season a date belongs to, named by its starting year."""
+    if match_date.month >= settings.SEASON_START_MONTH:
+        return match_date.year
+    return match_date.year - 1
+
+
+def current_season() -> int:
+    """Return the season in progress today."""
+    return season_for(datetime.utcnow())
+
+
+def _match_contributions(match: Match) -> List[Tuple[int, Dict[str, int]]]:
+    """Return the stats each side of a match adds to its team's row."""
+    contributions = []
+    sides = (
+        (match.team_a_id, match.score_team_a or 0, match.score_team_b or 0),
+        (match.team_b_id, match.score_team_b or 0, match.score_team_a or 0),
+    )
+    for team_id, scored, conceded in sides:
+        won, drawn, lost = scored > conceded, scored == conceded, scored < conceded
+        contributions.append(
+            (
+                team_id,
+                {
+                    "played": 1,
+                    "won": int(won),
+                    "drawn": int(drawn),
+                    "lost": int(lost),
+                    "goals_for": scored,
+                    "goals_against": conceded,
+                    "points": 3 * int(won) + int(drawn),
+                },
+            )
+        )
+    return contributions
+
+
+def _get_or_create_stats(db: Session, team_id: int, season: int) -> TeamSeasonStats:
+    stats = (
+        db.query(TeamSeasonStats)
+        .filter(TeamSeasonStats.team_id == team_id, TeamSeasonStats.season == season)
+        .first()
+    )
+    if stats is None:
+        stats = TeamSeasonStats(
+            team_id=team_id, season=season, **{field: 0 for field in STAT_FIELDS}
+        )
+        db.add(stats)
+        # Flush so a second lookup in the same transaction finds this row
+        db.flush()
+    return stats
+
+
+def record_match(db: Session, match: Match, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) a match result from the summary table.
+
+    Changes are only added to the session; the caller commits them together
+    with the match write so both succeed or fail as one transaction.
+    """
+    season = season_for(match.match_date)
+    for team_id, contribution in _match_contributions(match):
+        stats = _get_or_create_stats(db, team_id, season)
+        for field, value in contribution.items():
+            setattr(stats, field, getattr(stats, field) + sign * value)
+
+
+def record_result(db: Session, match: Match) -> None:
+    """Count a match being written, if it has kicked off, and flag it counted."""
+    if match.match_date <= datetime.utcnow():
+        record_match(db, match)
+        match.result_recorded = True
+
+
+def retract_result(db: Session, match: Match) -> None:
+    """Take a counted match back out of the table before it changes or goes."""
+    if match.result_recorded:
+        record_match(db, match, sign=-1)
+        match.result_recorded = False
+
+
+def get_standings(db: Session, season: int) -> List[TeamSeasonStats]:
+    """Get the league table for a season from the summary table."""
+    return (
+        db.query(TeamSeasonStats)
+        .filter(TeamSeasonStats.season == season)
+        .order_by(
+            TeamSeasonStats.points.desc(),
+            (TeamSeasonStats.goals_for - TeamSeasonStats.goals_against).desc(),
+            TeamSeasonStats.goals_for.desc(),
+            TeamSeasonStats.team_id,
+        )
+        .all()
+    )
+
+
+@cached("standings")
+def get_standings_table(db: Session, season: int) -> List[dict]:
+    """Get a season's league table as response dicts, cached for hot reads."""
+    return [
+        TeamSeasonStatsResponse.model_validate(stats).model_dump()
+        for stats in get_standings(db, season)
+    ]
+
+
+def get_team_stats(db: Session, team_id: int, season: int) -> TeamSeasonStats:
+    """Get one team's record for a season (zeros if it has not played)."""
+    stats = (
+        db.query(TeamSeasonStats)
+        .filter(TeamSeasonStats.team_id == team_id, TeamSeasonStats.season == season)
+        .first()
+    )
+    if stats is None:
+        stats = TeamSeasonStats(
+            team_id=team_id, season=season, **{field: 0 for field in STAT_FIELDS}
+        )
+    return stats
+
+
+def compute_stats(db: Session) -> Dict[Tuple[int, int], Dict[str, int]]:
+    """Recompute every team's season record from the raw matches table."""
+    totals: Dict[Tuple[int, int], Dict[str, int]] = defaultdict(
+        lambda: {field: 0 for field in STAT_FIELDS}
+    )
+    recorded = db.query(Match).filter(Match.result_recorded.is_(True))
+    for match in recorded.yield_per(1000):
+        season = season_for(match.match_date)
+        for team_id, contribution in _match_contributions(match):
+            row = totals[(team_id, season)]
+            for field, value in contribution.items():
+                row[field] += value
+    return dict(totals)
+
+
+def verify_stats(db: Session) -> List[dict]:
+    """Compare the summary table with a full recomputation.
+
+    Returns one entry per (team, season) whose stored values drifted.
+    """
+    expected = compute_stats(db)
+    stored = {
+        (stats.team_id, stats.season): {
+            field: getattr(stats, field) for field in STAT_FIELDS
+        }
+        for stats in db.query(TeamSeasonStats).all()
+    }
+    empty = {field: 0 for field in STAT_FIELDS}
+
+    drift = []
+    for team_id, season in sorted(set(expected) | set(stored)):
+        want = expected.get((team_id, season), empty)
+        have = stored.get((team_id, season), empty)
+        if want != have:
+            drift.append(
+                {
+                    "team_id": team_id,
+                    "season": season,
+                    "expected": want,
+                    "stored": have,
+                }
+            )
+    return drift
+
+
+def rebuild_stats(db: Session) -> int:
+    """Replace the summary table with a full recomputation.
+
+    Returns the number of rows written.
+    """
+    expected = compute_stats(db)
+    db.query(TeamSeasonStats).delete()
+    db.add_all(
+        TeamSeasonStats(team_id=team_id, season=season, **values)
+        for (team_id, season), values in expected.items()
+    )
+    db.commit()
+    invalidate("standings")
+    return len(expected)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Verify the summary table and optionally rebuild it."""
+    import argparse
+
+    from app.database.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompute the table if it drifted"
+    )
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        drift = verify_stats(db)
+        for entry in drift:
+            print(
+                f"Drift for team {entry['team_id']} season {entry['season']}: "
+                f"stored {entry['stored']} expected {entry['expected']}"
+            )
+        if not drift:
+            print("✅ Team season stats are consistent with matches")
+            return 0
+        if args.rebuild:
+            rows = rebuild_stats(db)
+            print(f"✅ Rebuilt team season stats ({rows} rows)")
+            return 0
+        print(f"❌ {len(drift)} team season rows drifted; rerun with --rebuild")
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
@@ -5,13 +5,17 @@ Contains business logic for team management, including
 CRUD operations and team-related business rules.
 """
 
+from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select, union_all
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.core.cache import cached, invalidate
 from app.core.exceptions import DuplicateResourceException, TeamNotFoundException
-from app.database.models import Team
-from app.schemas.team import TeamCreate, TeamUpdate
+from app.database.models import Match, Team, TeamSeasonStats
+from app.schemas.team import TeamCreate, TeamResponse, TeamUpdate
+from app.services import standings_service
 
 
 def get_team(db: Session, team_id: int) -> Team:
@@ -32,6 +36,35 @@ def get_teams(db: Session, skip: int = 0, limit: int = 100) -> List[Team]:
     return db.query(Team).offset(skip).limit(limit).all()
 
 
+@cached("teams")
+def list_teams(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
+    """Get a page of teams as response dicts, served from the cache when warm."""
+    return [
+        TeamResponse.model_validate(team).model_dump()
+        for team in get_teams(db, skip, limit)
+    ]
+
+
+def get_teams_nested(db: Session, skip: int = 0, limit: int = 100) -> List[Team]:
+    """Get teams with players, coaches and managers eagerly loaded.
+
+    Each collection is fetched with one IN query for the whole page, so the
+    query count stays constant however many teams are returned.
+    """
+    return (
+        db.query(Team)
+        .options(
+            selectinload(Team.players),
+            selectinload(Team.coaches),
+            selectinload(Team.managers),
+        )
+        .order_by(Team.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
 def create_team(db: Session, team: TeamCreate) -> Team:
     """Create a new team."""
     # Check if team with same name already exists
@@ -43,6 +76,7 @@ def create_team(db: Session, team: TeamCreate) -> Team:
     db.add(db_team)
     db.commit()
     db.refresh(db_team)
+    invalidate("teams")
     return db_team
 
 
@@ -56,6 +90,7 @@ def update_team(db: Session, team_id: int, team_update: TeamUpdate) -> Team:
 
     db.commit()
     db.refresh(db_team)
+    invalidate("teams")
     return db_team
 
 
@@ -64,6 +99,7 @@ def delete_team(db: Session, team_id: int) -> bool:
     db_team = get_team(db, team_id)
     db.delete(db_team)
     db.commit()
+    invalidate("teams")
     return True
 
 
@@ -77,11 +113,76 @@ def get_team_players(db: Session, team_id: int):
 
 def get_team_matches(db: Session, team_id: int):
     """Get all matches for a specific team."""
-    from app.database.models import Match
-
     team = get_team(db, team_id)
     return (
         db.query(Match)
         .filter((Match.team_a_id == team.id) | (Match.team_b_id == team.id))
         .all()
     )
+
+
+def get_team_dashboard(
+    db: Session,
+    team_id: int,
+    recent: int = 5,
+    upcoming: int = 5,
+    season: Optional[int] = None,
+) -> dict:
+    """Get everything a club page needs in two round trips.
+
+    The team, its squad and staff and its row in ``team_season_stats`` come
+    back in one joined query, so the summary agrees with the standings. The
+    latest results and next fixtures come in a second query that reads only
+    ``recent`` and ``upcoming`` matches.
+    """
+    season = season or standings_service.current_season()
+    row = (
+        db.query(Team, TeamSeasonStats)
+        .outerjoin(
+            TeamSeasonStats,
+            and_(TeamSeasonStats.team_id == Team.id, TeamSeasonStats.season == season),
+        )
+        .options(joinedload(Team.players), joinedload(Team.coaches))
+        .filter(Team.id == team_id)
+        .first()
+    )
+    if not row:
+        raise TeamNotFoundException(f"Team with id {team_id} not found")
+    team, stats = row
+
+    now = datetime.utcnow()
+    involved = or_(Match.team_a_id == team_id, Match.team_b_id == team_id)
+    latest = (
+        select(Match.id)
+        .where(involved, Match.match_date <= now)
+        .order_by(Match.match_date.desc())
+        .limit(recent)
+        .subquery()
+    )
+    following = (
+        select(Match.id)
+        .where(involved, Match.match_date > now)
+        .order_by(Match.match_date)
+        .limit(upcoming)
+        .subquery()
+    )
+    matches = (
+        db.query(Match)
+        .filter(Match.id.in_(union_all(select(latest.c.id), select(following.c.id))))
+        .order_by(Match.match_date, Match.id)
+        .all()
+    )
+
+    summary = {
+        field: getattr(stats, field) if stats else 0
+        for field in standings_service.STAT_FIELDS
+    }
+    summary["goal_difference"] = summary["goals_for"] - summary["goals_against"]
+    return {
+        "team": team,
+        "squad": team.players,
+        "staff": team.coaches,
+        "recent_matches": [m for m in reversed(matches) if m.match_date <= now],
+        "upcoming_matches": [m for m in matches if m.match_date > now],
+        "summary": summary,
+    }
@@ -0,0 +1,157 @@
+﻿"""
+Refresh token service for Football League Manager.
+
+Refresh tokens are random, opaque strings; only their SHA-256 digest is
+stored, under a unique index, so renewing an access token is one indexed
+lookup instead of a password hash. Every renewal rotates the token: the
+presented one is revoked and a new one is issued in the same family. A
+revoked token presented again means it leaked, so its whole family is
+revoked. Password changes (a higher ``token_version``) invalidate refresh
+tokens without any extra writes; a deleted user's tokens are deleted with
+the user.
+"""
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import InvalidRefreshTokenException
+from app.core.security import Principal
+from app.database.models import RefreshToken, TokenRevocation, User
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(
+    db: Session, user_id: int, token_version: int, family_id: Optional[str] = None
+) -> str:
+    """Store a new refresh token for the user and return it."""
+    token = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            token_hash=hash_refresh_token(token),
+            user_id=user_id,
+            family_id=family_id or secrets.token_hex(16),
+            token_version=token_version,
+            expires_at=datetime.utcnow()
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    db.commit()
+    return token
+
+
+def revoke_family(db: Session, family_id: str, now: datetime) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+    ).update({RefreshToken.revoked_at: now}, synchronize_session=False)
+    db.commit()
+
+
+def delete_user_tokens(db: Session, user_id: int) -> None:
+    """Delete a user's refresh tokens in the caller's transaction."""
+    db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete(
+        synchronize_session=False
+    )
+
+
+def rotate_refresh_token(db: Session, token: str) -> Tuple[Principal, str]:
+    """Exchange a refresh token for the user it belongs to and a new token."""
+    now = datetime.utcnow()
+    row = (
+        db.query(
+            RefreshToken.id,
+            RefreshToken.family_id,
+            RefreshToken.token_version,
+            RefreshToken.expires_at,
+            RefreshToken.revoked_at,
+            User.id,
+            User.username,
+            User.token_version,
+        )
+        .join(User, User.id == RefreshToken.user_id)
+        .filter(RefreshToken.token_hash == hash_refresh_token(token))
+        .first()
+    )
+    if row is None:
+        raise InvalidRefreshTokenException("Unknown refresh token")
+    token_id, family_id, version, expires_at, revoked_at = row[:5]
+    principal = Principal(*row[5:])
+
+    if revoked_at is not None:
+        revoke_family(db, family_id, now)
+        raise InvalidRefreshTokenException("Refresh token was already used")
+    if expires_at <= now or version < principal.token_version:
+        raise InvalidRefreshTokenException("Refresh token has expired")
+
+    # Only one of several concurrent renewals with the same token wins
+    claimed = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.id == token_id, RefreshToken.revoked_at.is_(None))
+        .update({RefreshToken.revoked_at: now}, synchronize_session=False)
+    )
+    if claimed != 1:
+        db.rollback()
+        revoke_family(db, family_id, now)
+        raise InvalidRefreshTokenException("Refresh token was already used")
+
+    new_token = issue_refresh_token(
+        db, principal.id, principal.token_version, family_id
+    )
+    return principal, new_token
+
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    """Revoke a refresh token and every token rotated from the same login."""
+    family_id = (
+        db.query(RefreshToken.family_id)
+        .filter(RefreshToken.token_hash == hash_refresh_token(token))
+        .scalar()
+    )
+    if family_id is not None:
+        revoke_family(db, family_id, datetime.utcnow())
+
+
+def _delete_batch(db: Session, model, condition, batch_size: int) -> int:
+    ids = select(model.id).where(condition).limit(batch_size).scalar_subquery()
+    deleted = (
+        db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+def sweep_expired_tokens(
+    db: Session, batch_size: int, now: Optional[datetime] = None
+) -> Dict[str, int]:
+    """Delete expired refresh tokens and revocations nothing can need.
+
+    Rows go in batches of ``batch_size``, each in its own short transaction,
+    so a large backlog never holds a long write lock.
+    """
+    now = now or datetime.utcnow()
+    access_lifetime = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    targets = {
+        "refresh_tokens": (RefreshToken, RefreshToken.expires_at < now),
+        # Every access token a revocation could reject has expired
+        "token_revocations": (
+            TokenRevocation,
+            TokenRevocation.created_at < now - access_lifetime,
+        ),
+    }
+    report = {}
+    for name, (model, condition) in targets.items():
+        report[name] = 0
+        while True:
+            deleted = _delete_batch(db, model, condition, batch_size)
+            report[name] += deleted
+            if deleted < batch_size:
+                break
+    return report
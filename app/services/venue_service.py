@@ -9,9 +9,10 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached, invalidate
 from app.core.exceptions import DuplicateResourceException, VenueNotFoundException
 from app.database.models import Match, Venue
-from app.schemas.venue import VenueCreate, VenueUpdate
+from app.schemas.venue import VenueCreate, VenueResponse, VenueUpdate
 
 
 def get_venue(db: Session, venue_id: int) -> Venue:
@@ -32,6 +33,15 @@ def get_venues(db: Session, skip: int = 0, limit: int = 100) -> List[Venue]:
     return db.query(Venue).offset(skip).limit(limit).all()
 
 
+@cached("venues")
+def list_venues(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
+    """Get a page of venues as response dicts, served from the cache when warm."""
+    return [
+        VenueResponse.model_validate(venue).model_dump()
+        for venue in get_venues(db, skip, limit)
+    ]
+
+
 def create_venue(db: Session, venue: VenueCreate) -> Venue:
     """Create a new venue."""
     # Check if venue with same name already exists
@@ -45,6 +55,7 @@ def create_venue(db: Session, venue: VenueCreate) -> Venue:
     db.add(db_venue)
     db.commit()
     db.refresh(db_venue)
+    invalidate("venues")
     return db_venue
 
 
@@ -59,6 +70,8 @@ def update_venue(db: Session, venue_id: int, venue_update: VenueUpdate) -> Venue
 
     db.commit()
     db.refresh(db_venue)
+    invalidate("venues")
+    invalidate("venue_statistics")
     return db_venue
 
 
@@ -67,6 +80,8 @@ def delete_venue(db: Session, venue_id: int) -> bool:
     db_venue = get_venue(db, venue_id)
     db.delete(db_venue)
     db.commit()
+    invalidate("venues")
+    invalidate("venue_statistics")
     return True
 
 
@@ -92,8 +107,9 @@ def get_venue_matches(db: Session, venue_id: int) -> List[Match]:
     return db.query(Match).filter(Match.venue == venue.name).all()
 
 
+@cached("venue_statistics")
 def get_venue_statistics(db: Session, venue_id: int) -> dict:
-    """Get venue statistics and details."""
+    """Get venue statistics and details (cached in the configured backend)."""
     venue = get_venue(db, venue_id)
     matches = get_venue_matches(db, venue_id)
 
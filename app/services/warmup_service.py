@@ -0,0 +1,69 @@
+﻿"""
+Cache warm-up service for Football League Manager.
+
+Preloads the hot datasets (reference tables, current standings and
+upcoming fixtures) into the cache so the first requests after a deploy
+or restart do not all miss at the same moment.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Iterable
+
+from sqlalchemy.orm import Session
+
+from app.services import (
+    match_service,
+    referee_service,
+    standings_service,
+    team_service,
+    venue_service,
+)
+
+logger = logging.getLogger(__name__)
+
+# Each loader goes through the same cached service call the routers use,
+# so warming it fills exactly the entry the first request will read
+HOT_DATASETS: Dict[str, Callable[[Session], object]] = {
+    "teams": lambda db: team_service.list_teams(db),
+    "venues": lambda db: venue_service.list_venues(db),
+    "referees": lambda db: referee_service.list_referees(db),
+    "standings": lambda db: standings_service.get_standings_table(
+        db, standings_service.current_season()
+    ),
+    "upcoming_fixtures": lambda db: match_service.get_upcoming_matches(db),
+}
+
+
+def warm_caches(db: Session, datasets: Iterable[str]) -> dict:
+    """Load each configured dataset into the cache and time it.
+
+    A failing dataset is logged and reported but does not stop the others;
+    it will simply be loaded by the first request that needs it.
+    """
+    report: dict = {"datasets": {}, "errors": {}}
+    started = time.perf_counter()
+
+    for name in datasets:
+        loader = HOT_DATASETS.get(name)
+        if loader is None:
+            report["errors"][name] = "unknown dataset"
+            logger.warning("Skipping unknown warm-up dataset %s", name)
+            continue
+
+        dataset_started = time.perf_counter()
+        try:
+            loader(db)
+        except Exception as exc:  # keep warming the remaining datasets
+            db.rollback()
+            report["errors"][name] = str(exc)
+            logger.exception("Failed to warm %s cache", name)
+            continue
+        elapsed_ms = (time.perf_counter() - dataset_started) * 1000
+        report["datasets"][name] = round(elapsed_ms, 2)
+
+    report["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(
+        "Cache warm-up finished in %.1f ms (%s)", report["total_ms"], report["datasets"]
+    )
+    return report
@@ -7,24 +7,72 @@ import tempfile
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app.core.cache import InMemoryCache, set_cache
+from app.core.config import settings
+from app.core.events import set_broker
+from app.core.revocation import set_revocations
+from app.core.rooms import set_rooms
 from app.core.security import get_password_hash
-from app.database.models import Base
-from app.database.session import get_db
+from app.core.throttle import InMemoryBuckets, set_bucket_store
+from app.core.tokens import set_token_cache
+from app.database.models import Base, Team, User, Venue
+from app.database.session import get_db, shared_session
 from app.main import app
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    """Give every test fresh caches, event broker, rooms and login throttle."""
+    set_cache(InMemoryCache())
+    set_broker(None)
+    set_rooms(None)
+    set_token_cache(None)
+    set_revocations(None)
+    set_bucket_store(InMemoryBuckets())
+    yield
+    set_cache(None)
+    set_broker(None)
+    set_rooms(None)
+    set_token_cache(None)
+    set_revocations(None)
+    set_bucket_store(None)
+
+
 # Create test database
 @pytest.fixture(scope="function")  # Changed from "session" to "function"
 def test_engine():
-    """Create a test database engine using SQLite in-memory database."""
-    engine = create_engine("sqlite:///:memory:", echo=False)
+    """Create a test database engine using SQLite in-memory database.
+
+    StaticPool keeps a single connection so the in-memory database is visible
+    from the threadpool that runs sync endpoints under the TestClient.
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(bind=engine)
     return engine
 
 
+@pytest.fixture
+def statement_counter(test_engine):
+    """Record SQL statements executed against the test engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture(scope="function")
 def test_db(test_engine):
     """Create a test database session with transaction rollback."""
@@ -44,10 +92,19 @@ def test_db(test_engine):
 
 
 @pytest.fixture(scope="function")
-def client(test_db):
-    """Create a test client with test database."""
+def client(test_db, monkeypatch):
+    """Create a test client with test database.
+
+    Startup cache warm-up is disabled so tests control what gets cached.
+    """
+    monkeypatch.setattr(settings, "CACHE_WARMUP_ENABLED", False)
 
     def override_get_db():
+        # Batch sub-requests reuse the batch call's session, as with get_db
+        shared = shared_session.get()
+        if shared is not None:
+            yield shared
+            return
         try:
             yield test_db
         finally:
@@ -70,6 +127,76 @@ def sample_user_data():
     }
 
 
+@pytest.fixture
+def create_user(test_db):
+    """Return a factory that stores a user and returns its id."""
+
+    def create(username="account", password="password123", **fields):
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            hashed_password=get_password_hash(password),
+            **fields,
+        )
+        test_db.add(user)
+        test_db.commit()
+        return user.id
+
+    return create
+
+
+@pytest.fixture
+def account(create_user):
+    """Create the default ``account`` user and return its id."""
+    return create_user()
+
+
+@pytest.fixture
+def login(client):
+    """Return a helper that logs a user in and returns the token response."""
+
+    def log_in(username="account", password="password123"):
+        response = client.post(
+            "/api/v1/auth/token", data={"username": username, "password": password}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    return log_in
+
+
+@pytest.fixture
+def create_teams(test_db):
+    """Return a factory that stores teams and returns their ids.
+
+    ``home_ground`` is formatted with each team's number (None leaves the
+    ground unset). With ``countries``, one team is created per country and
+    its ground is stored as a venue in that country.
+    """
+    created = []
+
+    def create(count=0, home_ground="Ground {number}", countries=()):
+        numbers = range(len(created), len(created) + (count or len(countries)))
+        grounds = [
+            home_ground.format(number=number) if home_ground else None
+            for number in numbers
+        ]
+        test_db.add_all(
+            Venue(name=ground, city="City", country=country, capacity=1000)
+            for ground, country in zip(grounds, countries)
+        )
+        teams = [
+            Team(name=f"Team {number}", founded_year=1990, home_ground=ground)
+            for number, ground in zip(numbers, grounds)
+        ]
+        test_db.add_all(teams)
+        test_db.commit()
+        created.extend(teams)
+        return [team.id for team in teams]
+
+    return create
+
+
 @pytest.fixture
 def sample_team_data():
     """Sample team data for testing."""
@@ -117,8 +244,6 @@ def sample_match_data():
 @pytest.fixture
 def authenticated_headers(client, test_db, sample_user_data):
     """Create authenticated headers for testing protected endpoints."""
-    from app.database.models import User
-
     # Create test user
     user = User(
         username=sample_user_data["username"],
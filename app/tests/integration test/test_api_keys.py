@@ -0,0 +1,130 @@
+﻿"""
+Integration tests for service-account API keys.
+"""
+
+import hashlib
+
+import pytest
+
+from app.core.revocation import get_revocations, record_revocation
+from app.database.models import ApiKey, User
+
+
+@pytest.fixture
+def api_key(client, authenticated_headers):
+    """Create an API key for the authenticated test user."""
+    response = client.post(
+        "/api/v1/auth/api-keys",
+        json={"name": "ingest bot"},
+        headers=authenticated_headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def me(client, key):
+    return client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {key}"})
+
+
+class TestApiKeys:
+    """Test creating, using and revoking API keys."""
+
+    def test_key_returned_once_and_stored_hashed(
+        self, client, test_db, authenticated_headers, api_key
+    ):
+        """Test only the digest is stored and listings never show the key."""
+        assert api_key["key"].startswith("flm_")
+        assert api_key["key"].startswith(api_key["prefix"])
+
+        row = test_db.query(ApiKey).one()
+        assert row.key_hash == hashlib.sha256(api_key["key"].encode()).hexdigest()
+
+        listed = client.get("/api/v1/auth/api-keys", headers=authenticated_headers)
+        assert [item["name"] for item in listed.json()] == ["ingest bot"]
+        assert "key" not in listed.json()[0]
+
+    def test_key_authenticates(self, client, api_key):
+        """Test the key works as a bearer credential."""
+        response = me(client, api_key["key"])
+        assert response.status_code == 200
+        assert response.json()["username"] == "testuser"
+
+    def test_lookup_is_indexed_and_cached(self, client, api_key, statement_counter):
+        """Test the first use is one lookup by digest and later uses hit the cache."""
+        statement_counter.clear()
+        me(client, api_key["key"])
+        lookups = [s for s in statement_counter if "api_keys.key_hash = ?" in s]
+        assert len(lookups) == 1
+
+        statement_counter.clear()
+        me(client, api_key["key"])
+        assert not [s for s in statement_counter if "api_keys" in s]
+
+    def test_revoked_key_rejected(self, client, authenticated_headers, api_key):
+        """Test a revoked key stops working immediately, even when cached."""
+        assert me(client, api_key["key"]).status_code == 200
+        response = client.delete(
+            f"/api/v1/auth/api-keys/{api_key['id']}", headers=authenticated_headers
+        )
+        assert response.status_code == 204
+        assert me(client, api_key["key"]).status_code == 401
+
+    def test_deleting_owner_revokes_keys(self, client, test_db, api_key):
+        """Test a deleted user's keys stop working, even when cached."""
+        headers = {"Authorization": f"Bearer {api_key['key']}"}
+        assert client.get("/api/v1/auth/api-keys", headers=headers).status_code == 200
+        user_id = me(client, api_key["key"]).json()["id"]
+
+        assert client.delete(f"/api/v1/users/{user_id}").status_code == 204
+        assert test_db.query(ApiKey).one().revoked_at is not None
+        assert me(client, api_key["key"]).status_code == 401
+        assert client.get("/api/v1/auth/api-keys", headers=headers).status_code == 401
+
+    def test_cached_key_of_deleted_owner_rejected(self, client, test_db, api_key):
+        """Test a cached owner is checked against the revocation list."""
+        headers = {"Authorization": f"Bearer {api_key['key']}"}
+        assert client.get("/api/v1/auth/api-keys", headers=headers).status_code == 200
+        user_id = me(client, api_key["key"]).json()["id"]
+
+        # Deleted without revoking the key; only the revocation is recorded
+        test_db.query(User).filter(User.id == user_id).delete()
+        record_revocation(test_db, user_id, None)
+        test_db.commit()
+        get_revocations().refresh(test_db)
+
+        assert client.get("/api/v1/auth/api-keys", headers=headers).status_code == 401
+
+    def test_key_survives_password_change(self, client, api_key):
+        """Test changing the owner's password does not revoke cached keys."""
+        user_id = me(client, api_key["key"]).json()["id"]
+        response = client.put(
+            f"/api/v1/users/{user_id}", json={"password": "changed123"}
+        )
+        assert response.status_code == 200
+
+        headers = {"Authorization": f"Bearer {api_key['key']}"}
+        assert client.get("/api/v1/auth/api-keys", headers=headers).status_code == 200
+
+    def test_unknown_key_rejected(self, client):
+        """Test a made-up key is refused."""
+        assert me(client, "flm_not-a-real-key").status_code == 401
+
+    def test_cannot_revoke_other_users_key(self, client, api_key):
+        """Test keys are scoped to their owner."""
+        client.post(
+            "/api/v1/users/",
+            json={
+                "username": "intruder",
+                "email": "intruder@example.com",
+                "password": "password123",
+            },
+        )
+        token = client.post(
+            "/api/v1/auth/token",
+            data={"username": "intruder", "password": "password123"},
+        ).json()["access_token"]
+        response = client.delete(
+            f"/api/v1/auth/api-keys/{api_key['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 404
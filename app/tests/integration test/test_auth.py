@@ -5,6 +5,8 @@ Integration tests for authentication endpoints.
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
+from app.core.passwords import check_password, current_policy, hash_password
 from app.core.security import get_password_hash
 from app.database.models import User
 
@@ -196,3 +198,28 @@ class TestAuthEndpoints:
         protected_response = client.get("/api/v1/users/me", headers=headers)
         assert protected_response.status_code == 200
         assert protected_response.json()["username"] == "flowuser"
+
+    def test_login_rehashes_outdated_hash(self, client, test_db, monkeypatch):
+        """Test a hash made at another cost is upgraded on successful login."""
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+        user = User(
+            username="olduser",
+            email="old@example.com",
+            hashed_password=hash_password(
+                "password123", ("bcrypt", 4) + current_policy()[2:]
+            ),
+        )
+        test_db.add(user)
+        test_db.commit()
+
+        login_data = {"username": "olduser", "password": "wrongpassword"}
+        assert client.post("/api/v1/auth/token", data=login_data).status_code == 401
+        # Login closes the shared session, detaching the user
+        user = test_db.query(User).filter(User.username == "olduser").one()
+        assert user.hashed_password.startswith("$2b$04$")
+
+        login_data["password"] = "password123"
+        assert client.post("/api/v1/auth/token", data=login_data).status_code == 200
+        user = test_db.query(User).filter(User.username == "olduser").one()
+        assert user.hashed_password.startswith("$2b$05$")
+        assert check_password("password123", user.hashed_password)
@@ -0,0 +1,145 @@
+﻿"""
+Integration tests for the multiplexed batch endpoint.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.database.models import Team
+from app.database.session import release_connection, shared_session
+from app.routers import user_router
+
+
+@pytest.fixture
+def team(test_db):
+    """Create a team."""
+    team = Team(name="Batch FC", coach_name="Coach", founded_year=1990)
+    test_db.add(team)
+    test_db.commit()
+    return team
+
+
+class TestBatchEndpoint:
+    """Test dispatching several sub-requests in one call."""
+
+    def test_results_returned_in_order(self, client, team):
+        """Test each sub-request gets its own status and body, in order."""
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"path": f"/api/v1/teams/{team.id}?fields=id,name"},
+                    {"path": "/api/v1/teams/999"},
+                    {"path": "/api/v1/players/"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        results = response.json()["responses"]
+        assert [result["status"] for result in results] == [200, 404, 200]
+        assert results[0]["body"] == {"id": team.id, "name": "Batch FC"}
+        assert results[1]["body"] == {"detail": "Team not found"}
+        assert results[2]["body"] == []
+
+    def test_writes_visible_to_later_reads(self, client, team):
+        """Test sub-requests share a session and run in order."""
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {
+                        "method": "POST",
+                        "path": "/api/v1/players/",
+                        "body": {
+                            "team_id": team.id,
+                            "name": "Striker",
+                            "position": "Forward",
+                            "age": 22,
+                        },
+                    },
+                    {"path": f"/api/v1/players/team/{team.id}?fields=name"},
+                ]
+            },
+        )
+        created, listed = response.json()["responses"]
+        assert created["status"] == 201
+        assert listed["body"] == [{"name": "Striker"}]
+
+    def test_validation_errors_reported_per_request(self, client, team):
+        """Test an invalid sub-request body yields 422 without failing the batch."""
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"method": "POST", "path": "/api/v1/players/", "body": {}},
+                    {"path": f"/api/v1/teams/{team.id}?fields=id"},
+                ]
+            },
+        )
+        results = response.json()["responses"]
+        assert [result["status"] for result in results] == [422, 200]
+
+    def test_parallel_reads(self, client):
+        """Test parallel GET sub-requests keep the request order."""
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "parallel": True,
+                "requests": [{"path": "/"}, {"path": "/no-such-route"}, {"path": "/"}],
+            },
+        )
+        results = response.json()["responses"]
+        assert [result["status"] for result in results] == [200, 404, 200]
+
+    def test_nested_batch_rejected(self, client):
+        """Test a batch cannot dispatch another batch."""
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [{"method": "POST", "path": "/api/v1/batch"}]},
+        )
+        assert response.status_code == 400
+
+    def test_too_many_requests_rejected(self, client, monkeypatch):
+        """Test batches above BATCH_MAX_REQUESTS return 400."""
+        monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 1)
+        response = client.post(
+            "/api/v1/batch", json={"requests": [{"path": "/"}, {"path": "/"}]}
+        )
+        assert response.status_code == 400
+
+    def test_server_error_rolled_back_for_later_requests(self, client, monkeypatch):
+        """Test a sub-request failing mid-transaction does not break the rest."""
+        user = {
+            "username": "taken",
+            "email": "taken@example.com",
+            "password": "password123",
+        }
+        client.post("/api/v1/users/", json=user)
+        # Lose the registration race: the insert itself hits the unique index
+        monkeypatch.setattr(user_router, "check_unique_user", lambda db, user: None)
+
+        response = client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"method": "POST", "path": "/api/v1/users/", "body": user},
+                    {"path": "/api/v1/players/"},
+                ]
+            },
+        )
+
+        failed, read = response.json()["responses"]
+        assert failed["status"] == 500
+        assert read["status"] == 200
+
+    def test_shared_session_not_released(self, test_db, team):
+        """Test sub-requests cannot close the session the batch call shares."""
+        token = shared_session.set(test_db)
+        try:
+            release_connection(test_db)
+        finally:
+            shared_session.reset(token)
+        assert team in test_db
+
+        release_connection(test_db)
+        assert team not in test_db
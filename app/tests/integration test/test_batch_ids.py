@@ -0,0 +1,93 @@
+﻿"""
+Integration tests for batch lookups by id (?ids=).
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.database.models import Match, Team
+
+
+@pytest.fixture
+def team_ids(test_db):
+    """Create three teams and return their ids."""
+    teams = [
+        Team(name=f"Batch FC {i}", coach_name="Coach", founded_year=1990 + i)
+        for i in range(3)
+    ]
+    test_db.add_all(teams)
+    test_db.commit()
+    return [team.id for team in teams]
+
+
+class TestBatchLookup:
+    """Test fetching several resources in one request."""
+
+    def test_request_order_preserved(self, client, team_ids):
+        """Test rows come back in the order the ids were requested."""
+        first, second, third = team_ids
+        response = client.get(f"/api/v1/teams/?ids={third},{first},{second}")
+        assert response.status_code == 200
+        assert [team["id"] for team in response.json()] == [third, first, second]
+        assert "x-missing-ids" not in response.headers
+
+    def test_missing_ids_reported(self, client, team_ids):
+        """Test unknown ids are listed in the X-Missing-Ids header."""
+        response = client.get(f"/api/v1/teams/?ids=999,{team_ids[0]},998")
+        assert response.status_code == 200
+        assert [team["id"] for team in response.json()] == [team_ids[0]]
+        assert response.headers["x-missing-ids"] == "999,998"
+
+    def test_duplicates_collapsed(self, client, team_ids):
+        """Test repeated ids are returned once."""
+        ids = f"{team_ids[1]},{team_ids[1]}"
+        response = client.get(f"/api/v1/teams/?ids={ids}")
+        assert len(response.json()) == 1
+
+    def test_single_in_query(self, client, team_ids, test_db, statement_counter):
+        """Test a batch of matches is served by one IN query."""
+        matches = [
+            Match(
+                team_a_id=team_ids[0],
+                team_b_id=team_ids[1],
+                match_date=datetime(2025, 9, day),
+                venue="Stadium",
+            )
+            for day in (1, 8, 15)
+        ]
+        test_db.add_all(matches)
+        test_db.commit()
+        ids = ",".join(str(match.id) for match in reversed(matches))
+
+        statement_counter.clear()
+        response = client.get(f"/api/v1/matches/?ids={ids}&fields=id,venue")
+        selects = [s for s in statement_counter if "FROM matches" in s]
+        assert len(selects) == 1
+        assert " IN " in selects[0]
+        assert response.json() == [
+            {"id": match.id, "venue": "Stadium"} for match in reversed(matches)
+        ]
+
+    @pytest.mark.parametrize(
+        "path", ["players", "coaches", "venues", "referees", "matches"]
+    )
+    def test_every_list_endpoint(self, client, path):
+        """Test each list endpoint accepts ids."""
+        response = client.get(f"/api/v1/{path}/?ids=1")
+        assert response.status_code == 200
+        assert response.json() == []
+        assert response.headers["x-missing-ids"] == "1"
+
+    def test_invalid_id_rejected(self, client):
+        """Test non-integer ids return 400."""
+        response = client.get("/api/v1/players/?ids=1,abc")
+        assert response.status_code == 400
+        assert "abc" in response.json()["detail"]
+
+    def test_too_many_ids_rejected(self, client, monkeypatch):
+        """Test batches above BATCH_MAX_IDS return 400."""
+        monkeypatch.setattr(settings, "BATCH_MAX_IDS", 2)
+        response = client.get("/api/v1/players/?ids=1,2,3")
+        assert response.status_code == 400
@@ -0,0 +1,91 @@
+﻿"""
+Integration tests for season fixture generation.
+"""
+
+from datetime import datetime, timedelta
+
+from app.database.models import Match, Team
+
+
+class TestFixtureGeneration:
+    """Test the POST /api/v1/matches/fixtures endpoint."""
+
+    def test_generates_double_round_robin(self, client, test_db, create_teams):
+        """Test a full season is scheduled round by round at home grounds."""
+        team_ids = create_teams(6)
+        start = (datetime.now() + timedelta(days=30)).replace(microsecond=0)
+
+        response = client.post(
+            "/api/v1/matches/fixtures",
+            json={
+                "team_ids": team_ids,
+                "start_date": start.isoformat(),
+                "days_between_rounds": 3,
+            },
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["teams"] == 6
+        assert data["rounds"] == 10
+        assert data["matches"] == 30
+        assert data["last_match_date"] == (start + timedelta(days=27)).isoformat()
+
+        matches = test_db.query(Match).all()
+        assert len(matches) == 30
+        assert len({(m.team_a_id, m.team_b_id) for m in matches}) == 30
+        teams = {team.id: team for team in test_db.query(Team)}
+        for match in matches:
+            assert match.venue == teams[match.team_a_id].home_ground
+            assert (match.match_date - start).days % 3 == 0
+
+    def test_single_round_robin_of_every_team(self, client, test_db, create_teams):
+        """Test omitted team ids schedule the whole league once."""
+        create_teams(5, home_ground=None)
+        start = datetime.now() + timedelta(days=1)
+
+        response = client.post(
+            "/api/v1/matches/fixtures",
+            json={"start_date": start.isoformat(), "double_round_robin": False},
+        )
+
+        assert response.status_code == 201
+        assert response.json()["matches"] == 10
+        assert {m.venue for m in test_db.query(Match)} == {"TBD"}
+
+    def test_unknown_team(self, client, test_db, create_teams):
+        """Test nothing is inserted when a team does not exist."""
+        team_ids = create_teams(3)
+        start = datetime.now() + timedelta(days=1)
+
+        response = client.post(
+            "/api/v1/matches/fixtures",
+            json={"team_ids": [*team_ids, 9999], "start_date": start.isoformat()},
+        )
+
+        assert response.status_code == 404
+        assert "9999" in response.json()["detail"]
+        assert test_db.query(Match).count() == 0
+
+    def test_rejects_past_start_and_duplicate_teams(
+        self, client, test_db, create_teams
+    ):
+        """Test fixtures must be unplayed and name each team once."""
+        team_ids = create_teams(4)
+        past = datetime.now() - timedelta(days=1)
+        future = datetime.now() + timedelta(days=1)
+
+        response = client.post(
+            "/api/v1/matches/fixtures",
+            json={"team_ids": team_ids, "start_date": past.isoformat()},
+        )
+        assert response.status_code == 400
+
+        response = client.post(
+            "/api/v1/matches/fixtures",
+            json={
+                "team_ids": [*team_ids, team_ids[0]],
+                "start_date": future.isoformat(),
+            },
+        )
+        assert response.status_code == 422
@@ -0,0 +1,100 @@
+﻿"""
+Integration tests for live score streams (Server-Sent Events) and rooms.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.events import get_broker
+from app.database.models import Match, Team
+
+
+@pytest.fixture
+def match(test_db):
+    """Create a match between two teams."""
+    home = Team(name="Home FC", coach_name="Coach", founded_year=1990)
+    away = Team(name="Away FC", coach_name="Coach", founded_year=1995)
+    test_db.add_all([home, away])
+    test_db.commit()
+    match = Match(
+        team_a_id=home.id,
+        team_b_id=away.id,
+        match_date=datetime.now() + timedelta(hours=1),
+        venue="Stadium",
+    )
+    test_db.add(match)
+    test_db.commit()
+    return match
+
+
+def read_events(response):
+    """Parse SSE frames into (id, event, data) tuples."""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestLiveScores:
+    """Test score updates reach the streams."""
+
+    def test_update_replayed_from_last_event_id(self, client, match):
+        """Test score updates are published and replayed on reconnect."""
+        client.put(f"/api/v1/matches/{match.id}", json={"score_team_a": 1})
+        client.put(f"/api/v1/matches/{match.id}", json={"score_team_b": 1})
+        # End the streams so the test client can read them to completion
+        get_broker().close()
+
+        response = client.get(
+            f"/api/v1/matches/{match.id}/stream", headers={"Last-Event-ID": "1"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        [(event_id, event, data)] = read_events(response)
+        assert (event_id, event) == (2, "score")
+        assert (data["score_team_a"], data["score_team_b"]) == (1, 1)
+
+    def test_league_stream(self, client, match):
+        """Test the league stream carries every match's updates."""
+        client.put(f"/api/v1/matches/{match.id}", json={"score_team_a": 2})
+        get_broker().close()
+
+        response = client.get("/api/v1/matches/stream", headers={"Last-Event-ID": "0"})
+        assert [data["id"] for _, _, data in read_events(response)] == [match.id]
+
+    def test_other_match_not_replayed(self, client, match):
+        """Test per-match streams only carry their own match."""
+        client.put(f"/api/v1/matches/{match.id}", json={"score_team_a": 3})
+        get_broker().close()
+
+        response = client.get(
+            f"/api/v1/matches/{match.id + 1}/stream", headers={"Last-Event-ID": "0"}
+        )
+        assert response.text == ""
+
+
+class TestMatchRooms:
+    """Test WebSocket match rooms."""
+
+    def test_score_pushed_to_room(self, client, match):
+        """Test update_match pushes the new score to room members."""
+        with client.websocket_connect(f"/api/v1/matches/{match.id}/room") as ws:
+            client.put(f"/api/v1/matches/{match.id}", json={"score_team_a": 1})
+            message = ws.receive_json()
+        assert message["type"] == "score"
+        assert message["data"]["score_team_a"] == 1
+
+    def test_comments_broadcast(self, client, match):
+        """Test commentary reaches every member of the room."""
+        path = f"/api/v1/matches/{match.id}/room"
+        with client.websocket_connect(path) as first:
+            with client.websocket_connect(path) as second:
+                first.send_json({"type": "ignored"})
+                first.send_text("not json")
+                first.send_json({"type": "comment", "text": "Kick-off!"})
+                expected = {"type": "comment", "data": {"text": "Kick-off!"}}
+                assert first.receive_json() == expected
+                assert second.receive_json() == expected
@@ -0,0 +1,60 @@
+﻿"""
+Integration tests for login throttling.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.routers import auth_router
+
+
+@pytest.fixture
+def hashing_calls(monkeypatch):
+    """Record password verifications made by the login endpoint."""
+    calls = []
+    verify = auth_router.check_and_rehash_async
+
+    async def counting(*args):
+        calls.append(args[0])
+        return await verify(*args)
+
+    monkeypatch.setattr(auth_router, "check_and_rehash_async", counting)
+    return calls
+
+
+def attempt(client, username="account", password="wrongpassword"):
+    return client.post(
+        "/api/v1/auth/token", data={"username": username, "password": password}
+    )
+
+
+class TestLoginThrottle:
+    """Test login attempts are throttled before any hashing."""
+
+    def test_username_burst_then_429(self, client, account, hashing_calls):
+        """Test attempts past the per-username burst get 429 without hashing."""
+        for _ in range(settings.LOGIN_USERNAME_BURST):
+            assert attempt(client).status_code == 401
+
+        response = attempt(client, password="password123")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert len(hashing_calls) == settings.LOGIN_USERNAME_BURST
+
+    def test_username_match_ignores_case(self, client, account, monkeypatch):
+        """Test changing the case of the username does not dodge the limit."""
+        monkeypatch.setattr(settings, "LOGIN_USERNAME_BURST", 1)
+        assert attempt(client).status_code == 401
+        assert attempt(client, "ACCOUNT").status_code == 429
+
+    def test_ip_limit_spans_usernames(self, client, monkeypatch):
+        """Test one address cycling through usernames hits the per-IP limit."""
+        monkeypatch.setattr(settings, "LOGIN_IP_BURST", 3)
+        statuses = [attempt(client, f"user{i}").status_code for i in range(4)]
+        assert statuses == [401, 401, 401, 429]
+
+    def test_disabled(self, client, account, monkeypatch):
+        """Test LOGIN_THROTTLE_ENABLED=false lets every attempt through."""
+        monkeypatch.setattr(settings, "LOGIN_THROTTLE_ENABLED", False)
+        monkeypatch.setattr(settings, "LOGIN_USERNAME_BURST", 1)
+        assert [attempt(client).status_code for _ in range(3)] == [401] * 3
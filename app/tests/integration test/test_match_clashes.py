@@ -0,0 +1,181 @@
+﻿"""
+Integration tests for venue and team double-booking checks.
+"""
+
+from datetime import datetime, timedelta
+
+from app.database.models import Match
+
+KICK_OFF = (datetime.now() + timedelta(days=60)).replace(microsecond=0)
+
+
+def match_body(team_a_id, team_b_id, match_date, venue):
+    return {
+        "team_a_id": team_a_id,
+        "team_b_id": team_b_id,
+        "match_date": match_date.isoformat(),
+        "venue": venue,
+    }
+
+
+class TestMatchClashes:
+    """Test clash checks on match writes and schedule validation."""
+
+    def test_create_rejects_double_booked_venue(self, client, test_db, create_teams):
+        """Test a venue cannot host two matches at once."""
+        a, b, c, d = create_teams(4, home_ground="Shared")
+        first = client.post(
+            "/api/v1/matches/", json=match_body(a, b, KICK_OFF, "North Park")
+        )
+        assert first.status_code == 201
+
+        response = client.post(
+            "/api/v1/matches/",
+            json=match_body(c, d, KICK_OFF + timedelta(hours=1), "North Park"),
+        )
+
+        assert response.status_code == 409
+        (clash,) = response.json()["detail"]["clashes"]
+        assert clash["kind"] == "venue"
+        assert clash["match_id"] == first.json()["id"]
+        assert test_db.query(Match).count() == 1
+
+    def test_create_rejects_team_playing_twice_in_a_day(
+        self, client, test_db, create_teams
+    ):
+        """Test a team cannot play two matches inside the team window."""
+        a, b, c, _ = create_teams(4, home_ground="Shared")
+        client.post("/api/v1/matches/", json=match_body(a, b, KICK_OFF, "North Park"))
+
+        response = client.post(
+            "/api/v1/matches/",
+            json=match_body(c, a, KICK_OFF + timedelta(hours=6), "South Park"),
+        )
+        assert response.status_code == 409
+        assert response.json()["detail"]["clashes"][0]["team_id"] == a
+
+        response = client.post(
+            "/api/v1/matches/",
+            json=match_body(c, a, KICK_OFF + timedelta(days=1), "South Park"),
+        )
+        assert response.status_code == 201
+
+    def test_update_rejects_move_to_booked_venue(self, client, test_db, create_teams):
+        """Test changing a match's venue is checked against that venue."""
+        a, b, c, d = create_teams(4, home_ground="Shared")
+        client.post("/api/v1/matches/", json=match_body(a, b, KICK_OFF, "North Park"))
+        other = client.post(
+            "/api/v1/matches/", json=match_body(c, d, KICK_OFF, "South Park")
+        ).json()
+
+        response = client.put(
+            f"/api/v1/matches/{other['id']}", json={"venue": "North Park"}
+        )
+        assert response.status_code == 409
+
+        response = client.put(f"/api/v1/matches/{other['id']}", json={"venue": "East"})
+        assert response.status_code == 200
+
+    def test_update_rejects_move_to_booked_kick_off(
+        self, client, test_db, create_teams
+    ):
+        """Test moving a match's kick-off is checked for venue and team clashes."""
+        a, b, c = create_teams(3, home_ground="Shared")
+        client.post("/api/v1/matches/", json=match_body(a, b, KICK_OFF, "North Park"))
+        later = KICK_OFF + timedelta(days=3)
+        other = client.post(
+            "/api/v1/matches/", json=match_body(a, c, later, "North Park")
+        ).json()
+
+        response = client.put(
+            f"/api/v1/matches/{other['id']}",
+            json={"match_date": KICK_OFF.isoformat()},
+        )
+        assert response.status_code == 409
+        clashes = response.json()["detail"]["clashes"]
+        assert {clash["kind"] for clash in clashes} == {"venue", "team"}
+
+        response = client.put(
+            f"/api/v1/matches/{other['id']}",
+            json={
+                "match_date": (KICK_OFF + timedelta(hours=6)).isoformat(),
+                "venue": "South Park",
+            },
+        )
+        assert response.status_code == 409
+        (clash,) = response.json()["detail"]["clashes"]
+        assert clash["team_id"] == a
+
+        # The match does not clash with its own booking
+        response = client.put(
+            f"/api/v1/matches/{other['id']}",
+            json={"match_date": (later + timedelta(hours=1)).isoformat()},
+        )
+        assert response.status_code == 200
+
+    def test_validate_schedule(self, client, test_db, create_teams):
+        """Test a whole schedule is checked without writing anything."""
+        a, b, c, d = create_teams(4, home_ground="Shared")
+        client.post("/api/v1/matches/", json=match_body(a, b, KICK_OFF, "North Park"))
+
+        response = client.post(
+            "/api/v1/matches/validate",
+            json={
+                "matches": [
+                    match_body(c, d, KICK_OFF, "North Park"),
+                    match_body(a, c, KICK_OFF + timedelta(days=7), "South Park"),
+                    match_body(b, d, KICK_OFF + timedelta(days=7), "South Park"),
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["valid"] is False
+        assert {(c["kind"], c["fixture"]) for c in data["clashes"]} == {
+            ("venue", 0),
+            ("venue", 1),
+        }
+        assert test_db.query(Match).count() == 1
+
+    def test_offset_kick_offs(self, client, test_db, create_teams):
+        """Test "Z"-suffixed dates are checked against naive bookings."""
+        a, b, c, d = create_teams(4, home_ground="Shared")
+        client.post("/api/v1/matches/", json=match_body(a, b, KICK_OFF, "North Park"))
+        utc = KICK_OFF.isoformat() + "Z"
+
+        response = client.post(
+            "/api/v1/matches/",
+            json={**match_body(c, d, KICK_OFF, "North Park"), "match_date": utc},
+        )
+        assert response.status_code == 409
+
+        response = client.post(
+            "/api/v1/matches/validate",
+            json={
+                "matches": [
+                    {**match_body(c, d, KICK_OFF, "North Park"), "match_date": utc},
+                    match_body(a, c, KICK_OFF + timedelta(days=7), "South Park"),
+                ]
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["valid"] is False
+
+        body = {"team_ids": [c, d], "start_date": utc}
+        response = client.post("/api/v1/matches/fixtures", json=body)
+        assert response.status_code == 201
+        assert response.json()["first_match_date"] == KICK_OFF.isoformat()
+
+    def test_generated_season_clashes_with_booked_matches(
+        self, client, test_db, create_teams
+    ):
+        """Test a season is not generated twice over the same dates."""
+        team_ids = create_teams(2, home_ground="Shared")
+        body = {"team_ids": team_ids, "start_date": KICK_OFF.isoformat()}
+
+        assert client.post("/api/v1/matches/fixtures", json=body).status_code == 201
+        response = client.post("/api/v1/matches/fixtures", json=body)
+
+        assert response.status_code == 409
+        assert test_db.query(Match).count() == 2
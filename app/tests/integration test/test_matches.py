@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from app.database.models import Match, Team
+from app.database.models import Match, Team, Venue
 
 
 class TestMatchEndpoints:
@@ -531,3 +531,148 @@ class TestMatchEndpoints:
                     match["match_date"].replace("Z", "+00:00")
                 )
                 assert match_date > datetime.now()
+
+
+class TestNestedMatchEndpoints:
+    """Test nested match responses."""
+
+    def test_get_matches_nested(self, client, test_db, statement_counter):
+        """Test nested matches embed both teams using constant queries."""
+        teams = [
+            Team(name=f"Team {i}", coach_name="Coach", founded_year=2000)
+            for i in range(20)
+        ]
+        test_db.add_all(teams)
+        test_db.commit()
+        test_db.add_all(
+            [
+                Match(
+                    team_a_id=teams[i].id,
+                    team_b_id=teams[(i + 1) % 20].id,
+                    match_date=datetime.now() + timedelta(days=i),
+                    venue="Stadium",
+                )
+                for i in range(20)
+            ]
+        )
+        test_db.commit()
+        statement_counter.clear()
+
+        response = client.get("/api/v1/matches/nested")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data) == 20
+        assert data[0]["team_a"]["name"] == "Team 0"
+        assert data[0]["team_b"]["name"] == "Team 1"
+        selects = [s for s in statement_counter if s.lstrip().startswith("SELECT")]
+        # matches, then one IN query per side
+        assert len(selects) == 3
+
+    def test_nested_matches_with_deleted_team(self, client, test_db):
+        """Test a match whose team was deleted embeds null for that side."""
+        teams = [
+            Team(name=f"Team {i}", coach_name="Coach", founded_year=2000)
+            for i in range(2)
+        ]
+        test_db.add_all(teams)
+        test_db.commit()
+        test_db.add(
+            Match(
+                team_a_id=teams[0].id,
+                team_b_id=teams[1].id,
+                match_date=datetime.now() + timedelta(days=1),
+                venue="Stadium",
+            )
+        )
+        test_db.commit()
+
+        response = client.delete(f"/api/v1/teams/{teams[1].id}")
+        assert response.status_code == 204
+        response = client.get("/api/v1/matches/nested")
+
+        assert response.status_code == 200
+        (match,) = response.json()
+        assert match["team_a"]["name"] == "Team 0"
+        assert match["team_b"] is None
+
+
+class TestExpandMatches:
+    """Test embedding related rows with ?expand=."""
+
+    @pytest.fixture
+    def fixtures(self, test_db):
+        """Create 20 matches between 20 teams, half at a known venue."""
+        teams = [
+            Team(name=f"Team {i}", coach_name="Coach", founded_year=2000)
+            for i in range(20)
+        ]
+        test_db.add_all(teams)
+        test_db.add(
+            Venue(name="Arena", city="Leeds", country="England", capacity=30000)
+        )
+        test_db.commit()
+        test_db.add_all(
+            [
+                Match(
+                    team_a_id=teams[i].id,
+                    team_b_id=teams[(i + 1) % 20].id,
+                    match_date=datetime.now() + timedelta(days=i + 1),
+                    venue="Arena" if i % 2 == 0 else "Park",
+                )
+                for i in range(20)
+            ]
+        )
+        test_db.commit()
+        return teams
+
+    def test_expand_teams_and_venue(self, client, fixtures, statement_counter):
+        """Test teams and venue are embedded with one query per relation."""
+        statement_counter.clear()
+        response = client.get("/api/v1/matches/?expand=teams,venue")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data) == 20
+        assert data[0]["team_a"] == {"id": fixtures[0].id, "name": "Team 0"}
+        assert data[0]["team_b"] == {"id": fixtures[1].id, "name": "Team 1"}
+        assert data[0]["venue_details"]["city"] == "Leeds"
+        assert data[1]["venue_details"] is None
+        selects = [s for s in statement_counter if s.lstrip().startswith("SELECT")]
+        # matches, teams IN query, venues IN query
+        assert len(selects) == 3
+
+    def test_without_expand_unchanged(self, client, fixtures):
+        """Test responses carry no embedded fields unless asked for."""
+        match = client.get("/api/v1/matches/").json()[0]
+        assert "team_a" not in match
+        assert "venue_details" not in match
+
+    def test_expand_with_fields(self, client, fixtures):
+        """Test expansion works alongside a sparse fieldset."""
+        response = client.get("/api/v1/matches/?fields=id&expand=teams&limit=1")
+        assert response.status_code == 200
+        match = response.json()[0]
+        assert set(match) == {"id", "team_a", "team_b"}
+        assert match["team_a"]["name"] == "Team 0"
+
+    def test_expand_detail(self, client, fixtures):
+        """Test the detail endpoint embeds the venue."""
+        match_id = client.get("/api/v1/matches/?limit=1").json()[0]["id"]
+        response = client.get(f"/api/v1/matches/{match_id}?expand=venue")
+        assert response.json()["venue_details"]["name"] == "Arena"
+        assert "team_a" not in response.json()
+
+    def test_expand_cached_upcoming(self, client, fixtures):
+        """Test cached upcoming fixtures can be expanded too."""
+        response = client.get("/api/v1/matches/upcoming?expand=teams&limit=2")
+        assert [match["team_a"]["name"] for match in response.json()] == [
+            "Team 0",
+            "Team 1",
+        ]
+
+    def test_unknown_relation_rejected(self, client):
+        """Test relations outside the whitelist return 400."""
+        response = client.get("/api/v1/matches/?expand=referee")
+        assert response.status_code == 400
+        assert "referee" in response.json()["detail"]
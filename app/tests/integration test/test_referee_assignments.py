@@ -0,0 +1,138 @@
+﻿"""
+Integration tests for automatic referee assignment.
+"""
+
+from datetime import datetime, timedelta
+
+from app.database.models import Match, Referee
+
+# A Saturday far enough ahead to be in the future
+SATURDAY = datetime(2031, 3, 1, 15, 0)
+
+
+def create_referee(test_db, name, experience_years=10, nationality="Wales", level=None):
+    referee = Referee(
+        name=name,
+        experience_years=experience_years,
+        nationality=nationality,
+        qualification_level=level,
+    )
+    test_db.add(referee)
+    test_db.commit()
+    return referee.id
+
+
+def create_match(test_db, team_a_id, team_b_id, match_date, referee_id=None):
+    match = Match(
+        team_a_id=team_a_id,
+        team_b_id=team_b_id,
+        match_date=match_date,
+        venue="Arena",
+        referee_id=referee_id,
+    )
+    test_db.add(match)
+    test_db.commit()
+    return match.id
+
+
+def assign(client, **body):
+    response = client.post("/api/v1/referees/assignments", json=body)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    return {row["match_id"]: row["referee_id"] for row in data["assignments"]}, data
+
+
+class TestRefereeAssignment:
+    """Test the POST /api/v1/referees/assignments endpoint."""
+
+    def test_thresholds_and_nationality(self, client, test_db, create_teams):
+        """Test only qualified referees from other countries are chosen."""
+        a, b, c, d = create_teams(countries=["England", "Spain", "Italy", "France"])
+        create_referee(test_db, "Rookie", experience_years=1, level="international")
+        create_referee(test_db, "Regional", level="regional")
+        local = create_referee(
+            test_db, "Local", nationality="England", level="national"
+        )
+        senior = create_referee(test_db, "Senior", level="National")
+        english_match = create_match(test_db, a, b, SATURDAY)
+        other_match = create_match(test_db, c, d, SATURDAY)
+
+        assignments, data = assign(
+            client, min_experience_years=5, min_qualification_level="national"
+        )
+
+        assert assignments == {english_match: senior, other_match: local}
+        assert data["unassigned_match_ids"] == []
+        assigned = test_db.query(Match).filter(Match.referee_id.isnot(None))
+        assert {m.id: m.referee_id for m in assigned} == assignments
+
+    def test_rest_days_and_weekly_cap(self, client, test_db, create_teams):
+        """Test referees rest between matches and respect the weekly cap."""
+        a, b, c, d = create_teams(countries=["England", "Spain", "Italy", "France"])
+        referee = create_referee(test_db, "Only")
+        create_match(test_db, a, b, SATURDAY, referee_id=referee)
+        sunday = create_match(test_db, c, d, SATURDAY + timedelta(days=1))
+        tuesday = create_match(test_db, c, d, SATURDAY + timedelta(days=3))
+
+        # Sunday follows Saturday's match without a full day off
+        assignments, data = assign(client, min_rest_days=1, dry_run=True)
+        assert assignments == {tuesday: referee}
+        assert data["unassigned_match_ids"] == [sunday]
+
+        # Saturday already fills the week's single slot; Tuesday is a new week
+        assignments, _ = assign(
+            client, min_rest_days=0, max_matches_per_week=1, dry_run=True
+        )
+        assert assignments == {tuesday: referee}
+
+        assignments, _ = assign(
+            client, min_rest_days=0, max_matches_per_week=2, dry_run=True
+        )
+        assert assignments == {sunday: referee, tuesday: referee}
+        # Dry runs write nothing
+        assert test_db.query(Match).filter(Match.referee_id.isnot(None)).count() == 1
+
+    def test_balances_load_and_skips_assigned(self, client, test_db, create_teams):
+        """Test work is spread across referees and assigned matches are kept."""
+        a, b, c, d = create_teams(countries=["England", "Spain", "Italy", "France"])
+        referees = [create_referee(test_db, f"Ref {i}") for i in range(3)]
+        create_match(
+            test_db, c, d, SATURDAY + timedelta(days=3), referee_id=referees[0]
+        )
+        for week in range(6):
+            create_match(test_db, a, b, SATURDAY + timedelta(weeks=week))
+
+        assignments, _ = assign(client)
+
+        assert len(assignments) == 6
+        totals = [
+            list(assignments.values()).count(referee) + (referee == referees[0])
+            for referee in referees
+        ]
+        assert max(totals) - min(totals) <= 1
+        # Everything is staffed now, so a second run has nothing to do
+        assert assign(client)[1]["assigned"] == 0
+
+    def test_deleting_referee_releases_cached_fixtures(
+        self, client, test_db, create_teams
+    ):
+        """Test a deleted referee's fixtures are released in cached reads too."""
+        a, b = create_teams(countries=["England", "Spain"])
+        referee = create_referee(test_db, "Leaving")
+        match_id = create_match(test_db, a, b, SATURDAY, referee_id=referee)
+        upcoming = client.get("/api/v1/matches/upcoming").json()
+        assert [m["referee_id"] for m in upcoming if m["id"] == match_id] == [referee]
+
+        assert client.delete(f"/api/v1/referees/{referee}").status_code == 204
+        upcoming = client.get("/api/v1/matches/upcoming").json()
+        assert [m["referee_id"] for m in upcoming if m["id"] == match_id] == [None]
+        assert client.delete(f"/api/v1/referees/{referee}").status_code == 404
+
+    def test_unknown_qualification_level(self, client, test_db):
+        """Test an unknown level is rejected instead of matching nobody."""
+        response = client.post(
+            "/api/v1/referees/assignments",
+            json={"min_qualification_level": "galactic"},
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,127 @@
+﻿"""
+Integration tests for refresh tokens and the expiry sweep.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database.models import RefreshToken, TokenRevocation
+from app.services import token_service
+
+
+def refresh(client, token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+class TestRefreshTokens:
+    """Test renewing access tokens without the password."""
+
+    def test_refresh_issues_new_pair(self, client, login, account):
+        """Test a refresh token yields a working access token and a new one."""
+        tokens = login()
+        response = refresh(client, tokens["refresh_token"])
+        assert response.status_code == 200
+        renewed = response.json()
+        assert renewed["refresh_token"] != tokens["refresh_token"]
+
+        headers = {"Authorization": f"Bearer {renewed['access_token']}"}
+        me = client.get("/api/v1/users/me", headers=headers)
+        assert me.json()["username"] == "account"
+
+    def test_renewal_is_one_indexed_lookup(
+        self, client, login, account, statement_counter, monkeypatch
+    ):
+        """Test renewing reads one row by token hash and never hashes a password."""
+        tokens = login()
+        monkeypatch.setattr(
+            "app.core.passwords.check_password",
+            lambda *args: pytest.fail("password verified on refresh"),
+        )
+        statement_counter.clear()
+        assert refresh(client, tokens["refresh_token"]).status_code == 200
+
+        selects = [s for s in statement_counter if s.lstrip().startswith("SELECT")]
+        assert len(selects) == 1
+        assert "refresh_tokens.token_hash = ?" in selects[0]
+
+    def test_reused_token_revokes_family(self, client, login, account):
+        """Test presenting a rotated token again revokes its successors."""
+        first = login()["refresh_token"]
+        second = refresh(client, first).json()["refresh_token"]
+
+        assert refresh(client, first).status_code == 401
+        assert refresh(client, second).status_code == 401
+
+    def test_logout_revokes(self, client, login, account):
+        """Test logging out makes the refresh token unusable."""
+        token = login()["refresh_token"]
+        response = client.post("/api/v1/auth/logout", json={"refresh_token": token})
+        assert response.status_code == 204
+        assert refresh(client, token).status_code == 401
+
+    def test_password_change_invalidates(self, client, login, account):
+        """Test refresh tokens issued before a password change stop working."""
+        token = login()["refresh_token"]
+        client.put(f"/api/v1/users/{account}", json={"password": "newpassword"})
+        assert refresh(client, token).status_code == 401
+
+    def test_deleted_user_cannot_refresh_as_next_account(
+        self, client, login, test_db, account
+    ):
+        """Test a deleted user's tokens go with them and their id is not reused."""
+        token = login()["refresh_token"]
+        assert client.delete(f"/api/v1/users/{account}").status_code == 204
+        assert test_db.query(RefreshToken).count() == 0
+
+        response = client.post(
+            "/api/v1/users/",
+            json={
+                "username": "newcomer",
+                "email": "newcomer@example.com",
+                "password": "password123",
+            },
+        )
+        assert response.status_code == 201
+        assert response.json()["id"] != account
+        assert refresh(client, token).status_code == 401
+
+    def test_expired_token_rejected(self, client, login, test_db, account):
+        """Test an expired refresh token is refused."""
+        token = login()["refresh_token"]
+        test_db.query(RefreshToken).update(
+            {RefreshToken.expires_at: datetime.utcnow() - timedelta(seconds=1)}
+        )
+        test_db.commit()
+        assert refresh(client, token).status_code == 401
+
+    def test_unknown_token_rejected(self, client):
+        """Test a made-up refresh token is refused."""
+        assert refresh(client, "not-a-token").status_code == 401
+
+
+class TestTokenSweep:
+    """Test batched deletion of expired rows."""
+
+    def test_sweep_deletes_only_expired_rows(self, test_db, account):
+        """Test expired tokens and stale revocations go, live ones stay."""
+        now = datetime.utcnow()
+        for _ in range(5):
+            token_service.issue_refresh_token(test_db, account, 0)
+        live = token_service.issue_refresh_token(test_db, account, 0)
+        live_hash = token_service.hash_refresh_token(live)
+        test_db.query(RefreshToken).filter(RefreshToken.token_hash != live_hash).update(
+            {RefreshToken.expires_at: now - timedelta(days=1)}
+        )
+        test_db.add_all(
+            [
+                TokenRevocation(user_id=account, created_at=now - timedelta(days=1)),
+                TokenRevocation(user_id=account, created_at=now),
+            ]
+        )
+        test_db.commit()
+
+        report = token_service.sweep_expired_tokens(test_db, batch_size=2, now=now)
+        assert report == {"refresh_tokens": 5, "token_revocations": 1}
+        assert [row.token_hash for row in test_db.query(RefreshToken)] == [live_hash]
+        assert test_db.query(TokenRevocation).count() == 1
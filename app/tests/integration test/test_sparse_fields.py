@@ -0,0 +1,84 @@
+﻿"""
+Integration tests for sparse fieldsets (?fields=).
+"""
+
+import pytest
+
+from app.database.models import Player, Team
+
+
+@pytest.fixture
+def squad(test_db):
+    """Create a team with two players."""
+    team = Team(name="Sparse FC", coach_name="Coach", founded_year=1990)
+    test_db.add(team)
+    test_db.commit()
+    test_db.add_all(
+        [
+            Player(team_id=team.id, name="Keeper", position="Goalkeeper", age=30),
+            Player(team_id=team.id, name="Striker", position="Forward", age=22),
+        ]
+    )
+    test_db.commit()
+    return team.id
+
+
+class TestSparseFields:
+    """Test narrowing payloads and SELECT lists."""
+
+    def test_list_payload_narrowed(self, client, squad):
+        """Test only the requested fields are returned, in schema order."""
+        response = client.get("/api/v1/players/?fields=name,id")
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": 1, "name": "Keeper"},
+            {"id": 2, "name": "Striker"},
+        ]
+
+    def test_select_list_narrowed(self, client, squad, statement_counter):
+        """Test unrequested columns are left out of the SQL."""
+        statement_counter.clear()
+        response = client.get("/api/v1/players/?fields=id,name")
+        assert response.status_code == 200
+
+        select = next(s for s in statement_counter if "FROM players" in s)
+        assert "players.name" in select
+        assert "players.position" not in select
+        assert "players.created_at" not in select
+
+    def test_detail_payload_narrowed(self, client, squad):
+        """Test detail endpoints honour fields too."""
+        response = client.get(f"/api/v1/teams/{squad}?fields=id,name")
+        assert response.status_code == 200
+        assert response.json() == {"id": squad, "name": "Sparse FC"}
+
+    def test_cached_list_narrowed(self, client, squad):
+        """Test cached lists are narrowed without disturbing full reads."""
+        narrow = client.get("/api/v1/teams/?fields=name").json()
+        full = client.get("/api/v1/teams/").json()
+        assert narrow == [{"name": "Sparse FC"}]
+        assert full[0]["coach_name"] == "Coach"
+
+    def test_without_fields_returns_everything(self, client, squad):
+        """Test omitting fields keeps the full response."""
+        response = client.get(f"/api/v1/players/team/{squad}")
+        assert set(response.json()[0]) == {
+            "id",
+            "team_id",
+            "name",
+            "position",
+            "age",
+            "created_at",
+            "updated_at",
+        }
+
+    def test_unknown_field_rejected(self, client, squad):
+        """Test fields outside the whitelist return 400."""
+        response = client.get("/api/v1/players/?fields=id,salary")
+        assert response.status_code == 400
+        assert "salary" in response.json()["detail"]
+
+    def test_empty_fields_rejected(self, client):
+        """Test an empty fields list returns 400."""
+        response = client.get("/api/v1/matches/?fields=")
+        assert response.status_code == 400
@@ -0,0 +1,218 @@
+﻿"""
+Integration tests for the materialized standings table.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database.models import Match, Team, TeamSeasonStats
+from app.services import standings_service
+
+
+@pytest.fixture
+def teams(test_db):
+    """Create two teams."""
+    home = Team(name="Home FC", coach_name="Coach", founded_year=1990)
+    away = Team(name="Away FC", coach_name="Coach", founded_year=1995)
+    test_db.add_all([home, away])
+    test_db.commit()
+    return home.id, away.id
+
+
+def create_match(client, home_id, away_id, match_date, score_a=0, score_b=0):
+    response = client.post(
+        "/api/v1/matches/",
+        json={
+            "team_a_id": home_id,
+            "team_b_id": away_id,
+            "match_date": match_date.isoformat(),
+            "venue": "Stadium",
+            "score_team_a": score_a,
+            "score_team_b": score_b,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def standings(client, season=2024):
+    response = client.get(f"/api/v1/standings/?season={season}")
+    assert response.status_code == 200
+    return {row["team_id"]: row for row in response.json()["table"]}
+
+
+class TestStandingsMaintenance:
+    """Match writes keep the summary table in step."""
+
+    def test_create_result_updates_standings(self, client, teams):
+        """Test a recorded result adds to both teams' rows."""
+        home_id, away_id = teams
+        create_match(client, home_id, away_id, datetime(2024, 9, 1), 3, 1)
+
+        table = standings(client)
+        assert table[home_id]["played"] == 1
+        assert table[home_id]["won"] == 1
+        assert table[home_id]["points"] == 3
+        assert table[home_id]["goal_difference"] == 2
+        assert table[away_id]["lost"] == 1
+        assert table[away_id]["goals_against"] == 3
+
+    def test_future_fixture_not_counted(self, client, teams):
+        """Test fixtures do not count until their result is recorded."""
+        home_id, away_id = teams
+        fixture_date = datetime.now() + timedelta(days=7)
+        create_match(client, home_id, away_id, fixture_date)
+
+        season = standings_service.season_for(fixture_date)
+        assert standings(client, season) == {}
+
+    def test_offset_match_dates(self, client, teams):
+        """Test "Z"-suffixed kick-offs are stored as naive UTC and compared."""
+        home_id, away_id = teams
+        response = client.post(
+            "/api/v1/matches/",
+            json={
+                "team_a_id": home_id,
+                "team_b_id": away_id,
+                "match_date": "2024-09-01T15:00:00+02:00",
+                "venue": "Stadium",
+                "score_team_a": 2,
+                "score_team_b": 0,
+            },
+        )
+        assert response.status_code == 201
+        assert response.json()["match_date"] == "2024-09-01T13:00:00"
+        assert standings(client)[home_id]["won"] == 1
+
+        response = client.post(
+            "/api/v1/matches/",
+            json={
+                "team_a_id": away_id,
+                "team_b_id": home_id,
+                "match_date": "2030-01-01T15:00:00Z",
+                "venue": "Stadium",
+            },
+        )
+        assert response.status_code == 201
+        assert standings(client)[home_id]["played"] == 1
+
+    def test_update_replaces_previous_result(self, client, teams):
+        """Test editing a score swaps the old result for the new one."""
+        home_id, away_id = teams
+        match_id = create_match(client, home_id, away_id, datetime(2024, 9, 1), 0, 2)
+
+        response = client.put(
+            f"/api/v1/matches/{match_id}",
+            json={"score_team_a": 2, "score_team_b": 2},
+        )
+        assert response.status_code == 200
+
+        table = standings(client)
+        assert table[home_id]["played"] == 1
+        assert table[home_id]["drawn"] == 1
+        assert table[home_id]["lost"] == 0
+        assert table[away_id]["points"] == 1
+
+    def test_delete_removes_result(self, client, teams):
+        """Test deleting a match removes its contribution."""
+        home_id, away_id = teams
+        match_id = create_match(client, home_id, away_id, datetime(2024, 9, 1), 1, 0)
+
+        response = client.delete(f"/api/v1/matches/{match_id}")
+        assert response.status_code == 204
+
+        table = standings(client)
+        assert table[home_id]["played"] == 0
+        assert table[away_id]["points"] == 0
+
+    def test_standings_ordering(self, client, teams, test_db):
+        """Test the table is ordered by points then goal difference."""
+        home_id, away_id = teams
+        create_match(client, home_id, away_id, datetime(2024, 9, 1), 0, 1)
+
+        response = client.get("/api/v1/standings/?season=2024")
+        rows = response.json()["table"]
+        assert [row["team_id"] for row in rows] == [away_id, home_id]
+
+    def test_team_standing_lookup(self, client, teams):
+        """Test a single team's record, including teams with no results."""
+        home_id, away_id = teams
+        create_match(client, home_id, away_id, datetime(2024, 9, 1), 2, 0)
+
+        response = client.get(f"/api/v1/standings/team/{home_id}?season=2024")
+        assert response.status_code == 200
+        assert response.json()["points"] == 3
+
+        response = client.get(f"/api/v1/standings/team/{home_id}?season=2020")
+        assert response.json()["played"] == 0
+
+
+class TestStandingsVerification:
+    """The verify-and-rebuild command detects and repairs drift."""
+
+    def test_verify_and_rebuild(self, client, teams, test_db):
+        """Test drift introduced outside the write paths is found and fixed."""
+        home_id, away_id = teams
+        create_match(client, home_id, away_id, datetime(2024, 9, 1), 1, 1)
+        assert standings_service.verify_stats(test_db) == []
+
+        # A result inserted behind the API's back
+        test_db.add(
+            Match(
+                team_a_id=home_id,
+                team_b_id=away_id,
+                match_date=datetime(2024, 10, 1),
+                venue="Stadium",
+                score_team_a=4,
+                score_team_b=0,
+                result_recorded=True,
+            )
+        )
+        test_db.commit()
+
+        drift = standings_service.verify_stats(test_db)
+        assert {entry["team_id"] for entry in drift} == {home_id, away_id}
+
+        assert standings_service.rebuild_stats(test_db) == 2
+        assert standings_service.verify_stats(test_db) == []
+        stats = (
+            test_db.query(TeamSeasonStats)
+            .filter(TeamSeasonStats.team_id == home_id)
+            .one()
+        )
+        assert stats.played == 2
+        assert stats.points == 4
+
+    def test_other_writes_do_not_change_counted_results(self, client, teams, test_db):
+        """Test only recorded results count, however often the row is written."""
+        home_id, away_id = teams
+        fixture_date = datetime.utcnow() + timedelta(days=7)
+        match_id = create_match(client, home_id, away_id, fixture_date)
+
+        # Kick-off passes without a result, then the row is written elsewhere
+        kicked_off = datetime.utcnow() - timedelta(hours=1)
+        test_db.query(Match).filter(Match.id == match_id).update(
+            {Match.match_date: kicked_off}
+        )
+        test_db.commit()
+        test_db.query(Match).filter(Match.id == match_id).update(
+            {Match.referee_id: None}
+        )
+        test_db.commit()
+
+        assert standings_service.verify_stats(test_db) == []
+        season = standings_service.season_for(kicked_off)
+        assert standings(client, season) == {}
+
+        response = client.put(
+            f"/api/v1/matches/{match_id}", json={"score_team_a": 1, "score_team_b": 0}
+        )
+        assert response.status_code == 200
+        assert standings(client, season)[home_id]["won"] == 1
+        assert standings_service.verify_stats(test_db) == []
+
+    def test_season_boundaries(self):
+        """Test seasons are named by the year they start in."""
+        assert standings_service.season_for(datetime(2024, 8, 1)) == 2024
+        assert standings_service.season_for(datetime(2025, 5, 31)) == 2024
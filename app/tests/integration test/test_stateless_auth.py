@@ -0,0 +1,90 @@
+﻿"""
+Integration tests for stateless authentication and token revocation.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.revocation import get_revocations
+from app.core.security import get_current_principal
+from app.database.models import TokenRevocation
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+
+
+def me(client, token):
+    return client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+
+
+class TestStatelessAuth:
+    """Test authenticating from token claims alone."""
+
+    def test_principal_without_user_query(
+        self, client, login, test_db, account, stateless, statement_counter
+    ):
+        """Test a stateless principal is resolved without touching users."""
+        token = login()["access_token"]
+        get_current_principal(token, test_db)
+
+        statement_counter.clear()
+        principal = get_current_principal(token, test_db)
+        assert (principal.id, principal.username) == (account, "account")
+        assert statement_counter == []
+
+    def test_me_loads_profile_by_id(
+        self, client, login, account, stateless, statement_counter
+    ):
+        """Test /users/me only reads the profile row, by primary key."""
+        token = login()["access_token"]
+        me(client, token)
+
+        statement_counter.clear()
+        response = me(client, token)
+        assert response.status_code == 200
+        assert response.json()["username"] == "account"
+        assert len(statement_counter) == 1
+        assert "users.id = ?" in statement_counter[0]
+
+    def test_password_change_revokes_tokens(self, client, login, account, stateless):
+        """Test tokens issued before a password change are rejected."""
+        old_token = login()["access_token"]
+        response = client.put(
+            f"/api/v1/users/{account}", json={"password": "newpassword"}
+        )
+        assert response.status_code == 200
+
+        assert me(client, old_token).status_code == 401
+        assert (
+            me(client, login(password="newpassword")["access_token"]).status_code == 200
+        )
+
+    def test_deleted_user_revoked(self, client, login, account, stateless):
+        """Test a deleted user's tokens are rejected."""
+        token = login()["access_token"]
+        assert client.delete(f"/api/v1/users/{account}").status_code == 204
+        assert me(client, token).status_code == 401
+
+    def test_revocation_from_another_process(
+        self, client, login, test_db, account, stateless, monkeypatch
+    ):
+        """Test revocations written elsewhere apply after the refresh interval."""
+        token = login()["access_token"]
+        assert me(client, token).status_code == 200
+
+        test_db.add(TokenRevocation(user_id=account, min_token_version=None))
+        test_db.commit()
+        assert me(client, token).status_code == 200
+
+        monkeypatch.setattr(get_revocations(), "refresh_seconds", 0)
+        assert me(client, token).status_code == 401
+
+    def test_password_change_revokes_tokens_without_stateless(
+        self, client, login, account
+    ):
+        """Test the database path also rejects tokens from before a change."""
+        old_token = login()["access_token"]
+        client.put(f"/api/v1/users/{account}", json={"password": "newpassword"})
+        assert me(client, old_token).status_code == 401
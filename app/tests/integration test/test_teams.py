@@ -0,0 +1,169 @@
+﻿"""
+Integration tests for team endpoints.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database.models import Coach, Manager, Match, Player, Team
+from app.services import standings_service
+
+
+@pytest.fixture
+def club(test_db):
+    """Create a team with a squad, staff and a mix of past and future matches."""
+    team = Team(name="Home FC", coach_name="Coach", founded_year=1990)
+    rival = Team(name="Rival FC", coach_name="Coach", founded_year=1995)
+    test_db.add_all([team, rival])
+    test_db.commit()
+
+    test_db.add_all(
+        [
+            Player(team_id=team.id, name="Keeper", position="Goalkeeper", age=30),
+            Player(team_id=team.id, name="Striker", position="Forward", age=22),
+            Player(team_id=rival.id, name="Other", position="Forward", age=24),
+            Coach(team_id=team.id, name="Assistant", experience_years=8),
+        ]
+    )
+    matches = [
+        Match(
+            team_a_id=team.id,
+            team_b_id=rival.id,
+            match_date=datetime(2024, 9, 1, 15, 0),
+            venue="Home Ground",
+            score_team_a=2,
+            score_team_b=0,
+        ),
+        Match(
+            team_a_id=rival.id,
+            team_b_id=team.id,
+            match_date=datetime(2024, 9, 8, 15, 0),
+            venue="Rival Ground",
+            score_team_a=1,
+            score_team_b=1,
+        ),
+        Match(
+            team_a_id=team.id,
+            team_b_id=rival.id,
+            match_date=datetime.utcnow() + timedelta(days=7),
+            venue="Home Ground",
+        ),
+    ]
+    test_db.add_all(matches)
+    for match in matches:
+        standings_service.record_result(test_db, match)
+    test_db.commit()
+    return team
+
+
+class TestTeamDashboard:
+    """Test the composite team dashboard endpoint."""
+
+    def test_dashboard_sections(self, client, club):
+        """Test the dashboard returns team, squad, staff, fixtures and summary."""
+        response = client.get(f"/api/v1/teams/{club.id}/dashboard?season=2024")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["team"]["name"] == "Home FC"
+        assert [p["name"] for p in data["squad"]] == ["Keeper", "Striker"]
+        assert [c["name"] for c in data["staff"]] == ["Assistant"]
+        assert len(data["recent_matches"]) == 2
+        assert data["recent_matches"][0]["venue"] == "Rival Ground"
+        assert len(data["upcoming_matches"]) == 1
+        # The summary is the team's row in the standings
+        standings = client.get(f"/api/v1/standings/team/{club.id}?season=2024")
+        assert (
+            data["summary"] | {"team_id": club.id, "season": 2024} == standings.json()
+        )
+        assert data["summary"] == {
+            "played": 2,
+            "won": 1,
+            "drawn": 1,
+            "lost": 0,
+            "goals_for": 3,
+            "goals_against": 1,
+            "goal_difference": 2,
+            "points": 4,
+        }
+
+    def test_dashboard_limits(self, client, club):
+        """Test recent and upcoming lists honour their limits."""
+        response = client.get(f"/api/v1/teams/{club.id}/dashboard?recent=1&upcoming=0")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["recent_matches"]) == 1
+        assert data["upcoming_matches"] == []
+
+    def test_dashboard_nonexistent_team(self, client):
+        """Test the dashboard for an unknown team returns 404."""
+        response = client.get("/api/v1/teams/999999/dashboard")
+        assert response.status_code == 404
+        assert "Team not found" in response.json()["detail"]
+
+    def test_dashboard_two_round_trips(self, client, club, statement_counter):
+        """Test the dashboard costs two queries however many matches exist."""
+        url = f"/api/v1/teams/{club.id}/dashboard"
+        statement_counter.clear()
+
+        response = client.get(url)
+        assert response.status_code == 200
+
+        selects = [s for s in statement_counter if s.lstrip().startswith("SELECT")]
+        # team with squad, staff and season stats, then the bounded matches
+        assert len(selects) == 2
+        assert "LIMIT" in selects[1]
+
+
+class TestNestedTeams:
+    """Test nested team responses load in a constant number of queries."""
+
+    def _create_teams(self, test_db, prefix, count):
+        teams = [
+            Team(name=f"{prefix} FC {i}", coach_name="Coach", founded_year=1990)
+            for i in range(count)
+        ]
+        test_db.add_all(teams)
+        test_db.flush()
+        for team in teams:
+            test_db.add_all(
+                [
+                    Player(team_id=team.id, name="Player", position="Forward", age=20),
+                    Coach(team_id=team.id, name="Coach", experience_years=5),
+                    Manager(team_id=team.id, name="Manager", strategy="4-4-2"),
+                ]
+            )
+        test_db.commit()
+
+    def _count_selects(self, client, statement_counter):
+        statement_counter.clear()
+        response = client.get("/api/v1/teams/nested?limit=1000")
+        assert response.status_code == 200
+        selects = [s for s in statement_counter if s.lstrip().startswith("SELECT")]
+        return response.json(), len(selects)
+
+    def test_nested_teams_include_collections(self, client, test_db):
+        """Test nested teams embed players, coaches and managers."""
+        self._create_teams(test_db, "Nested", 2)
+        response = client.get("/api/v1/teams/nested")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data) == 2
+        for team in data:
+            assert len(team["players"]) == 1
+            assert team["players"][0]["team_id"] == team["id"]
+            assert len(team["coaches"]) == 1
+            assert team["managers"][0]["strategy"] == "4-4-2"
+
+    def test_nested_teams_constant_queries(self, client, test_db, statement_counter):
+        """Test 100 nested teams cost the same queries as 10."""
+        self._create_teams(test_db, "Small", 10)
+        _, small_count = self._count_selects(client, statement_counter)
+
+        self._create_teams(test_db, "Large", 90)
+        data, large_count = self._count_selects(client, statement_counter)
+        assert len(data) == 100
+        # teams, then one IN query each for players, coaches and managers
+        assert small_count == large_count == 4
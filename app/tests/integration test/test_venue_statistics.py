@@ -0,0 +1,41 @@
+﻿"""
+Integration tests for cached venue statistics.
+"""
+
+from datetime import datetime, timedelta
+
+from app.database.models import Team, Venue
+from app.services.venue_service import get_venue_statistics
+
+
+class TestVenueStatisticsCache:
+    """Test match writes drop cached venue statistics."""
+
+    def test_match_writes_refresh_total_matches(self, client, test_db):
+        """Test creating, moving and deleting a match updates the count."""
+        venue = Venue(name="Stats Park", city="City", country="England", capacity=500)
+        teams = [Team(name=f"Stats Team {i}", founded_year=1990) for i in range(2)]
+        test_db.add_all([venue, *teams])
+        test_db.commit()
+        venue_id, team_ids = venue.id, [team.id for team in teams]
+        assert get_venue_statistics(test_db, venue_id)["total_matches"] == 0
+
+        response = client.post(
+            "/api/v1/matches/",
+            json={
+                "team_a_id": team_ids[0],
+                "team_b_id": team_ids[1],
+                "match_date": (datetime.now() + timedelta(days=3)).isoformat(),
+                "venue": "Stats Park",
+            },
+        )
+        assert response.status_code == 201
+        match_id = response.json()["id"]
+        assert get_venue_statistics(test_db, venue_id)["total_matches"] == 1
+
+        client.put(f"/api/v1/matches/{match_id}", json={"venue": "Elsewhere"})
+        assert get_venue_statistics(test_db, venue_id)["total_matches"] == 0
+
+        client.put(f"/api/v1/matches/{match_id}", json={"venue": "Stats Park"})
+        client.delete(f"/api/v1/matches/{match_id}")
+        assert get_venue_statistics(test_db, venue_id)["total_matches"] == 0
@@ -0,0 +1,130 @@
+﻿"""
+Integration tests for startup cache warm-up.
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.database.models import Team, Venue
+from app.database.session import get_db
+from app.main import app
+from app.services import team_service, warmup_service
+
+
+class TestWarmCaches:
+    """Test the warm-up service."""
+
+    def test_warm_caches_reports_timings(self, test_db):
+        """Test every configured dataset is loaded and timed."""
+        test_db.add(Team(name="Warm FC", coach_name="Coach", founded_year=2000))
+        test_db.add(Venue(name="Warm Park", city="City", country="UK", capacity=10))
+        test_db.commit()
+
+        report = warmup_service.warm_caches(test_db, settings.CACHE_WARMUP_DATASETS)
+
+        assert set(report["datasets"]) == set(settings.CACHE_WARMUP_DATASETS)
+        assert report["errors"] == {}
+        assert report["total_ms"] >= 0
+
+    def test_warmed_dataset_served_without_queries(self, test_db, statement_counter):
+        """Test reads after warm-up are answered from the cache."""
+        test_db.add(Team(name="Warm FC", coach_name="Coach", founded_year=2000))
+        test_db.commit()
+        warmup_service.warm_caches(test_db, ["teams"])
+        statement_counter.clear()
+
+        teams = team_service.list_teams(test_db)
+
+        assert [team["name"] for team in teams] == ["Warm FC"]
+        assert statement_counter == []
+
+    def test_unknown_dataset_reported(self, test_db):
+        """Test unknown dataset names are reported instead of failing."""
+        report = warmup_service.warm_caches(test_db, ["teams", "sponsors"])
+        assert "teams" in report["datasets"]
+        assert report["errors"] == {"sponsors": "unknown dataset"}
+
+
+class TestHealthReadiness:
+    """Test /health reflects warm-up progress."""
+
+    def test_health_not_ready_until_warm(self, client):
+        """Test /health answers 503 while warm-up is still running."""
+        app.state.ready = False
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+        app.state.ready = True
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+
+    def test_failed_warm_up_reported(self, client):
+        """Test /health reports a failed warm-up instead of warming up forever."""
+        app.state.ready = False
+        app.state.warmup_error = "OperationalError"
+        try:
+            response = client.get("/health")
+        finally:
+            app.state.warmup_error = None
+
+        assert response.status_code == 503
+        assert response.json() == {
+            "status": "warmup_failed",
+            "error": "OperationalError",
+        }
+
+    def test_lifespan_records_failed_warm_up(self):
+        """Test a database that cannot be opened fails the warm-up visibly."""
+
+        def broken_get_db():
+            raise OperationalError("SELECT 1", {}, Exception("unable to open database"))
+            yield
+
+        app.dependency_overrides[get_db] = broken_get_db
+        try:
+            with TestClient(app) as test_client:
+                deadline = time.monotonic() + 10
+                response = test_client.get("/health")
+                while (
+                    response.json()["status"] == "warming_up"
+                    and time.monotonic() < deadline
+                ):
+                    time.sleep(0.01)
+                    response = test_client.get("/health")
+
+                assert response.status_code == 503
+                assert response.json() == {
+                    "status": "warmup_failed",
+                    "error": "OperationalError",
+                }
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_lifespan_warms_caches(self, test_db):
+        """Test the lifespan hook warms caches and then reports ready."""
+        test_db.add(Team(name="Startup FC", coach_name="Coach", founded_year=2000))
+        test_db.commit()
+
+        def override_get_db():
+            yield test_db
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            with TestClient(app) as test_client:
+                deadline = time.monotonic() + 10
+                response = test_client.get("/health")
+                while response.status_code == 503 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                    response = test_client.get("/health")
+
+                assert response.status_code == 200
+                warmup = response.json()["warmup"]
+                assert "teams" in warmup["datasets"]
+                assert "standings" in warmup["datasets"]
+        finally:
+            app.dependency_overrides.clear()
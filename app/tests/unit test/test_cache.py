@@ -0,0 +1,183 @@
+﻿"""
+Unit tests for cache backends.
+"""
+
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.core.cache import (
+    InMemoryCache,
+    RedisCache,
+    SQLiteCache,
+    cached,
+    create_cache,
+    invalidate,
+)
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Minimal RESP server understanding the commands RedisCache sends."""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            command = args[0].upper()
+            if command == b"GET":
+                value, expires_at = store.get(args[1], (None, None))
+                if expires_at is not None and expires_at <= time.time():
+                    value = None
+                reply = self._bulk(value)
+            elif command == b"SET":
+                expires_at = None
+                if len(args) == 5 and args[3].upper() == b"EX":
+                    expires_at = time.time() + int(args[4])
+                store[args[1]] = (args[2], expires_at)
+                reply = b"+OK\r\n"
+            elif command == b"DEL":
+                reply = b":%d\r\n" % int(store.pop(args[1], None) is not None)
+            elif command == b"INCR":
+                value = int(store.get(args[1], (b"0", None))[0]) + 1
+                store[args[1]] = (str(value).encode(), None)
+                reply = b":%d\r\n" % value
+            elif command == b"FLUSHDB":
+                store.clear()
+                reply = b"+OK\r\n"
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def fake_redis_url():
+    """Start a fake Redis-protocol server on a free local port."""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield f"redis://{host}:{port}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def cache(request, tmp_path, fake_redis_url):
+    """Yield every cache backend in turn."""
+    if request.param == "memory":
+        return InMemoryCache()
+    if request.param == "sqlite":
+        return SQLiteCache(str(tmp_path / "cache.db"))
+    return RedisCache(fake_redis_url)
+
+
+class TestCacheBackends:
+    """Behaviour shared by all cache backends."""
+
+    def test_set_and_get(self, cache):
+        """Test storing and reading back structured values."""
+        cache.set("standings", [{"team": "Test FC", "points": 3}])
+        assert cache.get("standings") == [{"team": "Test FC", "points": 3}]
+
+    def test_missing_key_returns_none(self, cache):
+        """Test that unknown keys read as None."""
+        assert cache.get("missing") is None
+
+    def test_delete(self, cache):
+        """Test deleting a key."""
+        cache.set("key", "value")
+        cache.delete("key")
+        assert cache.get("key") is None
+
+    def test_ttl_expiry(self, cache):
+        """Test that entries expire after their TTL."""
+        cache.set("short", "value", ttl=1)
+        assert cache.get("short") == "value"
+        time.sleep(1.1)
+        assert cache.get("short") is None
+
+    def test_incr(self, cache):
+        """Test counters start at one and are readable with get."""
+        assert cache.incr("counter") == 1
+        assert cache.incr("counter") == 2
+        assert cache.get("counter") == 2
+
+    def test_clear(self, cache):
+        """Test clearing the whole cache."""
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.clear()
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+
+
+class TestSharedBackends:
+    """Backends meant for multiple workers must share state."""
+
+    def test_sqlite_cache_shared_between_instances(self, tmp_path):
+        """Test two workers opening the same file see each other's writes."""
+        path = str(tmp_path / "shared.db")
+        worker_a = SQLiteCache(path)
+        worker_b = SQLiteCache(path)
+
+        worker_a.set("teams", ["Test FC"])
+        assert worker_b.get("teams") == ["Test FC"]
+
+        worker_b.incr("version")
+        assert worker_a.incr("version") == 2
+
+    def test_redis_cache_shared_between_clients(self, fake_redis_url):
+        """Test two clients of the same server share entries."""
+        client_a = RedisCache(fake_redis_url)
+        client_b = RedisCache(fake_redis_url)
+
+        client_a.set("venues", {"id": 1})
+        assert client_b.get("venues") == {"id": 1}
+
+    def test_create_cache_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            create_cache("memcached")
+
+
+class TestCachedDecorator:
+    """Test the service-layer caching helpers."""
+
+    def test_cached_skips_db_argument_and_invalidates(self):
+        """Test results are reused until the namespace is invalidated."""
+        calls = []
+
+        @cached("unit_test")
+        def compute(db, value):
+            calls.append(value)
+            return value * 2
+
+        assert compute(object(), 21) == 42
+        assert compute(object(), 21) == 42
+        assert calls == [21]
+
+        invalidate("unit_test")
+        assert compute(object(), 21) == 42
+        assert calls == [21, 21]
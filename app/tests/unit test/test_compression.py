@@ -0,0 +1,116 @@
+﻿"""
+Unit tests for the response compression middleware.
+"""
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, parse_accept_encoding
+
+LARGE_BODY = "match " * 1000
+
+
+@pytest.fixture
+def client():
+    """Build a small app behind the middleware."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, gzip_level=6)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/precompressed")
+    def precompressed():
+        return Response(
+            gzip.compress(LARGE_BODY.encode()),
+            media_type="text/plain",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            iter([LARGE_BODY, LARGE_BODY]), media_type="text/plain"
+        )
+
+    return TestClient(app)
+
+
+def get_raw(client, path, accept_encoding):
+    """Fetch a response without letting the client decode it."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+class TestAcceptEncoding:
+    """Test content negotiation."""
+
+    def test_gzip_selected(self):
+        """Test gzip is chosen when it is the only accepted encoding."""
+        assert parse_accept_encoding("gzip, deflate") == "gzip"
+
+    def test_quality_values(self):
+        """Test q=0 disables an encoding."""
+        assert parse_accept_encoding("gzip;q=0, identity") is None
+
+    def test_brotli_preferred_when_installed(self, monkeypatch):
+        """Test br wins over gzip only when Brotli is available."""
+        monkeypatch.setattr(compression, "SUPPORTED_ENCODINGS", ("br", "gzip"))
+        assert parse_accept_encoding("gzip, br") == "br"
+        monkeypatch.setattr(compression, "SUPPORTED_ENCODINGS", ("gzip",))
+        assert parse_accept_encoding("gzip, br") == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Test which responses are compressed."""
+
+    def test_large_response_gzipped(self, client):
+        """Test large bodies are compressed and sized correctly."""
+        response, raw = get_raw(client, "/large", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(raw)
+        assert gzip.decompress(raw).decode() == LARGE_BODY
+
+    def test_small_response_untouched(self, client):
+        """Test bodies below the minimum size are sent as-is."""
+        response, raw = get_raw(client, "/small", "gzip")
+        assert "content-encoding" not in response.headers
+        assert raw == b"ok"
+
+    def test_identity_client_untouched(self, client):
+        """Test clients that accept no supported encoding get plain bodies."""
+        response, raw = get_raw(client, "/large", "identity")
+        assert "content-encoding" not in response.headers
+        assert raw.decode() == LARGE_BODY
+
+    def test_precompressed_not_recompressed(self, client):
+        """Test responses with a Content-Encoding are passed through."""
+        response, raw = get_raw(client, "/precompressed", "gzip")
+        assert gzip.decompress(raw).decode() == LARGE_BODY
+
+    def test_streaming_response_gzipped(self, client):
+        """Test streaming bodies are compressed chunk by chunk."""
+        response, raw = get_raw(client, "/stream", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        assert decoder.decompress(raw).decode() == LARGE_BODY * 2
+
+    def test_brotli(self, client):
+        """Test Brotli is used when installed and accepted."""
+        brotli = pytest.importorskip("brotli")
+        response, raw = get_raw(client, "/large", "br, gzip")
+        assert response.headers["content-encoding"] == "br"
+        assert brotli.decompress(raw).decode() == LARGE_BODY
@@ -0,0 +1,107 @@
+﻿"""
+Unit tests for the in-process event broker.
+"""
+
+import asyncio
+import threading
+
+from app.core.events import EventBroker, event_stream, format_event
+
+
+def collect(broker, topic, last_event_id=None):
+    """Read a stream until the broker closes it."""
+
+    async def run():
+        return [frame async for frame in event_stream(broker, topic, last_event_id, 5)]
+
+    return asyncio.run(run())
+
+
+class TestFormatEvent:
+    """Test SSE framing."""
+
+    def test_frame(self):
+        """Test id, event and data lines end with a blank line."""
+        assert format_event(3, "score", '{"a": 1}') == (
+            b'id: 3\nevent: score\ndata: {"a": 1}\n\n'
+        )
+
+    def test_multiline_data(self):
+        """Test every data line is prefixed."""
+        assert b"data: one\ndata: two\n" in format_event(1, "note", "one\ntwo")
+
+
+class TestEventBroker:
+    """Test publishing, fan-out and replay."""
+
+    def test_replay_after_last_event_id(self):
+        """Test only later events for the topic are replayed."""
+        broker = EventBroker()
+        broker.publish(("match:1", "league"), "score", "a")
+        broker.publish(("match:2", "league"), "score", "b")
+        broker.publish(("match:1", "league"), "score", "c")
+        broker.close()
+
+        frames = collect(broker, "match:1", last_event_id=1)
+        assert frames == [format_event(3, "score", "c")]
+        assert len(collect(broker, "league", last_event_id=0)) == 3
+
+    def test_history_is_bounded(self):
+        """Test only the newest events are kept for replay."""
+        broker = EventBroker(history_size=2)
+        for value in "abc":
+            broker.publish(("league",), "score", value)
+        broker.close()
+        assert [frame.split(b"\n")[0] for frame in collect(broker, "league", 0)] == [
+            b"id: 2",
+            b"id: 3",
+        ]
+
+    def test_fan_out_from_another_thread(self):
+        """Test one publish reaches every subscriber, even from a worker thread."""
+        broker = EventBroker()
+
+        async def run():
+            streams = [event_stream(broker, "match:1", None, 5) for _ in range(50)]
+            reads = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+            await asyncio.sleep(0)
+            assert broker.subscriber_count("match:1") == 50
+
+            thread = threading.Thread(
+                target=broker.publish, args=(("match:1",), "score", "goal")
+            )
+            thread.start()
+            thread.join()
+            frames = await asyncio.gather(*reads)
+            for stream in streams:
+                await stream.aclose()
+            return frames
+
+        frames = asyncio.run(run())
+        assert set(frames) == {format_event(1, "score", "goal")}
+        assert broker.subscriber_count("match:1") == 0
+
+    def test_slow_subscriber_dropped(self):
+        """Test a subscriber whose queue overflows is disconnected."""
+        broker = EventBroker(queue_size=2)
+
+        async def run():
+            subscription = broker.subscribe("league")
+            for value in "abc":
+                broker.publish(("league",), "score", value)
+            await asyncio.sleep(0)
+            return await subscription.get()
+
+        assert asyncio.run(run()) is None
+
+    def test_keepalive(self):
+        """Test idle streams emit keep-alive comments."""
+        broker = EventBroker()
+
+        async def run():
+            stream = event_stream(broker, "league", None, 0.01)
+            frame = await stream.__anext__()
+            await stream.aclose()
+            return frame
+
+        assert asyncio.run(run()) == b": keepalive\n\n"
@@ -0,0 +1,57 @@
+﻿"""
+Unit tests for minimum-cost bipartite matching.
+"""
+
+import random
+
+from app.core.matching import min_cost_matching
+
+
+def best_by_search(edges):
+    """(pairs, cost) of the best matching, by trying every assignment."""
+    lefts = list(edges)
+    best = (0, 0)
+
+    def search(i, used, pairs, cost):
+        nonlocal best
+        if i == len(lefts):
+            if (pairs, -cost) > (best[0], -best[1]):
+                best = (pairs, cost)
+            return
+        search(i + 1, used, pairs, cost)
+        for right, edge_cost in edges[lefts[i]]:
+            if right not in used:
+                search(i + 1, used | {right}, pairs + 1, cost + edge_cost)
+
+    search(0, frozenset(), 0, 0)
+    return best
+
+
+class TestMinCostMatching:
+    """Test pair count and cost optimality."""
+
+    def test_prefers_more_pairs_over_cheaper_ones(self):
+        """Test a cheap edge is given up when it would leave a node unmatched."""
+        edges = {"a": [("x", 0), ("y", 5)], "b": [("x", 1)]}
+
+        assert min_cost_matching(edges) == {"a": "y", "b": "x"}
+
+    def test_nodes_without_edges_stay_unmatched(self):
+        """Test left nodes with no allowed partner are left out."""
+        assert min_cost_matching({"a": [], "b": [("x", 3)]}) == {"b": "x"}
+
+    def test_matches_exhaustive_search(self):
+        """Test random small instances against every possible assignment."""
+        rng = random.Random(7)
+        for _ in range(200):
+            rights = range(rng.randint(1, 6))
+            edges = {
+                left: [(r, rng.randint(0, 9)) for r in rights if rng.random() < 0.6]
+                for left in range(rng.randint(1, 6))
+            }
+
+            matching = min_cost_matching(edges)
+
+            assert len(set(matching.values())) == len(matching)
+            cost = sum(dict(edges[left])[right] for left, right in matching.items())
+            assert (len(matching), cost) == best_by_search(edges)
@@ -0,0 +1,98 @@
+﻿"""
+Unit tests for MessagePack content negotiation.
+"""
+
+import pytest
+
+from app.core import negotiation
+from app.core.negotiation import accepts_msgpack
+from app.database.models import Team
+
+msgpack = pytest.importorskip("msgpack")
+
+MSGPACK = {"Accept": "application/msgpack"}
+
+
+@pytest.fixture
+def team(test_db):
+    """Create a team."""
+    team = Team(name="Packed FC", coach_name="Coach", founded_year=1990)
+    test_db.add(team)
+    test_db.commit()
+    return team
+
+
+class TestAccept:
+    """Test parsing the Accept header."""
+
+    def test_msgpack_preferred(self):
+        """Test msgpack is chosen when listed without a lower weight."""
+        assert accepts_msgpack("application/msgpack")
+        assert accepts_msgpack("application/x-msgpack, application/json")
+
+    def test_json_preferred(self):
+        """Test JSON wins when it has the higher weight or msgpack is absent."""
+        assert not accepts_msgpack("application/msgpack;q=0.5, application/json")
+        assert not accepts_msgpack("application/json")
+        assert not accepts_msgpack("*/*")
+
+    def test_without_msgpack_installed(self, monkeypatch):
+        """Test negotiation falls back to JSON when msgpack is missing."""
+        monkeypatch.setattr(negotiation, "msgpack", None)
+        assert not accepts_msgpack("application/msgpack")
+
+
+class TestMsgPackResponses:
+    """Test endpoints answer in the negotiated format."""
+
+    def test_list_endpoint(self, client, team):
+        """Test list responses are MessagePack and match the JSON payload."""
+        response = client.get("/api/v1/teams/", headers=MSGPACK)
+        assert response.headers["content-type"] == "application/msgpack"
+        assert "Accept" in response.headers["vary"]
+        assert msgpack.unpackb(response.content) == client.get("/api/v1/teams/").json()
+
+    def test_detail_endpoint(self, client, team):
+        """Test detail responses honour sparse fieldsets."""
+        response = client.get(
+            f"/api/v1/teams/{team.id}?fields=id,name", headers=MSGPACK
+        )
+        assert msgpack.unpackb(response.content) == {"id": team.id, "name": "Packed FC"}
+
+    def test_response_model_endpoint(self, client):
+        """Test routes serialized by FastAPI itself are packed too."""
+        response = client.get("/", headers=MSGPACK)
+        assert response.headers["content-type"] == "application/msgpack"
+        assert "message" in msgpack.unpackb(response.content)
+
+    def test_json_by_default(self, client, team):
+        """Test clients that do not ask for msgpack keep getting JSON."""
+        response = client.get("/api/v1/teams/")
+        assert response.headers["content-type"] == "application/json"
+
+
+class TestMsgPackRequests:
+    """Test MessagePack request bodies on the batch endpoint."""
+
+    def test_batch_body(self, client, team):
+        """Test a packed batch is decoded and validated like JSON."""
+        body = msgpack.packb(
+            {"requests": [{"path": f"/api/v1/teams/{team.id}?fields=name"}]}
+        )
+        response = client.post(
+            "/api/v1/batch",
+            content=body,
+            headers={"Content-Type": "application/msgpack", **MSGPACK},
+        )
+        assert response.status_code == 200
+        results = msgpack.unpackb(response.content)["responses"]
+        assert results[0]["body"] == {"name": "Packed FC"}
+
+    def test_invalid_body_rejected(self, client):
+        """Test validation errors are reported for packed bodies."""
+        response = client.post(
+            "/api/v1/batch",
+            content=msgpack.packb({"requests": []}),
+            headers={"Content-Type": "application/msgpack"},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,123 @@
+﻿"""
+Unit tests for pooled password hashing.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import passwords
+from app.core.config import settings
+from app.core.passwords import (
+    PasswordHashStats,
+    check_and_rehash,
+    check_password,
+    current_policy,
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    password_hash_stats,
+    shutdown_pool,
+    verify_password_async,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    """Give every test its own counters and a pool it shuts down."""
+    monkeypatch.setattr(passwords, "_stats", PasswordHashStats())
+    yield
+    shutdown_pool()
+
+
+class TestPooledHashing:
+    """Test hashing and verification off the request thread."""
+
+    def test_hash_and_verify_on_process_pool(self):
+        """Test hashes made in worker processes verify in both directions."""
+
+        async def run():
+            hashed = await hash_password_async("secret")
+            return (
+                hashed,
+                await verify_password_async("secret", hashed),
+                await verify_password_async("wrong", hashed),
+            )
+
+        hashed, good, bad = asyncio.run(run())
+        assert check_password("secret", hashed)
+        assert (good, bad) == (True, False)
+        stats = password_hash_stats()
+        assert stats["completed"] == 3
+        assert stats["queue_depth"] == 0
+        assert "p95" in stats["latency_ms"]
+
+    def test_inline_mode(self, monkeypatch):
+        """Test PASSWORD_HASH_WORKERS=0 hashes without a process pool."""
+        monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+        hashed = asyncio.run(hash_password_async("secret"))
+        assert passwords._pool is None
+        assert check_password("secret", hashed)
+
+    def test_queue_limit(self, monkeypatch):
+        """Test operations beyond the queue limit are refused with 503."""
+        monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 2)
+
+        async def run():
+            return await asyncio.gather(
+                *(hash_password_async("secret") for _ in range(4)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        refused = [result for result in results if isinstance(result, HTTPException)]
+        assert [error.status_code for error in refused] == [503, 503]
+        assert password_hash_stats()["rejected"] == 2
+        assert password_hash_stats()["max_queue_depth"] == 2
+
+
+class TestHashingPolicy:
+    """Test the configurable scheme and cost."""
+
+    def test_rounds_follow_settings(self, monkeypatch):
+        """Test new hashes use the configured bcrypt cost."""
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+        assert hash_password("secret").startswith("$2b$05$")
+
+    def test_other_cost_is_rehashed(self, monkeypatch):
+        """Test hashes at a lower or higher cost get a replacement."""
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+        for rounds in (4, 6):
+            hashed = hash_password("secret", ("bcrypt", rounds) + current_policy()[2:])
+            assert needs_rehash(hashed)
+            verified, new_hash = check_and_rehash("secret", hashed)
+            assert verified
+            assert new_hash.startswith("$2b$05$")
+
+    def test_current_hash_is_kept(self, monkeypatch):
+        """Test hashes matching the policy are not replaced."""
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+        hashed = hash_password("secret")
+        assert not needs_rehash(hashed)
+        assert check_and_rehash("secret", hashed) == (True, None)
+        assert check_and_rehash("wrong", hashed) == (False, None)
+
+    def test_scheme_switch(self, monkeypatch):
+        """Test bcrypt hashes still verify and upgrade after moving to argon2."""
+        pytest.importorskip("argon2")
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+        hashed = hash_password("secret")
+        monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "argon2")
+        monkeypatch.setattr(settings, "ARGON2_MEMORY_COST", 1024)
+        monkeypatch.setattr(settings, "ARGON2_TIME_COST", 1)
+        verified, new_hash = check_and_rehash("secret", hashed)
+        assert verified
+        assert new_hash.startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+        assert check_password("secret", new_hash)
+
+    def test_unknown_scheme(self, monkeypatch):
+        """Test a misconfigured scheme fails loudly."""
+        monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "md5_crypt")
+        with pytest.raises(ValueError):
+            hash_password("secret")
@@ -0,0 +1,72 @@
+﻿"""
+Unit tests for the fast response helpers.
+"""
+
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import (
+    FastJSONResponse,
+    list_adapter,
+    list_response,
+    serialize_list,
+)
+from app.database.models import Player
+from app.schemas.player import PlayerResponse
+
+
+def make_players(count):
+    now = datetime(2024, 9, 1, 15, 0)
+    return [
+        Player(
+            id=i,
+            team_id=1,
+            name=f"Player {i}",
+            position="Forward",
+            age=20 + i % 10,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+class TestListSerialization:
+    """Test the TypeAdapter list path."""
+
+    def test_matches_response_model_output(self):
+        """Test the fast path produces the same JSON as response_model."""
+        players = make_players(3)
+        expected = jsonable_encoder(
+            [PlayerResponse.model_validate(player) for player in players]
+        )
+        assert json.loads(serialize_list(PlayerResponse, players)) == expected
+
+    def test_accepts_dicts(self):
+        """Test cached dict rows serialize like ORM rows."""
+        players = make_players(2)
+        rows = [PlayerResponse.model_validate(p).model_dump() for p in players]
+        assert serialize_list(PlayerResponse, rows) == serialize_list(
+            PlayerResponse, players
+        )
+
+    def test_adapter_built_once(self):
+        """Test the adapter for a schema is reused between calls."""
+        assert list_adapter(PlayerResponse) is list_adapter(PlayerResponse)
+
+    def test_list_response(self):
+        """Test list_response returns a JSON body."""
+        response = list_response(PlayerResponse, [])
+        assert response.media_type == "application/json"
+        assert response.body == b"[]"
+
+
+class TestFastJSONResponse:
+    """Test the default response class."""
+
+    def test_render(self):
+        """Test content is encoded compactly, including non-string keys."""
+        response = FastJSONResponse({"status": "ok", 1: [1, 2]})
+        assert json.loads(response.body) == {"status": "ok", "1": [1, 2]}
@@ -0,0 +1,46 @@
+﻿"""
+Unit tests for the in-memory token revocation list.
+"""
+
+from app.core.revocation import RevocationList, record_revocation
+
+
+class TestRevocationList:
+    """Test merging and expiry of revocations."""
+
+    def test_newest_minimum_version_wins(self, test_db):
+        """Test a user's revocations combine into the strictest one."""
+        revocations = RevocationList(refresh_seconds=60, retain_seconds=60)
+        record_revocation(test_db, 1, 3)
+        record_revocation(test_db, 1, 2)
+        record_revocation(test_db, 2, None)
+        test_db.commit()
+        revocations.refresh(test_db)
+
+        assert revocations.is_revoked(1, 2)
+        assert not revocations.is_revoked(1, 3)
+        assert revocations.is_revoked(2, 99)
+        assert not revocations.is_revoked(3, 0)
+
+    def test_refresh_reads_only_new_rows(self, test_db, statement_counter):
+        """Test refreshes are incremental and throttled."""
+        revocations = RevocationList(refresh_seconds=60, retain_seconds=60)
+        record_revocation(test_db, 1, None)
+        test_db.commit()
+        revocations.refresh(test_db)
+
+        statement_counter.clear()
+        revocations.refresh_if_stale(test_db)
+        assert statement_counter == []
+        revocations.refresh(test_db)
+        assert "token_revocations.id > ?" in statement_counter[0]
+
+    def test_entries_expire_with_tokens(self, test_db):
+        """Test revocations are dropped once every affected token expired."""
+        revocations = RevocationList(refresh_seconds=0, retain_seconds=0)
+        record_revocation(test_db, 1, None)
+        test_db.commit()
+        revocations.refresh(test_db)
+        assert len(revocations) == 1
+        revocations.refresh(test_db)
+        assert len(revocations) == 0
@@ -0,0 +1,103 @@
+﻿"""
+Unit tests for WebSocket match rooms.
+"""
+
+import asyncio
+import threading
+
+from app.core.rooms import RoomManager, RoomMember, encode_message
+
+
+class FakeSocket:
+    """Collects sent messages, optionally blocking until released."""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def send_text(self, message):
+        await self.release.wait()
+        self.sent.append(message)
+
+
+class TestRoomMember:
+    """Test the bounded, coalescing outbox."""
+
+    def test_scores_coalesced(self):
+        """Test only the newest pending score is kept."""
+        member = RoomMember(FakeSocket(), queue_size=4)
+        for value in range(10):
+            member.push(encode_message("score", value), "score")
+        assert member.pending() == 1
+        assert member.latest["score"] == encode_message("score", 9)
+        assert member.dropped == 9
+
+    def test_oldest_message_dropped(self):
+        """Test a full outbox drops its oldest messages."""
+        member = RoomMember(FakeSocket(), queue_size=2)
+        for value in "abc":
+            member.push(value)
+        assert list(member.messages) == ["b", "c"]
+        assert member.dropped == 1
+
+
+class TestRoomManager:
+    """Test fan-out across members."""
+
+    def test_slow_member_does_not_stall_room(self):
+        """Test a blocked socket neither delays others nor grows its queue."""
+
+        async def run():
+            rooms = RoomManager(queue_size=4)
+            slow = FakeSocket(blocked=True)
+            fast = [FakeSocket() for _ in range(20)]
+            members = [rooms.join(1, socket) for socket in [slow, *fast]]
+            writers = [asyncio.create_task(member.writer()) for member in members]
+
+            for value in range(100):
+                rooms.broadcast(1, encode_message("score", value), "score")
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+
+            assert all(
+                socket.sent[-1] == encode_message("score", 99) for socket in fast
+            )
+            assert members[0].pending() <= 1
+            slow.release.set()
+            await asyncio.sleep(0.01)
+            assert slow.sent[-1] == encode_message("score", 99)
+            assert len(slow.sent) <= 2
+            for writer in writers:
+                writer.cancel()
+
+        asyncio.run(run())
+
+    def test_broadcast_from_worker_thread(self):
+        """Test broadcasts from the threadpool reach the event loop."""
+
+        async def run():
+            rooms = RoomManager()
+            socket = FakeSocket()
+            member = rooms.join(7, socket)
+            writer = asyncio.create_task(member.writer())
+            thread = threading.Thread(target=rooms.broadcast, args=(7, "goal"))
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0.01)
+            writer.cancel()
+            return socket.sent
+
+        assert asyncio.run(run()) == ["goal"]
+
+    def test_leave(self):
+        """Test empty rooms are removed."""
+
+        async def run():
+            rooms = RoomManager()
+            member = rooms.join(3, FakeSocket())
+            rooms.leave(3, member)
+            return rooms.member_count(3)
+
+        assert asyncio.run(run()) == 0
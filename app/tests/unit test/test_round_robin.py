@@ -0,0 +1,58 @@
+﻿"""
+Unit tests for round-robin fixture generation.
+"""
+
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from app.services.match_service import round_robin
+
+
+def home_pattern(rounds, team):
+    return [
+        home == team for pairs in rounds for home, away in pairs if team in (home, away)
+    ]
+
+
+class TestRoundRobin:
+    """Test the circle-method schedule."""
+
+    @pytest.mark.parametrize("count", [2, 3, 6, 7, 20])
+    def test_every_pair_meets_once(self, count):
+        """Test a single round-robin pairs every two teams exactly once."""
+        teams = list(range(1, count + 1))
+        rounds = round_robin(teams)
+
+        meetings = Counter(frozenset(pair) for pairs in rounds for pair in pairs)
+        assert set(meetings) == {frozenset(p) for p in combinations(teams, 2)}
+        assert set(meetings.values()) == {1}
+        assert len(rounds) == count - 1 + count % 2
+        for pairs in rounds:
+            playing = [team for pair in pairs for team in pair]
+            assert len(playing) == len(set(playing))
+
+    @pytest.mark.parametrize("count", [4, 5, 10, 40])
+    def test_home_and_away_are_balanced(self, count):
+        """Test home and away counts differ by at most one per team."""
+        rounds = round_robin(list(range(count)))
+
+        breaks = 0
+        for team in range(count):
+            pattern = home_pattern(rounds, team)
+            assert abs(2 * sum(pattern) - len(pattern)) <= 1
+            breaks += sum(a == b for a, b in zip(pattern, pattern[1:]))
+        # The minimum: n - 2 repeated venues for even n, none for odd n
+        assert breaks == (count - 2 if count % 2 == 0 else 0)
+
+    def test_double_round_robin_mirrors_first_half(self):
+        """Test each pair meets once at each ground."""
+        rounds = round_robin(list(range(8)), double=True)
+
+        assert len(rounds) == 14
+        fixtures = Counter(pair for pairs in rounds for pair in pairs)
+        assert len(fixtures) == 8 * 7
+        assert set(fixtures.values()) == {1}
+        for team in range(8):
+            assert sum(home_pattern(rounds, team)) == 7
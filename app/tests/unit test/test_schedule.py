@@ -0,0 +1,103 @@
+﻿"""
+Unit tests for schedule clash detection.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.database.models import Match
+from app.services.schedule_service import Clash, Fixture, find_clashes
+
+KICK_OFF = datetime(2031, 3, 1, 15, 0)
+
+
+def book(test_db, team_a_id, team_b_id, match_date, venue):
+    match = Match(
+        team_a_id=team_a_id, team_b_id=team_b_id, match_date=match_date, venue=venue
+    )
+    test_db.add(match)
+    test_db.commit()
+    return match.id
+
+
+class TestFindClashes:
+    """Test the sweep over venues and teams."""
+
+    def test_clashes_within_schedule(self, test_db):
+        """Test fixtures are checked against each other."""
+        fixtures = [
+            Fixture(1, 2, KICK_OFF, "North Park"),
+            Fixture(3, 4, KICK_OFF + timedelta(hours=2), "North Park"),
+            Fixture(1, 5, KICK_OFF + timedelta(hours=20), "South Park"),
+            Fixture(6, 7, KICK_OFF + timedelta(hours=3), "North Park"),
+        ]
+
+        clashes = find_clashes(test_db, fixtures)
+
+        assert sorted(clashes) == sorted(
+            [
+                Clash("venue", "North Park", None, 0, 1, None),
+                Clash("venue", "North Park", None, 1, 3, None),
+                Clash("team", None, 1, 0, 2, None),
+            ]
+        )
+
+    def test_clashes_with_booked_matches(self, test_db):
+        """Test existing matches clash with new fixtures, not each other."""
+        booked = book(test_db, 1, 2, KICK_OFF, "North Park")
+        book(test_db, 1, 3, KICK_OFF + timedelta(hours=1), "North Park")
+        ignored = book(test_db, 8, 9, KICK_OFF, "West Park")
+
+        clashes = find_clashes(
+            test_db,
+            [
+                Fixture(4, 2, KICK_OFF + timedelta(hours=23), "South Park"),
+                Fixture(5, 6, KICK_OFF - timedelta(hours=1), "West Park"),
+            ],
+            exclude_ids=[ignored],
+        )
+
+        assert clashes == [Clash("team", None, 2, 0, None, booked)]
+
+    def test_offset_kick_offs(self, test_db):
+        """Test aware kick-offs are compared as naive UTC with the rest."""
+        booked = book(test_db, 1, 2, KICK_OFF, "North Park")
+        plus_two = timezone(timedelta(hours=2))
+
+        clashes = find_clashes(
+            test_db,
+            [
+                Fixture(3, 4, KICK_OFF.replace(tzinfo=plus_two), "North Park"),
+                Fixture(5, 6, KICK_OFF + timedelta(hours=1), "North Park"),
+            ],
+        )
+
+        assert sorted(clashes) == sorted(
+            [
+                Clash("venue", "North Park", None, 0, None, booked),
+                Clash("venue", "North Park", None, 1, None, booked),
+            ]
+        )
+
+    def test_windows_and_placeholder_venue(self, test_db, monkeypatch):
+        """Test kick-offs a full window apart and unknown venues never clash."""
+        monkeypatch.setattr("app.core.config.settings.VENUE_CLASH_WINDOW_MINUTES", 120)
+        fixtures = [
+            Fixture(1, 2, KICK_OFF, "North Park"),
+            Fixture(3, 4, KICK_OFF + timedelta(minutes=120), "North Park"),
+            Fixture(5, 6, KICK_OFF, "TBD"),
+            Fixture(7, 8, KICK_OFF, "TBD"),
+        ]
+
+        assert find_clashes(test_db, fixtures) == []
+
+    def test_one_indexed_query(self, test_db, statement_counter):
+        """Test existing bookings are read in one query for any schedule size."""
+        fixtures = [
+            Fixture(team, team + 1, KICK_OFF + timedelta(days=team), f"Ground {team}")
+            for team in range(0, 200, 2)
+        ]
+
+        assert find_clashes(test_db, fixtures) == []
+        assert len(statement_counter) == 1
+        assert "matches.venue IN" in statement_counter[0]
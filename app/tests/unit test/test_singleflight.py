@@ -0,0 +1,161 @@
+﻿"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.cache import cached
+from app.core.singleflight import (
+    SingleFlight,
+    SingleFlightMiddleware,
+    reset_single_flight_stats,
+    single_flight_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    """Start every test with empty counters."""
+    reset_single_flight_stats()
+    yield
+    reset_single_flight_stats()
+
+
+def run_concurrently(func, count):
+    """Call ``func`` from ``count`` threads at once and return the results."""
+    results = [None] * count
+    start = threading.Barrier(count)
+
+    def worker(index):
+        start.wait()
+        results[index] = func()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    """Test coalescing calls from worker threads."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test only the leader runs the function; followers share its result."""
+        flights = SingleFlight()
+        calls = []
+
+        def expensive():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"rows": 3}
+
+        results = run_concurrently(lambda: flights.do("fixtures", "k", expensive), 20)
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert single_flight_stats() == {"fixtures": {"executed": 1, "coalesced": 19}}
+
+    def test_error_shared_and_key_released(self):
+        """Test followers see the leader's error and the next call runs again."""
+        flights = SingleFlight()
+
+        def failing():
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                return flights.do("x", "k", failing)
+            except ValueError as exc:
+                return str(exc)
+
+        assert run_concurrently(call, 5) == ["boom"] * 5
+        assert flights.do("x", "k", lambda: "fresh") == "fresh"
+
+    def test_cached_miss_computed_once(self):
+        """Test concurrent cache misses in a cached service run one query."""
+        calls = []
+
+        @cached("single_flight_test")
+        def lookup(db, team_id):
+            calls.append(team_id)
+            time.sleep(0.1)
+            return [team_id]
+
+        run_concurrently(lambda: lookup(object(), 7), 10)
+        assert calls == [7]
+        assert single_flight_stats()["single_flight_test"]["coalesced"] == 9
+
+
+class TestSingleFlightMiddleware:
+    """Test coalescing identical GET requests."""
+
+    @pytest.fixture
+    def app(self):
+        """Build an app whose endpoint counts how often it really runs."""
+        app = FastAPI()
+        app.state.calls = 0
+        app.add_middleware(SingleFlightMiddleware, paths=["/slow"])
+
+        @app.get("/slow/{item}")
+        async def slow(item: int):
+            app.state.calls += 1
+            await asyncio.sleep(0.05)
+            return {"item": item}
+
+        @app.get("/other")
+        async def other():
+            app.state.calls += 1
+            await asyncio.sleep(0.05)
+            return {}
+
+        return app
+
+    def fetch(self, app, paths, headers=None):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                return await asyncio.gather(
+                    *(client.get(path, headers=headers) for path in paths)
+                )
+
+        return asyncio.run(run())
+
+    def test_identical_requests_coalesced(self, app):
+        """Test concurrent identical requests get the leader's response."""
+        responses = self.fetch(app, ["/slow/1"] * 10)
+        assert [response.json() for response in responses] == [{"item": 1}] * 10
+        assert app.state.calls == 1
+        assert single_flight_stats() == {"/slow": {"executed": 1, "coalesced": 9}}
+
+    def test_different_queries_not_coalesced(self, app):
+        """Test requests for different resources run separately."""
+        self.fetch(app, ["/slow/1", "/slow/2", "/slow/1?x=1"])
+        assert app.state.calls == 3
+
+    def test_unconfigured_paths_untouched(self, app):
+        """Test paths outside the configured prefixes are never coalesced."""
+        self.fetch(app, ["/other"] * 3)
+        assert app.state.calls == 3
+        assert single_flight_stats() == {}
+
+
+class TestMetricsEndpoint:
+    """Test the counters are exposed."""
+
+    def test_metrics(self, client):
+        """Test /metrics reports configured paths that served requests."""
+        client.get("/api/v1/players/")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        counters = response.json()["single_flight"]["/api/v1/players/"]
+        assert counters == {"executed": 1, "coalesced": 0}
@@ -0,0 +1,79 @@
+﻿"""
+Unit tests for token-bucket throttling.
+"""
+
+import threading
+
+import pytest
+
+from app.core.throttle import InMemoryBuckets, Limit, SQLiteBuckets
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Run each test against both stores."""
+    if request.param == "memory":
+        return InMemoryBuckets()
+    return SQLiteBuckets(str(tmp_path / "buckets.db"))
+
+
+class TestBuckets:
+    """Test bucket accounting shared by both stores."""
+
+    def test_burst_then_refill(self, store):
+        """Test a bucket allows its capacity, then refills over time."""
+        limit = Limit("user", capacity=3, per_second=0.5)
+        assert [store.take([limit], now=100.0) for _ in range(3)] == [0, 0, 0]
+        assert store.take([limit], now=100.0) == pytest.approx(2.0)
+        assert store.take([limit], now=102.0) == 0
+
+    def test_all_or_nothing(self, store):
+        """Test a rejected request takes no token from the other buckets."""
+        tight = Limit("user", capacity=1, per_second=0.1)
+        loose = Limit("ip", capacity=2, per_second=0.1)
+        assert store.take([tight, loose], now=0.0) == 0
+        assert store.take([tight, loose], now=0.0) > 0
+        # The loose bucket still has the token the rejected call did not take
+        assert store.take([loose], now=0.0) == 0
+        assert store.take([loose], now=0.0) > 0
+
+    def test_full_buckets_pruned(self, store):
+        """Test buckets that refilled completely are forgotten."""
+        store.take([Limit("user", capacity=1, per_second=1)], now=0.0)
+        assert len(store) == 1
+        store.take([Limit("other", capacity=1, per_second=1)], now=1000.0)
+        assert len(store) == 1
+
+
+class TestSharedSQLiteBuckets:
+    """Test the SQLite store stays consistent across workers."""
+
+    def test_state_shared_between_connections(self, tmp_path):
+        """Test two workers draw from the same bucket."""
+        path = str(tmp_path / "buckets.db")
+        first, second = SQLiteBuckets(path), SQLiteBuckets(path)
+        limit = Limit("user", capacity=2, per_second=0.01)
+        assert first.take([limit], now=0.0) == 0
+        assert second.take([limit], now=0.0) == 0
+        assert first.take([limit], now=0.0) > 0
+
+    def test_concurrent_workers_never_overgrant(self, tmp_path):
+        """Test racing workers together get exactly the bucket's capacity."""
+        path = str(tmp_path / "buckets.db")
+        workers = [SQLiteBuckets(path) for _ in range(4)]
+        limit = Limit("user", capacity=10, per_second=0.001)
+        granted = []
+        start = threading.Barrier(len(workers))
+
+        def attempt(store):
+            start.wait()
+            for _ in range(10):
+                if store.take([limit]) == 0:
+                    granted.append(1)
+
+        threads = [threading.Thread(target=attempt, args=(w,)) for w in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(granted) == 10
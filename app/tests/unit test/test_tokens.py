@@ -0,0 +1,105 @@
+﻿"""
+Unit tests for JWT encoding and the verified-token cache.
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from jose import JWTError
+
+from app.core import tokens
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.tokens import (
+    TokenCache,
+    decode_token,
+    encode_token,
+    set_token_cache,
+    signing_key,
+    token_cache_stats,
+)
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count full JWT verifications."""
+    calls = []
+    real_decode = tokens.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(tokens.jwt, "decode", counting_decode)
+    return calls
+
+
+class TestTokenCache:
+    """Test caching of verified tokens."""
+
+    def test_repeat_token_verified_once(self, decode_calls):
+        """Test the same token is only verified on first use."""
+        token = create_access_token({"sub": "alice"})
+        for _ in range(3):
+            assert decode_token(token)["sub"] == "alice"
+        assert len(decode_calls) == 1
+        assert token_cache_stats()["hits"] == 2
+
+    def test_expired_entry_reverified(self, monkeypatch):
+        """Test cached claims are not served past the token's exp."""
+        token = create_access_token({"sub": "alice"}, timedelta(seconds=60))
+        decode_token(token)
+
+        # Jump past exp; jose reads the real clock, so stand in for its check
+        later = time.time() + 120
+        monkeypatch.setattr(tokens.time, "time", lambda: later)
+
+        def expired(*args, **kwargs):
+            raise JWTError("Signature has expired.")
+
+        monkeypatch.setattr(tokens.jwt, "decode", expired)
+        with pytest.raises(JWTError):
+            decode_token(token)
+        assert token_cache_stats()["size"] == 0
+
+    def test_invalid_token_not_cached(self, decode_calls):
+        """Test tokens that fail verification are rejected every time."""
+        token = create_access_token({"sub": "alice"})[:-2] + "xx"
+        for _ in range(2):
+            with pytest.raises(JWTError):
+                decode_token(token)
+        assert len(decode_calls) == 2
+        assert token_cache_stats()["size"] == 0
+
+    def test_token_without_exp_not_cached(self, decode_calls):
+        """Test tokens that never expire are verified on every use."""
+        token = encode_token({"sub": "alice"})
+        decode_token(token)
+        decode_token(token)
+        assert len(decode_calls) == 2
+
+    def test_disabled_with_zero_size(self, decode_calls, monkeypatch):
+        """Test TOKEN_CACHE_SIZE=0 verifies every request."""
+        monkeypatch.setattr(settings, "TOKEN_CACHE_SIZE", 0)
+        set_token_cache(None)
+        token = create_access_token({"sub": "alice"})
+        decode_token(token)
+        decode_token(token)
+        assert len(decode_calls) == 2
+
+    def test_least_recently_used_evicted(self):
+        """Test the cache stays within its bound, dropping the stalest entry."""
+        cache = TokenCache(2)
+        expires = time.time() + 60
+        cache.put(b"a", expires, {"sub": "a"})
+        cache.put(b"b", expires, {"sub": "b"})
+        cache.get(b"a", time.time())
+        cache.put(b"c", expires, {"sub": "c"})
+        assert cache.get(b"b", time.time()) is None
+        assert cache.get(b"a", time.time()) == {"sub": "a"}
+        assert cache.stats()["size"] == 2
+
+    def test_signing_key_reused(self):
+        """Test the key object is parsed once and shared."""
+        assert signing_key() is signing_key()
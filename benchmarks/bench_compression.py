@@ -0,0 +1,62 @@
+﻿"""
+Benchmark response compression on serialized list payloads.
+
+Compresses ``GET /players/`` and ``GET /matches/`` sized bodies with every
+gzip level (and Brotli quality, when installed) and reports CPU time against
+bytes saved, to help pick ``GZIP_COMPRESSION_LEVEL`` and ``BROTLI_QUALITY``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_compression [--items 1000] [--repeat 5]
+"""
+
+import argparse
+
+from app.core.compression import _Compressor, brotli
+from app.core.responses import list_response
+from app.schemas.match import MatchResponse
+from app.schemas.player import PlayerResponse
+from benchmarks.bench_serialization import best_of, make_matches, make_players
+
+
+def compress(encoding, level, body):
+    if encoding == "br":
+        return _Compressor("br", 6, level).finish(body)
+    return _Compressor("gzip", level, 4).finish(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    datasets = [
+        ("players", list_response(PlayerResponse, make_players(args.items)).body),
+        ("matches", list_response(MatchResponse, make_matches(args.items)).body),
+    ]
+    settings = [("gzip", level) for level in range(1, 10)]
+    if brotli is not None:
+        settings += [("br", quality) for quality in (1, 4, 6, 9, 11)]
+
+    print(
+        f"{'payload':<8} {'encoding':<9} {'level':>5} {'bytes':>9} "
+        f"{'ratio':>6} {'ms':>7} {'MB/s':>7}"
+    )
+    for label, body in datasets:
+        print(
+            f"{label:<8} {'identity':<9} {'-':>5} {len(body):>9} "
+            f"{1.0:>6.2f} {0.0:>7.2f} {'-':>7}"
+        )
+        for encoding, level in settings:
+            size = len(compress(encoding, level, body))
+            ms = best_of(compress, args.repeat, encoding, level, body)
+            print(
+                f"{label:<8} {encoding:<9} {level:>5} {size:>9} "
+                f"{len(body) / size:>6.2f} {ms:>7.2f} "
+                f"{len(body) / ms / 1000:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
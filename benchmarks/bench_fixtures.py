@@ -0,0 +1,85 @@
+﻿"""
+Benchmark season fixture generation against one POST per fixture.
+
+Schedules a double round-robin for ``--teams`` teams into a temporary
+SQLite database twice: once the old way, adding and committing each match
+on its own, and once with ``generate_fixtures`` (one multi-row INSERT and a
+single commit). Generation and insertion are timed together.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_fixtures [--teams 40]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_DIR = tempfile.mkdtemp(prefix="bench_fixtures_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app.database.models import Base, Match, Team  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.services.match_service import generate_fixtures, round_robin  # noqa: E402
+
+
+def seed(count):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all(
+        Team(name=f"Team {number}", founded_year=1900, home_ground=f"Ground {number}")
+        for number in range(count)
+    )
+    db.commit()
+    team_ids = [team_id for (team_id,) in db.query(Team.id).order_by(Team.id)]
+    db.close()
+    return team_ids
+
+
+def one_commit_per_match(db, team_ids, start):
+    for number, pairs in enumerate(round_robin(team_ids, double=True)):
+        for home, away in pairs:
+            db.add(
+                Match(
+                    team_a_id=home,
+                    team_b_id=away,
+                    match_date=start + timedelta(days=7 * number),
+                    venue=f"Ground {home}",
+                )
+            )
+            db.commit()
+
+
+def timed(func, *args):
+    db = SessionLocal()
+    db.query(Match).delete()
+    db.commit()
+    start = time.perf_counter()
+    func(db, *args)
+    elapsed = time.perf_counter() - start
+    matches = db.query(Match).count()
+    db.close()
+    return elapsed, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=40)
+    args = parser.parse_args()
+
+    team_ids = seed(args.teams)
+    start = datetime.now() + timedelta(days=7)
+
+    print(f"{'step':<26} {'matches':>8} {'seconds':>9}")
+    for label, func in (
+        ("one commit per match", one_commit_per_match),
+        ("generate_fixtures", generate_fixtures),
+    ):
+        elapsed, matches = timed(func, team_ids, start)
+        print(f"{label:<26} {matches:>8} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
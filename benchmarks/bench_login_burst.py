@@ -0,0 +1,155 @@
+﻿"""
+Benchmark read latency during a burst of logins.
+
+Runs the app under uvicorn against a temporary SQLite database. For each
+hashing mode it fires ``--logins`` concurrent logins while a steady stream
+of ``GET /api/v1/coaches/`` requests runs alongside, and reports the read
+latency. Mode ``inline`` hashes on the request threadpool (the old
+behaviour); ``pool`` uses the dedicated bcrypt process pool.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_login_burst [--logins 200] [--reads 400]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix="bench_login_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+os.environ["CACHE_WARMUP_ENABLED"] = "false"
+# The burst reuses one account; throttling would reject most of it
+os.environ["LOGIN_THROTTLE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.passwords import shutdown_pool  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.database.models import Base, Coach, Team, User  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    team = Team(name="Bench FC", coach_name="Coach", founded_year=1990)
+    db.add(team)
+    db.commit()
+    db.add_all(
+        [
+            Coach(team_id=team.id, name=f"Coach {i}", experience_years=i)
+            for i in range(50)
+        ]
+    )
+    db.add(
+        User(
+            username="bench",
+            email="bench@example.com",
+            hashed_password=get_password_hash(PASSWORD),
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def start_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=60
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+async def timed_read(client):
+    start = time.perf_counter()
+    response = await client.get("/api/v1/coaches/")
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def steady_reads(client, count, interval):
+    tasks = []
+    for _ in range(count):
+        tasks.append(asyncio.create_task(timed_read(client)))
+        await asyncio.sleep(interval)
+    return await asyncio.gather(*tasks)
+
+
+async def login(client):
+    response = await client.post(
+        "/api/v1/auth/token", data={"username": "bench", "password": PASSWORD}
+    )
+    return response.status_code
+
+
+async def measure(base_url, args):
+    limits = httpx.Limits(max_connections=args.logins + 100)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=300
+    ) as client:
+        await timed_read(client)
+        quiet = await steady_reads(client, args.reads // 4, args.interval)
+        start = time.perf_counter()
+        logins = asyncio.gather(*(login(client) for _ in range(args.logins)))
+        busy, statuses = await asyncio.gather(
+            steady_reads(client, args.reads, args.interval), logins
+        )
+        login_s = time.perf_counter() - start
+    return quiet, busy, statuses, login_s
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    return (
+        f"p50 {statistics.median(ordered) * 1000:7.1f}  "
+        f"p95 {ordered[int(len(ordered) * 0.95)] * 1000:7.1f}  "
+        f"max {ordered[-1] * 1000:7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=400)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    args = parser.parse_args()
+
+    seed()
+    server, thread, base_url = start_server()
+    try:
+        for mode, workers in (("inline", 0), ("pool", args.workers)):
+            settings.PASSWORD_HASH_WORKERS = workers
+            settings.PASSWORD_HASH_MAX_QUEUE = args.logins
+            quiet, busy, statuses, login_s = asyncio.run(measure(base_url, args))
+            ok = statuses.count(200)
+            print(f"{mode} ({workers} workers)")
+            print(f"  reads, idle        {describe(quiet)} ms")
+            print(f"  reads, login burst {describe(busy)} ms")
+            print(f"  logins             {ok}/{len(statuses)} ok in {login_s:.1f} s")
+            shutdown_pool()
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+﻿"""
+Benchmark MessagePack against JSON for list payloads.
+
+Encodes 10k-item player and match lists through ``list_response`` in both
+formats (server side) and decodes the resulting bodies (client side),
+reporting time and size for each.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_msgpack [--items 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+
+from app.core import negotiation
+from app.core.responses import list_response
+from app.schemas.match import MatchResponse
+from app.schemas.player import PlayerResponse
+from benchmarks.bench_serialization import best_of, make_matches, make_players
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode(packed, schema, items):
+    token = negotiation._use_msgpack.set(packed)
+    try:
+        return list_response(schema, items).body
+    finally:
+        negotiation._use_msgpack.reset(token)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if negotiation.msgpack is None:
+        parser.error("msgpack is not installed")
+
+    decoders = [("json", json.loads), ("msgpack", negotiation.unpackb)]
+    if orjson is not None:
+        decoders.insert(1, ("orjson", orjson.loads))
+
+    datasets = [
+        ("players", PlayerResponse, make_players(args.items)),
+        ("matches", MatchResponse, make_matches(args.items)),
+    ]
+    print(f"{'payload':<8} {'step':<16} {'bytes':>9} {'ms':>8}")
+    for label, schema, items in datasets:
+        bodies = {}
+        for name, packed in (("json", False), ("msgpack", True)):
+            bodies[name] = encode(packed, schema, items)
+            ms = best_of(encode, args.repeat, packed, schema, items)
+            print(
+                f"{label:<8} {'encode ' + name:<16} {len(bodies[name]):>9} {ms:>8.1f}"
+            )
+        for name, decode in decoders:
+            body = bodies["msgpack" if name == "msgpack" else "json"]
+            ms = best_of(decode, args.repeat, body)
+            print(f"{label:<8} {'decode ' + name:<16} {len(body):>9} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
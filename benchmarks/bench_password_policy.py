@@ -0,0 +1,79 @@
+﻿"""
+Benchmark login throughput per core for each password hashing setting.
+
+A login costs one password verification, so for every bcrypt cost and
+argon2 memory/time pair this times ``check_password`` in a single thread
+and reports the verify latency and logins per second one core can serve.
+Multiply by ``PASSWORD_HASH_WORKERS`` (up to the core count) for the
+throughput of one server. argon2 rows need the argon2-cffi package.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_password_policy [--bcrypt-rounds 10,11,12,13]
+        [--argon2 19456:2,47104:1,65536:3] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from app.core.passwords import check_password, current_policy, hash_password
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+
+def int_list(value):
+    return [int(item) for item in value.split(",") if item]
+
+
+def argon2_list(value):
+    return [tuple(int(part) for part in item.split(":")) for item in value.split(",")]
+
+
+def measure(policy, repeat):
+    hashed = hash_password("benchmark-password", policy)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        check_password("benchmark-password", hashed, policy)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bcrypt-rounds", type=int_list, default=[10, 11, 12, 13])
+    parser.add_argument(
+        "--argon2",
+        type=argon2_list,
+        default=[(19456, 2), (47104, 1), (65536, 3)],
+        help="comma-separated memory_kib:time_cost pairs",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Each row varies one scheme's cost; the other slots keep the settings
+    base = current_policy()
+    policies = [
+        (f"bcrypt rounds={rounds}", ("bcrypt", rounds) + base[2:])
+        for rounds in args.bcrypt_rounds
+    ]
+    if argon2 is not None:
+        policies += [
+            (
+                f"argon2 m={memory} t={time_cost}",
+                ("argon2", base[1], memory, time_cost, base[4]),
+            )
+            for memory, time_cost in args.argon2
+        ]
+    else:
+        print("argon2-cffi is not installed, skipping argon2 settings")
+
+    print(f"{'setting':<26} {'verify ms':>10} {'logins/s/core':>14}")
+    for label, policy in policies:
+        seconds = measure(policy, args.repeat)
+        print(f"{label:<26} {seconds * 1000:>10.1f} {1 / seconds:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
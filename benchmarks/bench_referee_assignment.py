@@ -0,0 +1,81 @@
+﻿"""
+Benchmark automatic referee assignment over a full season.
+
+Schedules a double round-robin for ``--teams`` teams (one match day a week)
+in a temporary SQLite database, adds ``--referees`` referees from a handful
+of countries, and times ``assign_referees`` from the fixture query to the
+single bulk UPDATE.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_referee_assignment [--teams 40] [--referees 60]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_DIR = tempfile.mkdtemp(prefix="bench_referees_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app.database.models import Base, Match, Referee, Team, Venue  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.schemas.referee import RefereeAssignmentRequest  # noqa: E402
+from app.services.match_service import generate_fixtures  # noqa: E402
+from app.services.referee_service import assign_referees  # noqa: E402
+
+COUNTRIES = ["England", "Scotland", "Wales", "Ireland", "France"]
+LEVELS = ["regional", "national", "international"]
+
+
+def seed(db, teams, referees):
+    Base.metadata.create_all(bind=engine)
+    db.add_all(
+        Venue(
+            name=f"Ground {i}",
+            city="City",
+            country=COUNTRIES[i % len(COUNTRIES)],
+            capacity=10_000,
+        )
+        for i in range(teams)
+    )
+    db.add_all(
+        Team(name=f"Team {i}", founded_year=1900, home_ground=f"Ground {i}")
+        for i in range(teams)
+    )
+    db.add_all(
+        Referee(
+            name=f"Referee {i}",
+            experience_years=i % 20,
+            nationality=COUNTRIES[i % len(COUNTRIES)],
+            qualification_level=LEVELS[i % len(LEVELS)],
+        )
+        for i in range(referees)
+    )
+    db.commit()
+    generate_fixtures(db, None, datetime.now() + timedelta(days=7))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--referees", type=int, default=60)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    seed(db, args.teams, args.referees)
+    fixtures = db.query(Match).count()
+
+    start = time.perf_counter()
+    result = assign_referees(db, RefereeAssignmentRequest(min_experience_years=2))
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    print(f"{'fixtures':>9} {'referees':>9} {'assigned':>9} {'seconds':>9}")
+    print(f"{fixtures:>9} {args.referees:>9} {result['assigned']:>9} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
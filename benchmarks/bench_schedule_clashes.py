@@ -0,0 +1,74 @@
+﻿"""
+Benchmark whole-schedule clash checks: sorted sweep against pairwise.
+
+Builds a double round-robin for ``--teams`` teams (one ground each) and
+checks it for venue and team clashes twice: with ``find_clashes``, which
+sorts the bookings per venue and per team and sweeps the window, and with
+the naive comparison of every pair of fixtures. Both run against an empty
+temporary SQLite database, so only the in-memory check differs.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_schedule_clashes [--teams 40]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_DIR = tempfile.mkdtemp(prefix="bench_clashes_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app.core.config import settings  # noqa: E402
+from app.database.models import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.services.match_service import round_robin  # noqa: E402
+from app.services.schedule_service import Fixture, find_clashes  # noqa: E402
+
+
+def pairwise_clashes(fixtures):
+    venue_window = timedelta(minutes=settings.VENUE_CLASH_WINDOW_MINUTES)
+    team_window = timedelta(minutes=settings.TEAM_CLASH_WINDOW_MINUTES)
+    clashes = []
+    for i, first in enumerate(fixtures):
+        for j in range(i + 1, len(fixtures)):
+            second = fixtures[j]
+            apart = abs(first.match_date - second.match_date)
+            if first.venue == second.venue and apart < venue_window:
+                clashes.append((i, j))
+            teams = {first.team_a_id, first.team_b_id}
+            if teams & {second.team_a_id, second.team_b_id} and apart < team_window:
+                clashes.append((i, j))
+    return clashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=40)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2031, 8, 2, 15, 0)
+    fixtures = [
+        Fixture(home, away, start + timedelta(days=7 * number), f"Ground {home}")
+        for number, pairs in enumerate(round_robin(range(args.teams), double=True))
+        for home, away in pairs
+    ]
+
+    db = SessionLocal()
+    print(f"{'check':<16} {'fixtures':>9} {'clashes':>8} {'seconds':>9}")
+    for label, check in (
+        ("sorted sweep", lambda: find_clashes(db, fixtures)),
+        ("pairwise", lambda: pairwise_clashes(fixtures)),
+    ):
+        began = time.perf_counter()
+        clashes = check()
+        elapsed = time.perf_counter() - began
+        print(f"{label:<16} {len(fixtures):>9} {len(clashes):>8} {elapsed:>9.3f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
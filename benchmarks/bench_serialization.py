@@ -0,0 +1,105 @@
+﻿"""
+Benchmark list response serialization on 10k-item lists.
+
+Compares FastAPI's default path (``response_model`` validation followed by
+``JSONResponse``) with ``app.core.responses.list_response``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_serialization [--items 10000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import list_response
+from app.database.models import Match, Player
+from app.schemas.match import MatchResponse
+from app.schemas.player import PlayerResponse
+
+
+def make_players(count):
+    now = datetime.now()
+    return [
+        Player(
+            id=i,
+            team_id=i % 40 + 1,
+            name=f"Player {i}",
+            position="Forward",
+            age=18 + i % 20,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def make_matches(count):
+    now = datetime.now()
+    return [
+        Match(
+            id=i,
+            team_a_id=i % 40 + 1,
+            team_b_id=(i + 1) % 40 + 1,
+            match_date=now + timedelta(days=i % 300),
+            venue="Stadium",
+            score_team_a=i % 4,
+            score_team_b=i % 3,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def default_path(schema, items):
+    field = create_model_field(
+        name="Response", type_=List[schema], mode="serialization"
+    )
+    content = asyncio.run(serialize_response(field=field, response_content=items))
+    return JSONResponse(content).body
+
+
+def fast_path(schema, items):
+    return list_response(schema, items).body
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    datasets = [
+        ("List[PlayerResponse]", PlayerResponse, make_players(args.items)),
+        ("List[MatchResponse]", MatchResponse, make_matches(args.items)),
+    ]
+    print(f"{'payload':<22} {'default ms':>11} {'fast ms':>9} {'speed-up':>9}")
+    for label, schema, items in datasets:
+        assert len(default_path(schema, items)) > 0
+        default_ms = best_of(default_path, args.repeat, schema, items)
+        fast_ms = best_of(fast_path, args.repeat, schema, items)
+        print(
+            f"{label:<22} {default_ms:>11.1f} {fast_ms:>9.1f} "
+            f"{default_ms / fast_ms:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+﻿"""
+Benchmark bearer token verification with and without the verified-token cache.
+
+First times token verification alone: ``jwt.decode`` with the raw secret
+(the old per-request path) against ``decode_token`` (cached claims and a
+prebuilt key). Then sends ``--requests`` authenticated ``GET
+/api/v1/users/me`` calls in-process against a temporary SQLite database,
+with ``TOKEN_CACHE_SIZE=0`` and with the cache enabled.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_token_cache [--decodes 20000] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix="bench_tokens_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+os.environ["CACHE_WARMUP_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.core.tokens import decode_token, set_token_cache  # noqa: E402
+from app.database.models import Base, User  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(
+        User(
+            username="bench",
+            email="bench@example.com",
+            hashed_password=get_password_hash("benchmark-password"),
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+async def requests_per_second(token, count):
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers=headers
+    ) as client:
+        (await client.get("/api/v1/users/me")).raise_for_status()
+        start = time.perf_counter()
+        for _ in range(count):
+            (await client.get("/api/v1/users/me")).raise_for_status()
+        return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--decodes", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    seed()
+    token = create_access_token({"sub": "bench"})
+
+    def uncached():
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    print(f"{'step':<34} {'per second':>12}")
+    print(
+        f"{'verify, jwt.decode per call':<34} {per_second(uncached, args.decodes):>12.0f}"
+    )
+    print(
+        f"{'verify, decode_token cached':<34} "
+        f"{per_second(lambda: decode_token(token), args.decodes):>12.0f}"
+    )
+
+    for label, size in (("no cache", 0), ("cache", settings.TOKEN_CACHE_SIZE)):
+        settings.TOKEN_CACHE_SIZE = size
+        set_token_cache(None)
+        rate = asyncio.run(requests_per_second(token, args.requests))
+        print(f"{'GET /users/me, ' + label:<34} {rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+﻿"""
+Load test WebSocket match rooms with thousands of local connections.
+
+Starts the app under uvicorn in a background thread, opens ``--clients``
+connections to one match room (``--slow`` percent of them never read),
+broadcasts ``--updates`` score changes and reports how long the readers
+take to see the final score and how many updates were coalesced away.
+
+Run from the repository root::
+
+    python -m benchmarks.load_ws_rooms [--clients 10000] [--updates 50] [--slow 5]
+
+Each connection uses two file descriptors in this process; the script
+raises the soft ``RLIMIT_NOFILE`` limit to the hard limit when it can.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+import websockets
+
+from app.core.rooms import encode_message, get_rooms
+from app.main import app
+
+MATCH_ID = 1
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        lifespan="off",
+        log_level="warning",
+        backlog=4096,
+        ws_max_queue=4,
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def reader(ws, final, received, latencies, published):
+    async for raw in ws:
+        message = json.loads(raw)
+        if message["type"] != "score":
+            continue
+        received.append(1)
+        if message["data"] == final:
+            latencies.append(time.perf_counter() - published[0])
+            return
+
+
+async def run(args, port):
+    url = f"ws://127.0.0.1:{port}/api/v1/matches/{MATCH_ID}/room"
+    limit = asyncio.Semaphore(500)
+
+    async def open_connection():
+        async with limit:
+            return await websockets.connect(url, max_queue=4, open_timeout=60)
+
+    start = time.perf_counter()
+    sockets = await asyncio.gather(*(open_connection() for _ in range(args.clients)))
+    connect_s = time.perf_counter() - start
+    while get_rooms().member_count(MATCH_ID) < args.clients:
+        await asyncio.sleep(0.05)
+
+    slow_count = args.clients * args.slow // 100
+    readers = sockets[slow_count:]
+    final = args.updates - 1
+    received, latencies, published = [], [], [0.0]
+    tasks = [
+        asyncio.create_task(reader(ws, final, received, latencies, published))
+        for ws in readers
+    ]
+
+    # Publish from this thread as update_match does from the threadpool
+    rooms = get_rooms()
+    published[0] = time.perf_counter()
+    for value in range(args.updates):
+        rooms.broadcast(MATCH_ID, encode_message("score", value), "score")
+    broadcast_ms = (time.perf_counter() - published[0]) * 1000
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=args.timeout)
+
+    print(f"connections        {args.clients} ({slow_count} never read)")
+    print(f"connect time       {connect_s:.1f} s")
+    print(f"broadcast calls    {args.updates} in {broadcast_ms:.1f} ms")
+    print(
+        f"final score seen   p50 {statistics.median(latencies) * 1000:.0f} ms, "
+        f"max {max(latencies) * 1000:.0f} ms"
+    )
+    delivered = len(received) / len(readers)
+    print(
+        f"updates delivered  {delivered:.1f} per reader of {args.updates} "
+        f"(rest coalesced)"
+    )
+
+    await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--slow", type=int, default=5, help="percent of idle clients")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    fds = raise_fd_limit()
+    if fds < args.clients * 2 + 100:
+        parser.error(f"RLIMIT_NOFILE is {fds}; {args.clients} clients need more")
+    port = free_port()
+    server, thread = start_server(port)
+    try:
+        asyncio.run(run(args, port))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()